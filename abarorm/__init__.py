@@ -5,15 +5,33 @@ This file imports the necessary database models to be exposed publicly.
 The following models are available:
     - SQLiteModel
     - PostgreSQLModel
+    - AsyncSQLiteModel
+    - AsyncPostgreSQLModel (needs psycopg 3: pip install abarorm[async])
+
+Aggregates for QuerySet.aggregate() and QuerySet.annotate():
+    - Count, Sum, Avg, Min, Max
+
+Identity map scope:
+    - session
 """
 
 __all__ = [
     'SQLiteModel',
-    'PostgreSQLModel'
+    'PostgreSQLModel',
+    'AsyncSQLiteModel',
+    'AsyncPostgreSQLModel',
+    'Count',
+    'Sum',
+    'Avg',
+    'Min',
+    'Max',
+    'session'
 ]
 
 try:
-    from .sqlite import SQLiteModel
-    from .psql import PostgreSQLModel
+    from .sqlite import SQLiteModel, AsyncSQLiteModel
+    from .psql import PostgreSQLModel, AsyncPostgreSQLModel
+    from .aggregates import Count, Sum, Avg, Min, Max
+    from .identity_map import session
 except ImportError as e:
-    raise ImportError(f"Error importing module: {e}")
\ No newline at end of file
+    raise ImportError(f"Error importing module: {e}")
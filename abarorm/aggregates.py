@@ -0,0 +1,90 @@
+"""
+SQL aggregate expressions shared by the SQLite and PostgreSQL models
+
+Used with QuerySet.aggregate() and QuerySet.annotate():
+
+    Order.filter(paid=True).aggregate(total=Sum('amount'), n=Count('id'))
+    Customer.all().annotate(orders=Count('orders')).values('country')
+
+The field is a column of the model or a related_name of a ForeignKey that
+points at the model (``'orders'`` or ``'orders__amount'``).
+"""
+
+
+# Lookups accepted when filtering on an annotation
+LOOKUP_OPERATORS = {
+    'exact': '=',
+    'ne': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+}
+
+
+class Aggregate:
+    """Base class for SQL aggregate functions"""
+
+    function = None
+
+    def __init__(self, field: str, distinct: bool = False):
+        if not field:
+            raise ValueError(f"{self.__class__.__name__}() requires a field name")
+        self.field = field
+        self.distinct = distinct
+
+    def __repr__(self):
+        distinct = ", distinct=True" if self.distinct else ""
+        return f"{self.__class__.__name__}('{self.field}'{distinct})"
+
+    def as_sql(self, column: str) -> str:
+        """Aggregate over a column"""
+        distinct = "DISTINCT " if self.distinct else ""
+        return f"{self.function}({distinct}{column})"
+
+    def partials(self, column: str) -> list:
+        """Per-row partial results used when related rows are aggregated in groups"""
+        return [self.as_sql(column)]
+
+    def combine(self, partials: list) -> str:
+        """Combine per-row partial results into the aggregate of the group"""
+        return f"{self.function}({partials[0]})"
+
+
+class Count(Aggregate):
+    """COUNT(field), ``Count('*')`` counts rows"""
+
+    function = 'COUNT'
+
+    def combine(self, partials: list) -> str:
+        return f"CAST(COALESCE(SUM({partials[0]}), 0) AS BIGINT)"
+
+
+class Sum(Aggregate):
+    """SUM(field)"""
+
+    function = 'SUM'
+
+
+class Avg(Aggregate):
+    """AVG(field)"""
+
+    function = 'AVG'
+
+    def partials(self, column: str) -> list:
+        return [f"SUM({column})", f"COUNT({column})"]
+
+    def combine(self, partials: list) -> str:
+        return f"SUM({partials[0]}) * 1.0 / NULLIF(SUM({partials[1]}), 0)"
+
+
+class Min(Aggregate):
+    """MIN(field)"""
+
+    function = 'MIN'
+
+
+class Max(Aggregate):
+    """MAX(field)"""
+
+    function = 'MAX'
@@ -0,0 +1,173 @@
+"""
+Read-through query result cache shared by the SQLite and PostgreSQL models
+
+Enable it per model with ``Meta.cache``:
+
+    class Country(SQLiteModel):
+        class Meta:
+            db_config = DATABASE_CONFIG['sqlite']
+            cache = QueryCache(ttl=3600, maxsize=512)   # or cache = True
+
+get(), filter() and all() of the model then keep their rows for ``ttl``
+seconds, keyed on the SQL and its parameters. Writes made through any model
+(create, bulk_create, update, delete, save, upserts) invalidate the tables
+they touch. Changes made by other processes or raw SQL are only seen once
+the entries expire, unless the backend is shared between the processes.
+"""
+import hashlib
+from abc import ABC, abstractmethod
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict, defaultdict
+from typing import Optional
+
+
+class CacheBackend(ABC):
+    """Storage used by a QueryCache
+
+    Subclass it to keep results somewhere else (memcached, Redis, ...) and
+    implement all three methods. Keys are strings; values are tuples of
+    plain Python values and can be pickled. ``ttl`` is in seconds, None
+    means no expiry.
+    """
+
+    @abstractmethod
+    def get(self, key: str):
+        """Stored value, or None when the key is missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: Optional[float]) -> None:
+        """Store a value for ``ttl`` seconds"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored value"""
+
+
+class LocalCache(CacheBackend):
+    """In-process LRU dict with per-entry expiry (the default backend)"""
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: Optional[float]) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Every QueryCache, so a write can invalidate its tables in all of them
+_caches = weakref.WeakSet()
+
+# Tables with a ForeignKey to a table, whose rows a DELETE may cascade to
+_dependents = defaultdict(set)
+
+
+class QueryCache:
+    """Result cache with a TTL over a storage backend
+
+    Each table has a version token that is part of every key; invalidating
+    a table replaces its token, so stale entries are never read again and
+    age out of the LRU. A random token is used rather than a counter, so a
+    version evicted from the backend cannot come back.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300, maxsize: int = 1024,
+                 backend: Optional[CacheBackend] = None):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0")
+        self.ttl = ttl
+        self.backend = backend if backend is not None else LocalCache(maxsize)
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def __repr__(self):
+        return f"<QueryCache ttl={self.ttl} hits={self.hits} misses={self.misses}>"
+
+    def _version(self, table: str) -> str:
+        key = f"abarorm:version:{table}"
+        version = self.backend.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            self.backend.set(key, version, None)
+        return version
+
+    def key(self, tables: tuple, query: str, params) -> str:
+        """Key of a query result, bound to the current versions of the tables it reads"""
+        versions = [self._version(table) for table in tables]
+        digest = hashlib.sha1(repr((versions, query, tuple(params))).encode()).hexdigest()
+        return f"abarorm:result:{digest}"
+
+    def get(self, key: str):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate(self, table: str) -> None:
+        """Drop every cached result that reads the table"""
+        self.backend.set(f"abarorm:version:{table}", uuid.uuid4().hex, None)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def add_dependency(table: str, dependent: str) -> None:
+    """Record that ``dependent`` has a ForeignKey to ``table``"""
+    _dependents[table].add(dependent)
+
+
+def invalidate(table: str, cascade: bool = False) -> None:
+    """Invalidate a table in every QueryCache
+
+    With ``cascade=True`` the tables referencing it (recursively) are
+    invalidated too, for deletes that ON DELETE CASCADE / SET NULL may
+    carry over to them.
+    """
+    if not _caches:
+        return
+    tables = {table}
+    if cascade:
+        pending = [table]
+        while pending:
+            for dependent in _dependents.get(pending.pop(), ()):
+                if dependent not in tables:
+                    tables.add(dependent)
+                    pending.append(dependent)
+    for cache in list(_caches):
+        for name in tables:
+            cache.invalidate(name)
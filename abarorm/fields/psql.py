@@ -7,16 +7,27 @@ class Field:
     """Base field class for all field types"""
     
     def __init__(self, field_type: str, max_length: Optional[int] = None, unique: bool = False,
-                 null: bool = False, default: Optional[str] = None):
+                 null: bool = False, default: Optional[str] = None, db_index: bool = False):
         self.field_type = field_type
         self.max_length = max_length
         self.unique = unique
         self.null = null
         self.default = default
+        self.db_index = db_index
     
     def __repr__(self):
         return f"<{self.__class__.__name__}(type={self.field_type}, null={self.null}, unique={self.unique})>"
     
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        # Only reached when the instance has no value for the field,
+        # e.g. a field left out with only() / defer()
+        return instance._load_deferred_field(self)
+    
     def validate(self, value):
         """Base validation - override in subclasses"""
         if value is None and not self.null:
@@ -205,7 +216,7 @@ class ForeignKey(Field):
     
     def __init__(self, to: Type['BaseModel'], on_delete: str = 'CASCADE',
                  related_name: Optional[str] = None, null: bool = False, 
-                 unique: bool = False, default: Optional[str] = None):
+                 unique: bool = False, default: Optional[str] = None, db_index: bool = True):
         # ذخیره ForeignKey-specific attributes
         self.to = to
         self.on_delete = on_delete.upper()
@@ -223,7 +234,8 @@ class ForeignKey(Field):
             field_type='INTEGER',
             null=null,
             unique=unique,
-            default=default
+            default=default,
+            db_index=db_index
         )
     
     def validate(self, value):
@@ -390,3 +402,58 @@ class URLField(CharField):
             raise ValueError(f"Invalid URL: '{value}'")
         
         return value
+
+
+class Index:
+    """Index declared in a model's Meta.indexes
+
+    Args:
+        fields: Indexed fields, prefix with '-' for descending order
+        name: Index name, ``ix_<table>_<fields>`` (``ux_`` when unique, ``_desc``
+            after descending fields) by default
+        unique: Create a UNIQUE index (unique together for several fields)
+        where: SQL condition of a partial index, e.g. ``"active = TRUE"``
+        concurrently: Build the index with CREATE INDEX CONCURRENTLY, which
+            does not block writes to the table (also see Meta.index_concurrently)
+    """
+    
+    def __init__(self, fields: list, name: Optional[str] = None, unique: bool = False,
+                 where: Optional[str] = None, concurrently: bool = False):
+        if not fields:
+            raise ValueError("Index requires at least one field")
+        self.fields = list(fields)
+        self.name = name
+        self.unique = unique
+        self.where = where
+        self.concurrently = concurrently
+    
+    def __repr__(self):
+        return f"<Index(fields={self.fields}, unique={self.unique}, where={self.where!r})>"
+    
+    @property
+    def field_names(self) -> list:
+        """Indexed field names without the '-' prefix"""
+        return [field.lstrip('-') for field in self.fields]
+    
+    def get_name(self, table_name: str) -> str:
+        """Index name, generated from the table and fields unless given"""
+        if self.name:
+            return self.name
+        prefix = 'ux' if self.unique else 'ix'
+        parts = (f"{field[1:]}_desc" if field.startswith('-') else field for field in self.fields)
+        return f"{prefix}_{table_name}_{'_'.join(parts)}"
+    
+    def get_sql(self, table_name: str, concurrently: bool = False) -> str:
+        """Generate the CREATE INDEX statement"""
+        concurrently = concurrently or self.concurrently
+        columns = ', '.join(
+            f"{field[1:]} DESC" if field.startswith('-') else field for field in self.fields
+        )
+        sql = (
+            f"CREATE {'UNIQUE ' if self.unique else ''}INDEX "
+            f"{'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+            f"{self.get_name(table_name)} ON {table_name} ({columns})"
+        )
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
@@ -0,0 +1,80 @@
+"""
+Identity map shared by the SQLite and PostgreSQL models
+
+Inside a ``with session():`` block one instance is kept per ``(model, id)``.
+Repeated ``get(id=...)`` calls and select_related() targets are served from
+memory and return the same object; writes made through the models in the
+block (save, update, delete, bulk and upsert calls) drop the rows they touch
+so the next read sees the database again:
+
+    with session():
+        post = Post.get(id=1)
+        Post.get(id=1) is post      # True, no second query
+
+The session belongs to the thread (or asyncio task) that opened it.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+
+_current = ContextVar('abarorm_session', default=None)
+
+
+class Session:
+    """Instances loaded in one scope, by (model, id)"""
+
+    def __init__(self):
+        self.identity_map = {}
+        self._token = None
+
+    def __enter__(self) -> 'Session':
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self._token = None
+        self.identity_map.clear()
+
+    def __len__(self):
+        return len(self.identity_map)
+
+    def get(self, model, id):
+        """Cached instance of a row, or None"""
+        return self.identity_map.get((model, id))
+
+    def add(self, instance):
+        """Keep an instance and return the one held for its row (the first one loaded wins)"""
+        return self.identity_map.setdefault((type(instance), instance.__dict__.get('id')), instance)
+
+    def replace(self, instance) -> None:
+        """Make an instance the one held for its row"""
+        self.identity_map[(type(instance), instance.__dict__.get('id'))] = instance
+
+    def discard(self, model, id=None) -> None:
+        """Drop one row of a model, or every row of it when id is None"""
+        if id is not None:
+            self.identity_map.pop((model, id), None)
+            return
+        for key in [key for key in self.identity_map if key[0] is model]:
+            del self.identity_map[key]
+
+    def clear(self) -> None:
+        self.identity_map.clear()
+
+
+def session() -> Session:
+    """Open an identity map for the duration of a ``with`` block"""
+    return Session()
+
+
+def current_session() -> Optional[Session]:
+    """The session of the running thread or task, if one is open"""
+    return _current.get()
+
+
+def clear_session() -> None:
+    """Empty the open session, if any"""
+    session = _current.get()
+    if session is not None:
+        session.clear()
@@ -1,25 +1,445 @@
 import psycopg2
 from psycopg2 import sql, Error
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import execute_values
 from typing import List, Optional, Dict, Type
+from contextlib import contextmanager, asynccontextmanager, AsyncExitStack
+from contextvars import ContextVar
+from collections import deque
+import asyncio
+import threading
+import weakref
+import warnings
+import itertools
 import datetime
+import copy
+import json
+import re
+import base64
+import time
 from datetime import date
+from decimal import Decimal
+from types import MappingProxyType
 from .fields.psql import (
     Field, DateTimeField, DecimalField, TimeField, DateField, 
-    CharField, ForeignKey, EmailField, URLField, BooleanField
+    CharField, ForeignKey, EmailField, URLField, BooleanField, Index
 )
+from .aggregates import Aggregate, Count, LOOKUP_OPERATORS
+from .identity_map import current_session, clear_session
+from .cache import QueryCache, add_dependency, invalidate
+
+try:
+    import psycopg
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # AsyncPostgreSQLModel needs psycopg 3
+    psycopg = None
+    AsyncConnectionPool = None
+
+
+class ConnectionPool:
+    """Thread-safe pool of PostgreSQL connections
+
+    Connections are kept open in autocommit mode and handed back to the pool
+    after use instead of being closed. Idle connections above ``min_size`` are
+    closed once they have been unused for ``idle_timeout`` seconds, and a
+    connection that has been idle for ``health_check_interval`` seconds is
+    pinged before reuse so broken connections are replaced transparently.
+    """
+
+    def __init__(self, connect, min_size: int = 1, max_size: int = 10,
+                 idle_timeout: float = 300.0, timeout: float = 30.0,
+                 health_check_interval: float = 30.0):
+        if min_size < 0:
+            raise ValueError("min_size must be >= 0")
+        if max_size < 1 or max_size < min_size:
+            raise ValueError("max_size must be >= 1 and >= min_size")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # (connection, last_used) pairs, most recent last
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Condition()
+
+        for _ in range(min_size):
+            conn = self._open()
+            self._size += 1
+            self._idle.append((conn, time.monotonic()))
+
+    def _open(self):
+        """Open a new connection in autocommit mode"""
+        conn = self._connect()
+        conn.autocommit = True
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn, last_used: float) -> bool:
+        """Check that an idle connection is still alive"""
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _expire_idle(self):
+        """Close connections that stayed idle longer than idle_timeout (lock must be held)"""
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._close(conn)
+
+    def acquire(self):
+        """Take a connection from the pool, opening a new one if needed"""
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("Connection pool is closed")
+                    self._expire_idle()
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn = last_used = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ConnectionError(
+                            f"Timed out after {self.timeout}s waiting for a PostgreSQL connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+
+            if conn is None:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+
+            if self._is_usable(conn, last_used):
+                return conn
+
+            # Broken connection: drop it and try again
+            self._close(conn)
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not conn.autocommit:
+                    conn.autocommit = True
+            except psycopg2.Error:
+                broken = True
+
+        with self._lock:
+            if broken or self._closed:
+                self._size -= 1
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    def close(self):
+        """Close all idle connections and refuse further use"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close(conn)
+            self._lock.notify_all()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# atomic() blocks open in each thread, keyed by database
+_local = threading.local()
+
+# Unique names for server-side cursors
+_cursor_ids = itertools.count(1)
+
+
+def close_all_pools():
+    """Close every connection pool created by PostgreSQL models"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Bind parameters PostgreSQL accepts in one statement
+_MAX_BIND_PARAMS = 65535
+
+# Tasks opening the AsyncConnectionPool of each database, with the event loop they belong to
+_async_pools = {}
+
+# (connection, written tables) of the aatomic() blocks open in the current task, by database key
+_async_transactions = ContextVar('abarorm_async_transactions', default=None)
+
+
+async def close_async_pools():
+    """Close the AsyncPostgreSQLModel pools opened in the running event loop"""
+    loop = asyncio.get_running_loop()
+    for key, (pool_loop, opening) in list(_async_pools.items()):
+        if pool_loop is loop:
+            del _async_pools[key]
+            try:
+                pool = await opening
+            except Exception:
+                continue
+            await pool.close()
+
+
+def _encode_cursor(field_name: str, descending: bool, value, last_id) -> str:
+    """Encode a keyset pagination position as an opaque token"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([field_name, descending, value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(token: str, field_name: str, descending: bool) -> dict:
+    """Decode a token created by _encode_cursor() for the given ordering"""
+    try:
+        cursor_field, cursor_descending, value, last_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if cursor_field != field_name or cursor_descending != descending:
+        raise ValueError("Pagination cursor does not match the requested ordering")
+    return {field_name: value, 'id': last_id}
+
+
+class _CopyReader:
+    """File-like object streaming rows in the COPY text format"""
+
+    _ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+    def __init__(self, rows):
+        self._lines = (self._format_row(row) for row in rows)
+        self._buffer = ''
+
+    @classmethod
+    def _format_value(cls, value) -> str:
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        return str(value).translate(cls._ESCAPES)
+
+    @classmethod
+    def _format_row(cls, row) -> str:
+        return '\t'.join(cls._format_value(value) for value in row) + '\n'
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            data, self._buffer = self._buffer, ''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class ModelOptions:
+    """Immutable per-model metadata compiled once when the model class is created
+
+    Holds the model's fields in definition order together with their
+    validators, the auto_now date fields, the foreign keys and pre-rendered
+    SQL fragments, so the read and write paths never have to inspect the
+    class again.
+    """
+    
+    __slots__ = (
+        'table_name', 'fields', 'field_names', 'column_names', 'valid_fields',
+        'validators', 'converters', 'auto_now_fields', 'foreign_keys', 'indexes', 'cache',
+        'columns_sql', 'select_sql', 'insert_sql', 'update_sql', 'statements',
+    )
+    
+    def __init__(self, model):
+        fields = {
+            name: value for name, value in model.__dict__.items()
+            if isinstance(value, Field)
+        }
+        field_names = tuple(fields)
+        column_names = ('id',) + field_names
+        columns_sql = ', '.join(column_names)
+        placeholders = ', '.join('%s' for _ in field_names)
+        
+        # Field level indexes (db_index, on by default for ForeignKeys) and Meta.indexes
+        indexes = {}
+        for name, field in fields.items():
+            if field.db_index and not field.unique:
+                index = Index([name])
+                indexes[index.get_name(model.table_name)] = index
+        meta_index_names = set()
+        for index in getattr(getattr(model, 'Meta', None), 'indexes', None) or []:
+            for name in index.field_names:
+                if name not in column_names:
+                    raise ValueError(f"Index on {model.__name__} refers to unknown field '{name}'")
+            index_name = index.get_name(model.table_name)
+            if index_name in meta_index_names:
+                raise ValueError(f"Duplicate index name '{index_name}' on {model.__name__}")
+            meta_index_names.add(index_name)
+            indexes[index_name] = index
+        assignments = ', '.join(f"{name} = %s" for name in field_names)
+        
+        # Meta.cache: a QueryCache, or True for one with the default settings
+        cache = getattr(getattr(model, 'Meta', None), 'cache', None)
+        if cache is True:
+            cache = QueryCache()
+        elif not cache:
+            cache = None
+        elif not isinstance(cache, QueryCache):
+            raise ValueError(f"Meta.cache of {model.__name__} must be a QueryCache or True")
+        
+        values = {
+            'table_name': model.table_name,
+            'fields': MappingProxyType(fields),
+            'field_names': field_names,
+            'column_names': column_names,
+            'valid_fields': frozenset(column_names),
+            'validators': tuple((name, field.validate) for name, field in fields.items()),
+            'converters': MappingProxyType({
+                name: field.to_python for name, field in fields.items()
+                if hasattr(field, 'to_python')
+            }),
+            # (name, True for DateField / False for DateTimeField, True when also stamped on UPDATE)
+            'auto_now_fields': tuple(
+                (name, isinstance(field, DateField), field.auto_now) for name, field in fields.items()
+                if isinstance(field, (DateField, DateTimeField))
+                and (field.auto_now or field.auto_now_add)
+            ),
+            'foreign_keys': MappingProxyType({
+                name: field for name, field in fields.items() if isinstance(field, ForeignKey)
+            }),
+            'indexes': tuple(indexes.values()),
+            'cache': cache,
+            'columns_sql': columns_sql,
+            'select_sql': f"SELECT {columns_sql} FROM {model.table_name}",
+            'insert_sql': f"INSERT INTO {model.table_name} ({', '.join(field_names)}) VALUES ({placeholders})",
+            'update_sql': f"UPDATE {model.table_name} SET {assignments} WHERE id = %s",
+            # SQL of other statement shapes, filled in as they are first used
+            'statements': {},
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Model metadata is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Model metadata is read-only")
+    
+    def __repr__(self):
+        return f"<ModelOptions table={self.table_name} fields={list(self.field_names)}>"
+
+
+class _Deferred:
+    """Placeholder shown by repr() for fields left out by only() / defer()"""
+
+    def __repr__(self):
+        return '<deferred>'
+
+
+_DEFERRED = _Deferred()
+
+# Related objects loaded by prefetch_related(), per instance and related_name
+_prefetch_cache = weakref.WeakKeyDictionary()
+
+# Queries already reported by the full-scan debug check
+_scan_warnings = set()
+
+# Filter lookups: (suffix, SQL template for the column, how the value is passed)
+_LOOKUPS = (
+    ('__gte', '{} >= %s', 'value'),
+    ('__lte', '{} <= %s', 'value'),
+    ('__gt', '{} > %s', 'value'),
+    ('__lt', '{} < %s', 'value'),
+    ('__ne', '{} != %s', 'value'),
+    ('__exact', '{} = %s', 'value'),
+    ('__icontains', '{} ILIKE %s', 'like'),
+    ('__contains', '{} LIKE %s', 'like'),
+    ('__in', '{} IN', 'in'),
+)
+
+# Upper bound of compiled statement shapes kept per model
+_MAX_STATEMENTS = 1024
+
+# Per pooled connection: ({query: prepared statement name}, {query: runs so far}).
+# A connection is used by one thread at a time, so only creating an entry needs the lock.
+_prepared = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+# Unique names for prepared statements
+_statement_ids = itertools.count(1)
+
+
+def _can_prepare(query: str) -> bool:
+    """Whether a statement may be prepared: not when it selects ``*``
+
+    A prepared plan fixes its result columns, so a ``*`` projection (the
+    derived tables of select_related() and grouped queries) would fail with
+    "cached plan must not change result type" once a column is added.
+    """
+    return '*' not in query.replace('COUNT(*)', '')
 
 
 class RelatedManager:
     """Manager for handling related objects from ForeignKey"""
     
-    def __init__(self, model, field_name, instance_id):
+    def __init__(self, model, field_name, instance_id, prefetched: Optional[list] = None):
         self.model = model
         self.field_name = field_name
         self.instance_id = instance_id
+        self.prefetched = prefetched
 
     def all(self):
-        """Get all related objects"""
-        return self.model.filter(**{self.field_name: self.instance_id})
+        """Get all related objects (from the prefetch_related() cache when loaded)"""
+        qs = self.model.filter(**{self.field_name: self.instance_id})
+        if self.prefetched is not None:
+            qs._result_cache = list(self.prefetched)
+        return qs
 
     def filter(self, **kwargs):
         """Filter related objects"""
@@ -27,13 +447,15 @@ class RelatedManager:
 
     def first(self):
         """Get first related object"""
-        qs = self.all()
-        return qs.first() if qs.exists() else None
+        return self.all().first()
 
     def last(self):
         """Get last related object"""
-        qs = self.all()
-        return qs.last() if qs.exists() else None
+        return self.all().last()
+
+    def exists(self) -> bool:
+        """Check if related objects exist"""
+        return self.all().exists()
 
     def count(self):
         """Count related objects"""
@@ -56,16 +478,22 @@ class ModelMeta(type):
         else:
             new_cls.table_name = new_cls.Meta.table_name
 
+        new_cls._meta = ModelOptions(new_cls)
+        for field in new_cls._meta.foreign_keys.values():
+            add_dependency(field.to.table_name, new_cls.table_name)
+
         for attr, field in dct.items():
             if isinstance(field, ForeignKey) and field.related_name:
-                def create_related_manager(source_model, source_field):
+                def create_related_manager(source_model, source_field, related_name):
                     """Factory function to create related manager property"""
                     def get_manager(self):
-                        return RelatedManager(source_model, source_field, self.id)
+                        prefetched = _prefetch_cache.get(self, {}).get(related_name)
+                        return RelatedManager(source_model, source_field, self.id, prefetched)
                     return property(get_manager)
                 
                 # Set property on the related model
-                setattr(field.to, field.related_name, create_related_manager(new_cls, attr))
+                setattr(field.to, field.related_name, create_related_manager(new_cls, attr, field.related_name))
+                field.to._register_reverse_relation(field.related_name, new_cls, attr)
 
         # Auto-create table if db_config exists
         if hasattr(new_cls.Meta, 'db_config') and new_cls.Meta.db_config:
@@ -73,117 +501,966 @@ class ModelMeta(type):
 
         return new_cls
 
+
 class BaseModel(metaclass=ModelMeta):
     """Base model class for PostgreSQL ORM"""
     
     table_name = ''
     
     class QuerySet:
-        """QuerySet for handling query results"""
+        """Lazy QuerySet that compiles chained calls into a single SQL query
+
+        Filters, ordering and slicing only build the query. It is executed the
+        first time the QuerySet is iterated, indexed or evaluated, and the
+        loaded instances are cached on the QuerySet.
+        """
         
-        def __init__(self, results, total_count, page, page_size):
-            self.results = results
-            self.total_count = total_count
+        def __init__(self, model, page: int = 1, page_size: Optional[int] = None):
+            self.model = model
             self.page = page
             self.page_size = page_size
+            self._conditions = []
+            self._params = []
+            self._ordering = []
+            self._limit = None
+            self._offset = None
+            self._keyset = None
+            self._fields = None
+            self._result_type = None
+            self._related = ()
+            self._prefetch = ()
+            self._annotations = ()
+            self._having = []
+            self._having_params = []
+            self._result_cache = None
         
-        def filter(self, **kwargs) -> 'QuerySet':
-            """Filter QuerySet results in-memory"""
-            if not kwargs:
-                raise ValueError("At least one filter must be provided")
+        def _clone(self, **changes) -> 'QuerySet':
+            """Copy the QuerySet without its result cache"""
+            clone = copy.copy(self)
+            clone._result_cache = None
+            for key, value in changes.items():
+                setattr(clone, key, value)
+            return clone
+        
+        def _is_sliced(self) -> bool:
+            return self._limit is not None or self._offset is not None
+        
+        def _unsliced(self) -> 'QuerySet':
+            """Wrap a sliced QuerySet so further filtering applies to the slice only"""
+            if not self._is_sliced():
+                return self
+            query, params = self._compile_select('id')
+            return self._clone(
+                _conditions=[f"id IN ({query})"],
+                _params=params,
+                _limit=None,
+                _offset=None,
+            )
+        
+        def _is_grouped(self) -> bool:
+            """values() / values_list() of an annotated QuerySet return one row per group"""
+            return bool(self._annotations) and self._result_type is not None
+        
+        def _output_names(self) -> list:
+            """Column names of value rows, annotations included"""
+            names = list(self._fields or self.model._meta.column_names)
+            return names + [name for name, _ in self._annotations if name not in names]
+        
+        def _resolve_aggregate(self, aggregate):
+            """Split the field of an aggregate into (related model, ForeignKey name, column)"""
+            name, _, rest = aggregate.field.partition('__')
+            reverse_relations = getattr(self.model, '_reverse_relations', {})
+            if name in reverse_relations:
+                related_model, field_name = reverse_relations[name]
+                if not rest and not isinstance(aggregate, Count):
+                    raise ValueError(f"{aggregate!r} needs a field of the related model, e.g. '{name}__<field>'")
+                column = rest or 'id'
+                if column not in related_model._get_valid_fields():
+                    raise ValueError(f"Field '{column}' does not exist on {related_model.__name__}")
+                return related_model, field_name, column
+            
+            if aggregate.field == '*' and isinstance(aggregate, Count):
+                return None, None, '*'
+            if aggregate.field not in self.model._get_valid_fields():
+                raise ValueError(f"Field '{aggregate.field}' does not exist")
+            return None, None, aggregate.field
+        
+        def _related_subquery(self, expression: str, related) -> str:
+            """Correlated subquery evaluating an expression over the related rows of a row"""
+            related_model, field_name, _ = related
+            return (
+                f"(SELECT {expression} FROM {related_model.table_name} AS related_rows "
+                f"WHERE related_rows.{field_name} = {self.model.table_name}.id)"
+            )
+        
+        def _annotation_sql(self, name: str, aggregate) -> str:
+            """SQL of an annotation computed per row (related_name aggregates only)"""
+            related = self._resolve_aggregate(aggregate)
+            if related[0] is None:
+                raise ValueError(
+                    f"Annotation '{name}' aggregates a field of {self.model.__name__} "
+                    f"and needs values() to define the groups"
+                )
+            return self._related_subquery(aggregate.as_sql(f"related_rows.{related[2]}"), related)
+        
+        def _annotation_columns(self) -> list:
+            """Per-row annotation columns of an instance query"""
+            return [f"{self._annotation_sql(name, aggregate)} AS {name}" for name, aggregate in self._annotations]
+        
+        def _compile_grouped(self, names: list, aggregates, group_fields: list, slice_groups: bool):
+            """SELECT computing aggregates per group of group_fields (a single group when empty)
 
-            filtered_results = []
+            Aggregates over related rows are first computed per row in a
+            derived table and then combined, so aggregating several
+            relations never multiplies their rows.
+            """
+            table = self.model.table_name
+            expressions = {}
+            partial_columns = []
+            for name, aggregate in aggregates:
+                related = self._resolve_aggregate(aggregate)
+                if related[0] is None:
+                    expressions[name] = aggregate.as_sql(related[2])
+                    continue
+                if aggregate.distinct:
+                    raise ValueError(f"{aggregate!r} over related rows cannot be combined across rows")
+                aliases = []
+                for number, partial in enumerate(aggregate.partials(f"related_rows.{related[2]}")):
+                    alias = f"{name}_partial{number}"
+                    partial_columns.append(f"{self._related_subquery(partial, related)} AS {alias}")
+                    aliases.append(alias)
+                expressions[name] = aggregate.combine(aliases)
+            
+            inner = self._clone(_annotations=(), _result_type=None, _fields=None, _related=(), _having=[], _having_params=[])
+            if slice_groups:
+                inner = inner._clone(_ordering=[], _limit=None, _offset=None)
+            if partial_columns or inner._is_sliced():
+                query, params = inner._compile_select(', '.join([f"{table}.*"] + partial_columns))
+                source = f"({query}) AS {table}"
+            else:
+                source = table
+                params = list(inner._params)
+                if inner._conditions:
+                    source += " WHERE " + " AND ".join(inner._conditions)
+            
+            columns = [f"{expressions[name]} AS {name}" if name in expressions else name for name in names]
+            query = f"SELECT {', '.join(columns)} FROM {source}"
+            if group_fields:
+                query += " GROUP BY " + ", ".join(group_fields)
+            if not slice_groups:
+                return query, params
+            
+            if self._having:
+                query += " HAVING " + " AND ".join(
+                    f"{expressions[name]} {operator} %s" for name, operator in self._having
+                )
+                params += self._having_params
+            return self._compile_tail(query, params)
+        
+        def _compile_select(self, columns: Optional[str] = None):
+            """Build the SELECT statement and its parameters"""
+            if columns is None and self._is_grouped():
+                names = self._output_names()
+                annotation_names = {name for name, _ in self._annotations}
+                group_fields = [name for name in names if name not in annotation_names]
+                return self._compile_grouped(names, self._annotations, group_fields, slice_groups=True)
+            
+            prefix = ''
+            if columns is None and self._related and self._result_type is None:
+                query, params = self._compile_join()
+                prefix = f"{self.model.table_name}."
+            else:
+                if columns is None:
+                    columns = ', '.join(list(self._fields or self.model._meta.column_names) + self._annotation_columns())
+                query = f"SELECT {columns} FROM {self.model.table_name}"
+                params = list(self._params)
+                if self._conditions:
+                    query += " WHERE " + " AND ".join(self._conditions)
+            
+            return self._compile_tail(query, params, prefix)
+        
+        def _compile_tail(self, query: str, params: list, prefix: str = ''):
+            """Append ORDER BY, LIMIT and OFFSET"""
+            annotation_names = {name for name, _ in self._annotations}
+            if self._ordering:
+                query += " ORDER BY " + ", ".join(
+                    entry if entry.split(' ')[0] in annotation_names else prefix + entry
+                    for entry in self._ordering
+                )
+            if self._limit is not None:
+                query += " LIMIT %s"
+                params.append(self._limit)
+            if self._offset:
+                query += " OFFSET %s"
+                params.append(self._offset)
+            
+            return query, params
+        
+        def _compile_join(self):
+            """SELECT with one LEFT JOIN per select_related() path
 
-            for obj in self.results:
-                match = True
-                for key, value in kwargs.items():
-                    if '__' in key:
-                        field_name, op = key.split('__', 1)
-                        field_value = getattr(obj, field_name, None)
-                        
-                        if op == 'gte' and not (field_value >= value):
-                            match = False
-                            break
-                        elif op == 'lte' and not (field_value <= value):
-                            match = False
-                            break
-                        elif op == 'gt' and not (field_value > value):
-                            match = False
-                            break
-                        elif op == 'lt' and not (field_value < value):
-                            match = False
-                            break
-                        elif op == 'exact' and not (field_value == value):
-                            match = False
-                            break
-                        else:
-                            raise ValueError(f"Unsupported filter operator: {op}")
-                    else:
-                        if getattr(obj, key, None) != value:
-                            match = False
+            The filtered table is wrapped in a derived table under its own
+            name, so the unqualified column names in the conditions stay
+            unambiguous. Related columns are aliased as ``path__column``.
+            """
+            table = self.model.table_name
+            columns = [f"{table}.{name}" for name in (self._fields or self.model._meta.column_names)]
+            columns += self._annotation_columns()
+            joins = []
+            aliases = {'': table}
+            for number, (path, related_model) in enumerate(self._related, 1):
+                parent_path, _, name = path.rpartition('__')
+                alias = f"rel{number}"
+                aliases[path] = alias
+                joins.append(
+                    f"LEFT JOIN {related_model.table_name} AS {alias} "
+                    f"ON {alias}.id = {aliases[parent_path]}.{name}"
+                )
+                columns.extend(
+                    f"{alias}.{column} AS {path}__{column}"
+                    for column in related_model._meta.column_names
+                )
+            
+            source = table
+            if self._conditions:
+                source = f"(SELECT * FROM {table} WHERE {' AND '.join(self._conditions)}) AS {table}"
+            query = f"SELECT {', '.join(columns)} FROM {source} {' '.join(joins)}"
+            return query, list(self._params)
+        
+        def _related_row_loader(self, description):
+            """Row loader that puts select_related() instances on their ForeignKey attributes"""
+            start = len(self._fields or self.model._meta.column_names) + len(self._annotations)
+            load_instance = self.model._row_loader(description[:start])
+            related = []
+            for path, related_model in self._related:
+                column_names = related_model._meta.column_names
+                end = start + len(column_names)
+                load_related = related_model._row_loader([(name,) for name in column_names])
+                related.append((path.split('__'), start, end, load_related))
+                start = end
+            session = current_session()
+            
+            def load(row):
+                instance = load_instance(row)
+                for parts, begin, end, load_related in related:
+                    # A NULL id means there is no related row
+                    if row[begin] is None:
+                        continue
+                    owner = instance
+                    for part in parts[:-1]:
+                        owner = owner.__dict__.get(part)
+                    if isinstance(owner, BaseModel):
+                        target = load_related(row[begin:end])
+                        owner.__dict__[parts[-1]] = session.add(target) if session is not None else target
+                return instance
+            
+            return load
+        
+        def _row_loader(self, description):
+            """Row loader for the result type: instances, dicts, tuples or single values"""
+            if self._result_type is None:
+                if self._related:
+                    return self._related_row_loader(description)
+                return self.model._row_loader(description)
+            
+            columns = tuple(column[0] for column in description)
+            converters = self.model._meta.converters
+            convert = tuple(converters.get(name) for name in columns)
+            if any(convert):
+                def to_tuple(row):
+                    return tuple(
+                        value if fn is None or value is None else fn(value)
+                        for fn, value in zip(convert, row)
+                    )
+            else:
+                to_tuple = tuple
+            
+            if self._result_type == 'dict':
+                return lambda row: dict(zip(columns, to_tuple(row)))
+            if self._result_type == 'flat':
+                return lambda row: to_tuple(row)[0]
+            return to_tuple
+        
+        def _cache_tables(self) -> tuple:
+            """Tables read by the query, whose writes invalidate its cached result"""
+            if self.model._meta.cache is None:
+                return ()
+            tables = [self.model.table_name]
+            tables.extend(model.table_name for _, model in self._related)
+            for _, aggregate in self._annotations:
+                related_model = self._resolve_aggregate(aggregate)[0]
+                if related_model is not None:
+                    tables.append(related_model.table_name)
+            return tuple(tables)
+        
+        def _fetch_all(self) -> list:
+            """Run the query once and cache the resulting instances"""
+            if self._result_cache is None:
+                query, params = self._compile_select()
+                description, rows = self.model._fetch(
+                    query, params, self._cache_tables(), check_scan=bool(self._conditions)
+                )
+                load = self._row_loader(description)
+                results = [load(row) for row in rows]
+                if self._prefetch and self._result_type is None:
+                    self._prefetch_related_objects(results)
+                self._result_cache = results
+            return self._result_cache
+        
+        def iterator(self, chunk_size: int = 2000):
+            """Stream instances through a server-side cursor without caching them
+
+            The pooled connection stays checked out until the iteration is
+            finished or the generator is closed.
+            """
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be >= 1")
+            if self._result_cache is not None:
+                yield from self._result_cache
+                return
+            
+            query, params = self._compile_select()
+            # Named cursors only live inside a transaction. An open atomic() block
+            # already is one; a savepoint per cursor would break when iterators
+            # are interleaved and release their savepoints out of order.
+            with self.model._connection(transaction=self.model._get_transaction() is None) as conn:
+                with conn.cursor(name=f"abarorm_cursor_{next(_cursor_ids)}") as cursor:
+                    cursor.itersize = chunk_size
+                    cursor.execute(query, params)
+                    load = None
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
                             break
+                        if load is None:
+                            # A named cursor only has a description after the first fetch
+                            load = self._row_loader(cursor.description)
+                        batch = [load(row) for row in rows]
+                        if self._prefetch and self._result_type is None:
+                            self._prefetch_related_objects(batch)
+                        yield from batch
+        
+        def _fetch_value(self, query: str, params: list):
+            """Run a query and return the first column of its first row"""
+            with self.model._connection() as conn, conn.cursor() as cursor:
+                self.model._execute(cursor, query, params)
+                row = cursor.fetchone()
+            return row[0] if row else None
+        
+        @property
+        def results(self) -> list:
+            """Loaded model instances"""
+            return self._fetch_all()
+        
+        @property
+        def total_count(self) -> int:
+            """Number of matching records, ignoring pagination"""
+            if not self._is_sliced():
+                return self.count()
+            return self._clone(_limit=None, _offset=None).count()
+        
+        def __iter__(self):
+            return iter(self._fetch_all())
+        
+        def __len__(self):
+            return len(self._fetch_all())
+        
+        def __bool__(self):
+            return bool(self._fetch_all())
+        
+        def __getitem__(self, key):
+            """Index or slice the QuerySet; slices become LIMIT/OFFSET"""
+            if self._result_cache is not None:
+                return self._result_cache[key]
+            
+            if isinstance(key, slice):
+                if key.step is not None or (key.start or 0) < 0 or (key.stop is not None and key.stop < 0):
+                    return self._fetch_all()[key]
+                
+                qs = self._unsliced()
+                start = key.start or 0
+                limit = None if key.stop is None else max(key.stop - start, 0)
+                return qs._clone(_limit=limit, _offset=start or None)
+            
+            if not isinstance(key, int):
+                raise TypeError("QuerySet indices must be integers or slices")
+            if key < 0:
+                return self._fetch_all()[key]
+            
+            results = self[key:key + 1]._fetch_all()
+            if not results:
+                raise IndexError("QuerySet index out of range")
+            return results[0]
+        
+        def evaluate(self) -> 'ResultSet':
+            """Run the query and return an in-memory ResultSet of the instances"""
+            results = list(self._fetch_all())
+            total_count = self.total_count if self._is_sliced() else len(results)
+            return self.model.ResultSet(results, total_count, self.page, self.page_size)
+        
+        def filter(self, **kwargs) -> 'QuerySet':
+            """Add WHERE conditions using the same lookups as Model.filter()"""
+            if not kwargs:
+                raise ValueError("At least one filter must be provided")
+            
+            annotations = dict(self._annotations)
+            field_filters = {}
+            having, having_params = [], []
+            conditions, values = [], []
+            for key, value in kwargs.items():
+                name, _, lookup = key.partition('__')
+                if name not in annotations:
+                    field_filters[key] = value
+                    continue
+                operator = LOOKUP_OPERATORS.get(lookup or 'exact')
+                if operator is None:
+                    raise ValueError(f"Unsupported lookup '{lookup}' for annotation '{name}'")
+                if self._is_grouped():
+                    having.append((name, operator))
+                    having_params.append(value)
+                else:
+                    conditions.append(f"{self._annotation_sql(name, annotations[name])} {operator} %s")
+                    values.append(value)
+            
+            qs = self._unsliced()
+            if field_filters:
+                field_conditions, field_values = self.model._build_conditions(**field_filters)
+                conditions = field_conditions + conditions
+                values = field_values + values
+            return qs._clone(
+                _conditions=qs._conditions + conditions,
+                _params=qs._params + values,
+                _having=qs._having + having,
+                _having_params=qs._having_params + having_params,
+            )
+        
+        def _compile_write(self, query: str, params: list):
+            """Restrict an UPDATE/DELETE to this QuerySet's conditions"""
+            qs = self._unsliced()
+            if qs._conditions:
+                query += " WHERE " + " AND ".join(qs._conditions)
+            return query, list(params) + qs._params
+        
+        def _after_write(self, cascade: bool = False):
+            """Drop loaded, session and cached rows after an UPDATE/DELETE"""
+            self._result_cache = None
+            self.model._forget()
+            self.model._invalidate_cache(cascade)
+        
+        def _execute_write(self, query: str, params: list, cascade: bool = False) -> int:
+            """Run an UPDATE/DELETE restricted to this QuerySet and return the affected row count"""
+            query, params = self._compile_write(query, params)
+            
+            with self.model._connection() as conn, conn.cursor() as cursor:
+                if self._conditions or self._is_sliced():
+                    self.model._warn_full_scan(cursor, query, params)
+                self.model._execute(cursor, query, params)
+                rowcount = cursor.rowcount
+            self._after_write(cascade)
+            return rowcount
+        
+        def _compile_update(self, **kwargs):
+            """Validate the values of update() and build its UPDATE ... SET statement"""
+            if not kwargs:
+                raise ValueError("At least one field to update must be provided")
+            if 'id' in kwargs:
+                raise ValueError("Cannot update 'id' field")
+            
+            valid_fields = self.model._get_valid_fields()
+            for key in kwargs:
+                if key not in valid_fields:
+                    raise ValueError(f"Invalid field name: {key}")
+            
+            validated_data = self.model._validate_values(kwargs, update=True)
+            set_clause = ', '.join([f"{k} = %s" for k in validated_data.keys()])
+            return f"UPDATE {self.model.table_name} SET {set_clause}", list(validated_data.values())
+        
+        def update(self, **kwargs) -> int:
+            """Update all matching records with a single UPDATE statement
 
-                if match:
-                    filtered_results.append(obj)
+            Returns:
+                Number of updated rows
+            """
+            return self._execute_write(*self._compile_update(**kwargs))
+        
+        def delete(self) -> int:
+            """Delete all matching records with a single DELETE statement
 
-            return self.__class__(filtered_results, len(filtered_results), self.page, self.page_size)
+            Returns:
+                Number of deleted rows
+            """
+            rowcount = self._execute_write(f"DELETE FROM {self.model.table_name}", [], cascade=True)
+            # ON DELETE CASCADE / SET NULL may have changed rows of other models
+            clear_session()
+            return rowcount
+        
+        def _count_query(self):
+            """SELECT COUNT(*) statement of count()"""
+            if self._is_grouped():
+                query, params = self._compile_select()
+                query = f"SELECT COUNT(*) FROM ({query}) AS grouped"
+            elif self._is_sliced():
+                query, params = self._compile_select('id')
+                query = f"SELECT COUNT(*) FROM ({query}) AS sliced"
+            else:
+                query, params = self._clone(_ordering=[])._compile_select('COUNT(*)')
+            return query, params
         
         def count(self) -> int:
-            """Count results"""
-            return len(self.results)
+            """Count results with SELECT COUNT(*) unless they are already loaded"""
+            if self._result_cache is not None:
+                return len(self._result_cache)
+            return self._fetch_value(*self._count_query())
 
+        def _as_dicts(self, rows) -> List[Dict]:
+            """Represent loaded rows of any result type as dictionaries"""
+            if self._result_type is None:
+                return [obj.__dict__ for obj in rows]
+            if self._result_type == 'dict':
+                return list(rows)
+            names = self._output_names()
+            if self._result_type == 'flat':
+                return [{names[0]: value} for value in rows]
+            return [dict(zip(names, row)) for row in rows]
+        
         def to_dict(self) -> List[Dict]:
             """Convert results to list of dictionaries"""
-            return [obj.__dict__ for obj in self.results]
+            return self._as_dicts(self)
         
         def __repr__(self):
             """String representation"""
-            sample = self.to_dict()[:3]
+            sample = self._as_dicts(self[:3])
             return f"<QuerySet(count={self.count()}, first_3_items={sample})>"
         
-        def order_by(self, field: str):
-            """Order results by field"""
-            reverse = field.startswith('-')
-            field_name = field.lstrip('-')
+        def annotate(self, **annotations) -> 'QuerySet':
+            """Add aggregates computed in SQL, e.g. ``annotate(n=Count('comments'))``
+
+            On instances, aggregates over a related_name are added as
+            attributes of every row. Followed by values() / values_list(),
+            rows are grouped by the selected fields (GROUP BY) and filters
+            on annotations become HAVING conditions.
+            """
+            if not annotations:
+                raise ValueError("At least one annotation must be provided")
             
-            try:
-                sorted_results = sorted(
-                    self.results,
-                    key=lambda obj: getattr(obj, field_name),
-                    reverse=reverse
-                )
-            except AttributeError:
-                raise ValueError(f"Field '{field_name}' does not exist")
+            valid_fields = self.model._get_valid_fields()
+            for name, aggregate in annotations.items():
+                if not isinstance(aggregate, Aggregate):
+                    raise ValueError(f"annotate() expects aggregates such as Count('field'), got {aggregate!r}")
+                if name in valid_fields:
+                    raise ValueError(f"Annotation '{name}' conflicts with a field of {self.model.__name__}")
+                self._resolve_aggregate(aggregate)
+            return self._clone(_annotations=self._annotations + tuple(annotations.items()))
+        
+        def aggregate(self, **aggregates) -> dict:
+            """Compute aggregates over the matching rows in one query
+
+            e.g. ``aggregate(total=Sum('amount'), n=Count('id'))`` returns
+            ``{'total': ..., 'n': ...}``.
+            """
+            if not aggregates:
+                raise ValueError("At least one aggregate must be provided")
+            for aggregate in aggregates.values():
+                if not isinstance(aggregate, Aggregate):
+                    raise ValueError(f"aggregate() expects aggregates such as Sum('field'), got {aggregate!r}")
             
-            return self.__class__(sorted_results, self.total_count, self.page, self.page_size)
+            query, params = self._compile_grouped(list(aggregates), tuple(aggregates.items()), [], slice_groups=False)
+            with self.model._connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+            return dict(zip(aggregates, row))
         
-        def first(self):
-            """Get first result"""
-            return self.results[0] if self.results else None
+        def select_related(self, *fields: str) -> 'QuerySet':
+            """Load ForeignKey targets in the same query with LEFT JOINs
 
-        def last(self):
-            """Get last result"""
-            return self.results[-1] if self.results else None
+            Nested relations are written as ``'customer__country'``. The
+            related instance replaces the id on the ForeignKey attribute.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            
+            related = dict(self._related)
+            for path in fields:
+                model = self.model
+                parts = path.split('__')
+                for depth, name in enumerate(parts, 1):
+                    field = model._meta.foreign_keys.get(name)
+                    if field is None:
+                        raise ValueError(f"'{name}' is not a ForeignKey of {model.__name__}")
+                    model = field.to
+                    related.setdefault('__'.join(parts[:depth]), model)
+            return self._clone(_related=tuple(related.items()))
         
-        def exists(self) -> bool:
-            """Check if results exist"""
-            return bool(self.results)
+        def prefetch_related(self, *names: str) -> 'QuerySet':
+            """Load related_name relations of the results with one extra query each
 
-        def paginate(self, page: int, page_size: int):
-            """Paginate results"""
-            if page < 1:
-                raise ValueError("Page number must be >= 1")
-            if page_size < 1:
-                raise ValueError("Page size must be >= 1")
+            The related objects are grouped per instance and cached, so
+            ``instance.<related_name>.all()`` needs no further queries.
+            """
+            if not names:
+                raise ValueError("At least one related_name must be provided")
             
-            offset = (page - 1) * page_size
-            paginated_results = self.results[offset:offset + page_size]
-            return self.__class__(paginated_results, self.total_count, page, page_size)
+            reverse_relations = getattr(self.model, '_reverse_relations', {})
+            for name in names:
+                if name not in reverse_relations:
+                    raise ValueError(f"'{name}' is not a related_name of {self.model.__name__}")
+            return self._clone(_prefetch=tuple(dict.fromkeys(self._prefetch + names)))
         
-        def contains(self, **kwargs) -> 'QuerySet':
-            """Case-insensitive contains search"""
-            if not kwargs:
-                raise ValueError("At least one field must be provided")
+        def _prefetch_related_objects(self, instances: list):
+            """Fetch the prefetch_related() objects of the given instances"""
+            ids = list(dict.fromkeys(obj.id for obj in instances))
+            if not ids:
+                return
+            for name in self._prefetch:
+                source_model, field_name = self.model._reverse_relations[name]
+                groups = {id: [] for id in ids}
+                for obj in source_model.filter(**{f"{field_name}__in": ids}).order_by('id'):
+                    groups[obj.__dict__[field_name]].append(obj)
+                for obj in instances:
+                    _prefetch_cache.setdefault(obj, {})[name] = groups[obj.id]
+        
+        def _check_fields(self, fields) -> tuple:
+            """Validate field names used in a projection"""
+            valid_fields = self.model._get_valid_fields() | {name for name, _ in self._annotations}
+            for name in fields:
+                if name not in valid_fields:
+                    raise ValueError(f"Field '{name}' does not exist")
+            return tuple(dict.fromkeys(fields))
+        
+        def values(self, *fields: str) -> 'QuerySet':
+            """Return rows as dicts of the given fields (all fields by default)
+
+            Only the requested columns are selected and no model instances
+            are created.
+            """
+            fields = self._check_fields(fields) or self.model._meta.column_names
+            return self._clone(_fields=fields, _result_type='dict')
+        
+        def values_list(self, *fields: str, flat: bool = False) -> 'QuerySet':
+            """Return rows as tuples of the given fields (all fields by default)
+
+            With ``flat=True`` and a single field, plain values are returned
+            instead of 1-tuples.
+            """
+            if flat and len(fields) != 1:
+                raise ValueError("values_list(flat=True) requires exactly one field")
+            fields = self._check_fields(fields) or self.model._meta.column_names
+            return self._clone(_fields=fields, _result_type='flat' if flat else 'tuple')
+        
+        def only(self, *fields: str) -> 'QuerySet':
+            """Load instances with only the given fields (and id)
+
+            Other fields are fetched with an extra query when first accessed.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            fields = self._check_fields(fields)
+            return self._clone(_fields=('id',) + tuple(name for name in fields if name != 'id'))
+        
+        def defer(self, *fields: str) -> 'QuerySet':
+            """Load instances without the given fields
+
+            Deferred fields are fetched with an extra query when first accessed.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            if 'id' in fields:
+                raise ValueError("The 'id' field cannot be deferred")
+            deferred = set(self._check_fields(fields))
+            current = self._fields or self.model._meta.column_names
+            return self._clone(_fields=tuple(name for name in current if name not in deferred))
+        
+        def order_by(self, *fields: str) -> 'QuerySet':
+            """Order results by one or more fields, prefix with '-' for descending"""
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            
+            valid_fields = self.model._get_valid_fields() | {name for name, _ in self._annotations}
+            ordering = []
+            for field in fields:
+                field_name = field.lstrip('-')
+                if field_name not in valid_fields:
+                    raise ValueError(f"Field '{field_name}' does not exist")
+                direction = "DESC" if field.startswith('-') else "ASC"
+                ordering.append(f"{field_name} {direction}")
+            
+            return self._unsliced()._clone(_ordering=ordering, _keyset=None)
+        
+        def first(self):
+            """Get first result (ordered by id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[0] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = qs._ordering or ["id ASC"]
+            results = qs._clone(_ordering=ordering, _limit=1, _offset=None)._fetch_all()
+            return results[0] if results else None
+
+        def last(self):
+            """Get last result by reversing the ordering (id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[-1] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = [
+                f"{item[:-4]} DESC" if item.endswith(" ASC") else f"{item[:-5]} ASC"
+                for item in qs._ordering
+            ]
+            ordering.append("id DESC")
+            results = qs._clone(_ordering=ordering, _limit=1, _offset=None)._fetch_all()
+            return results[0] if results else None
+        
+        def exists(self) -> bool:
+            """Check if results exist with SELECT 1 ... LIMIT 1"""
+            if self._result_cache is not None:
+                return bool(self._result_cache)
+            if self._is_grouped():
+                return bool(self[:1]._fetch_all())
+            
+            query, params = self._unsliced()._clone(_ordering=[], _limit=1, _offset=None)._compile_select('1')
+            return self._fetch_value(query, params) is not None
+
+        def explain(self, analyze: bool = False) -> dict:
+            """Return the plan of this QuerySet as parsed EXPLAIN (FORMAT JSON) output
+
+            With ``analyze=True`` the query is executed and the plan includes
+            actual row counts, timings and buffer usage (ANALYZE, BUFFERS).
+            """
+            query, params = self._compile_select()
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            with self.model._connection() as conn, conn.cursor() as cursor:
+                cursor.execute(f"EXPLAIN ({options}) {query}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return plan[0]
+
+        def limit(self, count: int) -> 'QuerySet':
+            """Limit the number of results (LIMIT)"""
+            if count < 0:
+                raise ValueError("Limit must be >= 0")
+            qs = self._unsliced() if self._offset is not None else self
+            return qs._clone(_limit=count)
+        
+        def after(self, cursor: Optional[str] = None, order_by: str = 'id', **values) -> 'QuerySet':
+            """Keyset (seek) pagination, combine with limit()
+
+            Rows are ordered by ``order_by`` and then ``id``, and only rows after
+            the given position are returned. The position is either the token
+            returned by ``next_cursor()`` of the previous page or explicit
+            values, e.g. ``after(id=last_id, order_by='created_at')``. Without a
+            position the first page is returned.
+            """
+            field_name = order_by.lstrip('-')
+            if field_name not in self.model._get_valid_fields():
+                raise ValueError(f"Field '{field_name}' does not exist")
+            descending = order_by.startswith('-')
+            
+            if cursor is not None:
+                if values:
+                    raise ValueError("Pass either a cursor or explicit values, not both")
+                values = _decode_cursor(cursor, field_name, descending)
+            elif values and set(values) - {'id', field_name}:
+                raise ValueError(f"after() only accepts 'id' and '{field_name}' values")
+            
+            # Compare against the stored representation (e.g. ISO text for datetimes)
+            field = self.model._meta.fields.get(field_name)
+            if field is not None and values.get(field_name) is not None:
+                values = dict(values, **{field_name: field.validate(values[field_name])})
+            
+            direction = "DESC" if descending else "ASC"
+            ordering = [f"{field_name} {direction}"]
+            if field_name != 'id':
+                ordering.append(f"id {direction}")
+            
+            qs = self._unsliced()
+            conditions = list(qs._conditions)
+            params = list(qs._params)
+            if values:
+                if 'id' not in values:
+                    raise ValueError("after() requires the 'id' of the last seen row")
+                comparison = "<" if descending else ">"
+                table = self.model.table_name
+                if field_name == 'id':
+                    conditions.append(f"id {comparison} %s")
+                    params.append(values['id'])
+                elif field_name in values:
+                    conditions.append(f"({field_name}, id) {comparison} (%s, %s)")
+                    params.extend([values[field_name], values['id']])
+                else:
+                    # Look up the sort value of the last seen row
+                    conditions.append(
+                        f"({field_name}, id) {comparison} "
+                        f"((SELECT {field_name} FROM {table} WHERE id = %s), %s)"
+                    )
+                    params.extend([values['id'], values['id']])
+            
+            return qs._clone(
+                _conditions=conditions,
+                _params=params,
+                _ordering=ordering,
+                _keyset=(field_name, descending),
+            )
+        
+        def next_cursor(self) -> Optional[str]:
+            """Opaque token for the page after this one, None on the last page
+
+            Only available on QuerySets built with after() and limit().
+            """
+            if self._keyset is None or self._limit is None:
+                raise ValueError("next_cursor() requires after() and limit()")
+            if self._result_type is not None:
+                raise ValueError("next_cursor() is not available with values() or values_list()")
+            
+            results = self._fetch_all()
+            if len(results) < self._limit or not results:
+                return None
+            
+            field_name, descending = self._keyset
+            last = results[-1]
+            return _encode_cursor(field_name, descending, getattr(last, field_name), last.id)
+        
+        def paginate(self, page: int, page_size: int) -> 'QuerySet':
+            """Paginate results using LIMIT/OFFSET"""
+            if page < 1:
+                raise ValueError("Page number must be >= 1")
+            if page_size < 1:
+                raise ValueError("Page size must be >= 1")
+            
+            offset = (page - 1) * page_size
+            return self._unsliced()._clone(
+                _limit=page_size,
+                _offset=offset or None,
+                page=page,
+                page_size=page_size,
+            )
+        
+        def contains(self, **kwargs) -> 'QuerySet':
+            """Case-insensitive contains search"""
+            if not kwargs:
+                raise ValueError("At least one field must be provided")
+            
+            valid_fields = self.model._get_valid_fields()
+            conditions = []
+            values = []
+            for field, value in kwargs.items():
+                if field not in valid_fields:
+                    raise ValueError(f"Invalid field name: {field}")
+                conditions.append(f"CAST({field} AS TEXT) ILIKE %s")
+                values.append(f"%{value}%")
+            
+            qs = self._unsliced()
+            return qs._clone(
+                _conditions=qs._conditions + conditions,
+                _params=qs._params + values,
+            )
+
+    class ResultSet:
+        """In-memory results of an evaluated QuerySet"""
+        
+        def __init__(self, results, total_count, page, page_size):
+            self.results = results
+            self.total_count = total_count
+            self.page = page
+            self.page_size = page_size
+        
+        def filter(self, **kwargs) -> 'ResultSet':
+            """Filter results in-memory"""
+            if not kwargs:
+                raise ValueError("At least one filter must be provided")
+
+            filtered_results = []
+
+            for obj in self.results:
+                match = True
+                for key, value in kwargs.items():
+                    if '__' in key:
+                        field_name, op = key.split('__', 1)
+                        field_value = getattr(obj, field_name, None)
+                        
+                        if op == 'gte' and not (field_value >= value):
+                            match = False
+                            break
+                        elif op == 'lte' and not (field_value <= value):
+                            match = False
+                            break
+                        elif op == 'gt' and not (field_value > value):
+                            match = False
+                            break
+                        elif op == 'lt' and not (field_value < value):
+                            match = False
+                            break
+                        elif op == 'exact' and not (field_value == value):
+                            match = False
+                            break
+                        else:
+                            raise ValueError(f"Unsupported filter operator: {op}")
+                    else:
+                        if getattr(obj, key, None) != value:
+                            match = False
+                            break
+
+                if match:
+                    filtered_results.append(obj)
+
+            return self.__class__(filtered_results, len(filtered_results), self.page, self.page_size)
+        
+        def count(self) -> int:
+            """Count results"""
+            return len(self.results)
+
+        def to_dict(self) -> List[Dict]:
+            """Convert results to list of dictionaries"""
+            return [obj.__dict__ for obj in self.results]
+        
+        def __repr__(self):
+            """String representation"""
+            sample = self.to_dict()[:3]
+            return f"<ResultSet(count={self.count()}, first_3_items={sample})>"
+        
+        def order_by(self, field: str):
+            """Order results by field"""
+            reverse = field.startswith('-')
+            field_name = field.lstrip('-')
+            
+            try:
+                sorted_results = sorted(
+                    self.results,
+                    key=lambda obj: getattr(obj, field_name),
+                    reverse=reverse
+                )
+            except AttributeError:
+                raise ValueError(f"Field '{field_name}' does not exist")
+            
+            return self.__class__(sorted_results, self.total_count, self.page, self.page_size)
+        
+        def first(self):
+            """Get first result"""
+            return self.results[0] if self.results else None
+
+        def last(self):
+            """Get last result"""
+            return self.results[-1] if self.results else None
+        
+        def exists(self) -> bool:
+            """Check if results exist"""
+            return bool(self.results)
+
+        def paginate(self, page: int, page_size: int):
+            """Paginate results"""
+            if page < 1:
+                raise ValueError("Page number must be >= 1")
+            if page_size < 1:
+                raise ValueError("Page size must be >= 1")
+            
+            offset = (page - 1) * page_size
+            paginated_results = self.results[offset:offset + page_size]
+            return self.__class__(paginated_results, self.total_count, page, page_size)
+        
+        def contains(self, **kwargs) -> 'ResultSet':
+            """Case-insensitive contains search"""
+            if not kwargs:
+                raise ValueError("At least one field must be provided")
 
             filtered_results = []
 
@@ -214,11 +1491,12 @@ class BaseModel(metaclass=ModelMeta):
             return self.__class__(filtered_results, len(filtered_results), self.page, self.page_size)
 
     def __repr__(self):
-        """String representation of model instance"""
+        """String representation of model instance, without loading deferred fields"""
+        values = self.__dict__
+        unsaved = values.get('id') is None
         field_values = {
-            attr: getattr(self, attr, None) 
-            for attr in self.__class__.__dict__ 
-            if isinstance(self.__class__.__dict__[attr], Field)
+            name: values[name] if name in values else (field.default if unsaved else _DEFERRED)
+            for name, field in self._meta.fields.items()
         }
         return f"<{self.__class__.__name__} {field_values}>"
     
@@ -229,9 +1507,22 @@ class BaseModel(metaclass=ModelMeta):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    def _load_deferred_field(self, field):
+        """Fetch a field left out by only() / defer() the first time it is read"""
+        if getattr(self, 'id', None) is None:
+            return field.default
+        rows = self.__class__.filter(id=self.id).values_list(field.name, flat=True)[:1]._fetch_all()
+        if not rows:
+            # AttributeError keeps getattr(obj, name, default) and hasattr() working
+            raise AttributeError(
+                f"Cannot load deferred field '{field.name}': no {self.__class__.__name__} record with id={self.id}"
+            )
+        self.__dict__[field.name] = rows[0]
+        return rows[0]
+
     @classmethod
     def connect(cls):
-        """Create database connection"""
+        """Open a new database connection (used to fill the connection pool)"""
         if not hasattr(cls, 'Meta') or not hasattr(cls.Meta, 'db_config'):
             raise AttributeError(
                 f"Class {cls.__name__} must define 'Meta.db_config' with database connection details"
@@ -260,6 +1551,135 @@ class BaseModel(metaclass=ModelMeta):
             else:
                 raise ConnectionError(f"Error connecting to PostgreSQL database: {e}")
 
+    @classmethod
+    def _database_key(cls) -> tuple:
+        """Identify the database a model points at"""
+        db_config = cls.Meta.db_config
+        return tuple(db_config.get(k) for k in ('host', 'port', 'user', 'password', 'database'))
+
+    @classmethod
+    def _get_pool(cls) -> ConnectionPool:
+        """Get the connection pool shared by all models using the same database"""
+        key = cls._database_key()
+
+        pool = _pools.get(key)
+        if pool is not None:
+            return pool
+
+        db_config = cls.Meta.db_config
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    cls.connect,
+                    min_size=db_config.get('pool_min_size', 1),
+                    max_size=db_config.get('pool_max_size', 10),
+                    idle_timeout=db_config.get('pool_idle_timeout', 300.0),
+                    timeout=db_config.get('pool_timeout', 30.0),
+                    health_check_interval=db_config.get('pool_health_check_interval', 30.0),
+                )
+                _pools[key] = pool
+            return pool
+
+    @classmethod
+    def _get_transaction(cls):
+        """Get the [connection, depth, written tables] of the atomic() block open in this thread, if any"""
+        transactions = getattr(_local, 'transactions', None)
+        if not transactions:
+            return None
+        return transactions.get(cls._database_key())
+
+    @classmethod
+    @contextmanager
+    def _connection(cls, transaction: bool = False):
+        """Borrow a pooled connection for the duration of a ``with`` block
+
+        Pooled connections run in autocommit mode. With ``transaction=True``
+        the block runs in one transaction that is committed on success and
+        rolled back (by the pool) on error. Inside an atomic() block the
+        connection of that block is used instead, and ``transaction=True``
+        creates a savepoint.
+        """
+        if cls._get_transaction() is not None:
+            if transaction:
+                with cls.atomic() as conn:
+                    yield conn
+            else:
+                yield cls._get_transaction()[0]
+            return
+
+        pool = cls._get_pool()
+        conn = pool.acquire()
+        try:
+            if transaction:
+                conn.autocommit = False
+            yield conn
+            if transaction:
+                conn.commit()
+        finally:
+            pool.release(conn)
+
+    @classmethod
+    @contextmanager
+    def atomic(cls):
+        """Run the block in a single transaction on one connection
+
+        Every ORM call made by this thread inside the block, for any model
+        using the same database, reuses the connection. Nested blocks create
+        savepoints. The transaction is committed when the outermost block
+        exits and rolled back if it raises.
+        """
+        state = cls._get_transaction()
+        
+        if state is None:
+            transactions = getattr(_local, 'transactions', None)
+            if transactions is None:
+                transactions = _local.transactions = {}
+            
+            key = cls._database_key()
+            pool = cls._get_pool()
+            conn = pool.acquire()
+            # Tables written in the block, as (table, cascade)
+            written = set()
+            try:
+                conn.autocommit = False
+                transactions[key] = [conn, 0, written]
+                try:
+                    yield conn
+                except BaseException:
+                    # Instances read or saved in the block may not match the rolled back rows
+                    clear_session()
+                    raise
+                finally:
+                    del transactions[key]
+                conn.commit()
+            finally:
+                # Rolls back if the transaction was not committed
+                pool.release(conn)
+                # Results other threads cached before the commit may be stale
+                for table, cascade in written:
+                    invalidate(table, cascade)
+            return
+        
+        conn = state[0]
+        state[1] += 1
+        savepoint = f"abarorm_sp_{state[1]}"
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield conn
+            except BaseException:
+                clear_session()
+                with conn.cursor() as cursor:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+                raise
+            with conn.cursor() as cursor:
+                cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+        finally:
+            state[1] -= 1
+
     @classmethod
     def _create_database(cls):
         """Create database if it doesn't exist"""
@@ -295,82 +1715,59 @@ class BaseModel(metaclass=ModelMeta):
     @classmethod
     def create_table(cls):
         """Create database table with foreign key constraints"""
-        conn = cls.connect()
-        cursor = None
-        
         try:
-            cursor = conn.cursor()
-            
-            # Step 1: Create table if not exists
-            try:
-                columns = cls._get_column_definitions()
-                create_sql = f"CREATE TABLE IF NOT EXISTS {cls.table_name} (id SERIAL PRIMARY KEY, {', '.join(columns)})"
-                cursor.execute(create_sql)
-                conn.commit()
-            except psycopg2.Error as e:
-                conn.rollback()
-                if "already exists" not in str(e):
-                    print(f"Warning during table creation: {e}")
-                cursor.close()
-                cursor = conn.cursor()
-            
-            # Step 2: Add foreign key constraints
-            try:
-                cls._add_foreign_key_constraints(cursor)
-                conn.commit()
-            except psycopg2.Error as e:
-                conn.rollback()
-                if "already exists" not in str(e):
-                    print(f"Warning during foreign key creation: {e}")
-                cursor.close()
-                cursor = conn.cursor()
-            
-            # Step 3: Update table structure (add new columns)
-            try:
-                cls._update_table_structure(cursor)
-                conn.commit()
-            except psycopg2.Error as e:
-                conn.rollback()
-                print(f"Warning during table update: {e}")
+            # Pooled connections run in autocommit mode, so every step is
+            # applied on its own and a failing step does not undo the others
+            with cls._connection() as conn, conn.cursor() as cursor:
+                # Step 1: Create table if not exists
+                try:
+                    columns = cls._get_column_definitions()
+                    create_sql = f"CREATE TABLE IF NOT EXISTS {cls.table_name} (id SERIAL PRIMARY KEY, {', '.join(columns)})"
+                    cursor.execute(create_sql)
+                except psycopg2.Error as e:
+                    if "already exists" not in str(e):
+                        print(f"Warning during table creation: {e}")
                 
-        except Exception as e:
-            if conn:
+                # Step 2: Add foreign key constraints
                 try:
-                    conn.rollback()
-                except:
-                    pass
-            raise ConnectionError(f"Failed to create table {cls.table_name}: {e}")
-        
-        finally:
-            if cursor:
+                    cls._add_foreign_key_constraints(cursor)
+                except psycopg2.Error as e:
+                    if "already exists" not in str(e):
+                        print(f"Warning during foreign key creation: {e}")
+                
+                # Step 3: Update table structure (add new columns)
                 try:
-                    cursor.close()
-                except:
-                    pass
-            if conn:
+                    cls._update_table_structure(cursor)
+                except psycopg2.Error as e:
+                    print(f"Warning during table update: {e}")
+                
+                # Step 4: Create and drop indexes to match the model
                 try:
-                    conn.close()
-                except:
-                    pass
+                    cls._sync_indexes(cursor)
+                except psycopg2.Error as e:
+                    print(f"Warning during index update: {e}")
+                
+        except Exception as e:
+            raise ConnectionError(f"Failed to create table {cls.table_name}: {e}")
+
+    @classmethod
+    def _get_column_type(cls, field: Field) -> str:
+        """SQL type of a field's column"""
+        if isinstance(field, DecimalField):
+            return f"DECIMAL({field.max_digits}, {field.decimal_places})"
+        if isinstance(field, CharField):
+            return f"VARCHAR({field.max_length})"
+        return field.field_type
 
     @classmethod
     def _get_column_definitions(cls):
         """Generate column definitions for CREATE TABLE"""
         columns = []
         
-        for attr, field in cls.__dict__.items():
-            if not isinstance(field, Field):
-                continue
+        for attr, field in cls._meta.fields.items():
             
             # Skip ForeignKey constraint definition here (added separately)
-            col_type = field.field_type
-            
-            if isinstance(field, DecimalField):
-                col_type = f"DECIMAL({field.max_digits}, {field.decimal_places})"
-            elif isinstance(field, CharField):
-                col_type = f"VARCHAR({field.max_length})"
-            
-            column_def = f"{attr} {col_type}"
+            column_def = f"{attr} {cls._get_column_type(field)}"
             
             if field.unique:
                 column_def += " UNIQUE"
@@ -393,50 +1790,41 @@ class BaseModel(metaclass=ModelMeta):
     @classmethod
     def _add_foreign_key_constraints(cls, cursor):
         """Add FOREIGN KEY constraints after table creation"""
-        for attr, field in cls.__dict__.items():
-            if isinstance(field, ForeignKey):
-                try:
-                    constraint_name = f"fk_{cls.table_name}_{attr}"
-                    cursor.execute(
-                        """
-                        SELECT 1 FROM information_schema.table_constraints 
-                        WHERE constraint_name = %s AND table_name = %s
-                        """,
-                        (constraint_name, cls.table_name)
-                    )
+        for attr, field in cls._meta.foreign_keys.items():
+            try:
+                constraint_name = f"fk_{cls.table_name}_{attr}"
+                cursor.execute(
+                    """
+                    SELECT 1 FROM information_schema.table_constraints 
+                    WHERE constraint_name = %s AND table_name = %s
+                    """,
+                    (constraint_name, cls.table_name)
+                )
                     
-                    if cursor.fetchone():
-                        # Constraint already exists
-                        continue
+                if cursor.fetchone():
+                    # Constraint already exists
+                    continue
                     
-                    constraint_sql = field.get_constraint(attr, cls.table_name)
-                    cursor.execute(constraint_sql)
+                constraint_sql = field.get_constraint(attr, cls.table_name)
+                cursor.execute(constraint_sql)
                     
-                except psycopg2.Error as e:
-                    if "already exists" in str(e) or "duplicate" in str(e).lower():
-                        continue
-                    else:
-                        print(f"Warning: Could not add foreign key constraint for {attr}: {e}")
+            except psycopg2.Error as e:
+                if "already exists" in str(e) or "duplicate" in str(e).lower():
+                    continue
+                else:
+                    print(f"Warning: Could not add foreign key constraint for {attr}: {e}")
 
     @classmethod
     def _update_table_structure(cls, cursor):
         """Add new columns to existing table"""
         existing_columns = cls._get_existing_columns(cursor)
         new_columns = [
-            attr for attr in cls.__dict__ 
-            if isinstance(cls.__dict__[attr], Field) and attr not in existing_columns
+            attr for attr in cls._meta.field_names if attr not in existing_columns
         ]
 
         for column in new_columns:
-            field = cls.__dict__[column]
-            col_type = field.field_type
-            
-            if isinstance(field, DecimalField):
-                col_type = f"DECIMAL({field.max_digits}, {field.decimal_places})"
-            elif isinstance(field, CharField):
-                col_type = f"VARCHAR({field.max_length})"
-            
-            column_def = f"ALTER TABLE {cls.table_name} ADD COLUMN {column} {col_type}"
+            field = cls._meta.fields[column]
+            column_def = f"ALTER TABLE {cls.table_name} ADD COLUMN {column} {cls._get_column_type(field)}"
             
             # For new columns, allow NULL initially
             column_def += " NULL"
@@ -459,194 +1847,423 @@ class BaseModel(metaclass=ModelMeta):
                     print(f"Warning: Could not add column {column}: {e}")
 
     @classmethod
-    def _get_existing_columns(cls, cursor):
-        """Get existing columns from table"""
+    def _sync_indexes(cls, cursor):
+        """Create missing indexes and drop generated ones that are no longer declared
+
+        Only indexes named ix_<table>_... / ux_<table>_... are dropped, so
+        indexes created outside the model are left alone. An invalid index
+        left behind by a failed CREATE INDEX CONCURRENTLY is rebuilt, and so
+        is an index whose definition no longer matches the declared one.
+        Meta.index_concurrently builds every index of the model concurrently,
+        which needs an autocommit connection (not inside atomic()).
+        """
         cursor.execute(
-            "SELECT column_name FROM information_schema.columns WHERE table_name = %s",
+            """
+            SELECT c.relname, i.indisvalid, pg_get_indexdef(i.indexrelid),
+                   obj_description(c.oid, 'pg_class')
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = %s::regclass
+            """,
             (cls.table_name,)
         )
-        return {row[0] for row in cursor.fetchall()}
-    
-    @classmethod
-    def _get_valid_fields(cls):
-        """Cache valid field names for performance"""
-        if not hasattr(cls, '_valid_fields_cache'):
-            cls._valid_fields_cache = {
-                attr for attr, field in cls.__dict__.items() 
-                if isinstance(field, Field)
-            }
-            cls._valid_fields_cache.add('id')
-        return cls._valid_fields_cache
-    
-    @classmethod
-    def _validate_and_convert_values(cls, **kwargs):
-        """Validate and convert field values using field validators"""
+        existing = {row[0]: row[1:] for row in cursor.fetchall()}
+        declared = {index.get_name(cls.table_name): index for index in cls._meta.indexes}
+        concurrently = getattr(cls.Meta, 'index_concurrently', False)
+        
+        for name, index in declared.items():
+            build_concurrently = concurrently or index.concurrently
+            definition = index.get_sql(cls.table_name)
+            try:
+                if name in existing:
+                    valid, indexdef, comment = existing[name]
+                    if valid and cls._index_matches(index, indexdef, comment, definition):
+                        if comment != definition:
+                            cursor.execute(f"COMMENT ON INDEX {name} IS %s", (definition,))
+                        continue
+                    cursor.execute(f"DROP INDEX {'CONCURRENTLY ' if build_concurrently else ''}IF EXISTS {name}")
+                cursor.execute(index.get_sql(cls.table_name, concurrently=build_concurrently))
+                cursor.execute(f"COMMENT ON INDEX {name} IS %s", (definition,))
+            except psycopg2.Error as e:
+                print(f"Warning: Could not create index {name}: {e}")
+        
+        generated = (f"ix_{cls.table_name}_", f"ux_{cls.table_name}_")
+        for name in set(existing) - set(declared):
+            if name.startswith(generated):
+                cursor.execute(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+
+    @staticmethod
+    def _index_matches(index, indexdef: str, comment: Optional[str], definition: str) -> bool:
+        """Whether an existing index still has the declared definition
+
+        The CREATE INDEX statement is kept as the index comment when the index
+        is built. PostgreSQL rewrites where conditions in pg_get_indexdef, so
+        indexes without that comment are compared on unique, columns and sort
+        order, and on whether they are partial at all.
+        """
+        if comment and comment.startswith('CREATE '):
+            return comment.split() == definition.split()
+        match = re.search(r" USING \w+ \((.*?)\)(?: WHERE (.*))?$", indexdef)
+        if match is None:
+            return False
+        columns = ', '.join(
+            f"{field[1:]} DESC" if field.startswith('-') else field for field in index.fields
+        )
+        return (
+            indexdef.startswith('CREATE UNIQUE ') == index.unique
+            and match.group(1) == columns
+            and (match.group(2) is not None) == bool(index.where)
+        )
+
+    @classmethod
+    def _get_existing_columns(cls, cursor):
+        """Get existing columns from table"""
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = %s",
+            (cls.table_name,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    @classmethod
+    def _get_valid_fields(cls):
+        """Valid field names, including id"""
+        return cls._meta.valid_fields
+    
+    @classmethod
+    def _register_reverse_relation(cls, related_name: str, model, field_name: str):
+        """Record a ForeignKey pointing at this model under its related_name"""
+        if '_reverse_relations' not in cls.__dict__:
+            cls._reverse_relations = {}
+        cls._reverse_relations[related_name] = (model, field_name)
+    
+    @classmethod
+    def _row_loader(cls, description):
+        """Compile a function that turns rows of the given cursor description into instances
+
+        Column names and their to_python converters are resolved once per
+        query. Instances are built with __new__ and get their attribute dict
+        directly, skipping __init__ and the per-attribute setattr calls.
+        """
+        columns = tuple(column[0] for column in description)
+        converters = tuple(
+            (name, cls._meta.converters[name]) for name in columns
+            if name in cls._meta.converters
+        )
+        new = cls.__new__
+        
+        def load(row):
+            values = dict(zip(columns, row))
+            for name, convert in converters:
+                value = values[name]
+                if value is not None:
+                    values[name] = convert(value)
+            instance = new(cls)
+            instance.__dict__ = values
+            return instance
+        
+        return load
+    
+    @classmethod
+    def _validate_and_convert_values(cls, **kwargs):
+        """Validate and convert field values using field validators"""
+        return cls._validate_values(kwargs)
+
+    @classmethod
+    def _validate_values(cls, kwargs: dict, update: bool = False):
+        """Validate and convert field values and fill in the auto_now / auto_now_add dates
+
+        With ``update=True`` only auto_now dates are refreshed, so the
+        auto_now_add creation dates of existing rows are kept.
+        """
+        meta = cls._meta
         validated = {}
         
-        for attr, field in cls.__dict__.items():
-            if not isinstance(field, Field):
-                continue
-            
-            # Handle ForeignKey
-            if isinstance(field, ForeignKey):
-                if attr in kwargs:
-                    try:
-                        validated[attr] = field.validate(kwargs[attr])
-                    except ValueError as e:
-                        raise ValueError(f"Validation error for field '{attr}': {e}")
-                continue
-            
-            # Handle regular fields
-            if attr in kwargs:
-                # Apply field validation if method exists
-                if hasattr(field, 'validate'):
-                    try:
-                        validated[attr] = field.validate(kwargs[attr])
-                    except ValueError as e:
-                        raise ValueError(f"Validation error for field '{attr}': {e}")
-                else:
-                    validated[attr] = kwargs[attr]
-            
-            # Handle auto_now and auto_now_add
-            elif isinstance(field, (DateField, DateTimeField)):
-                if field.auto_now or field.auto_now_add:
-                    if isinstance(field, DateField):
-                        validated[attr] = datetime.datetime.now().date()
-                    else:
-                        validated[attr] = datetime.datetime.now()
+        for name, validate in meta.validators:
+            if name in kwargs:
+                try:
+                    validated[name] = validate(kwargs[name])
+                except ValueError as e:
+                    raise ValueError(f"Validation error for field '{name}': {e}")
+        
+        # Handle auto_now and auto_now_add
+        now = None
+        for name, date_only, on_update in meta.auto_now_fields:
+            if name not in validated and (on_update or not update):
+                if now is None:
+                    now = datetime.datetime.now()
+                validated[name] = now.date().isoformat() if date_only else now.isoformat()
         
         return validated
     
     @classmethod
     def all(cls, order_by: Optional[str] = None) -> 'QuerySet':
         """Get all records"""
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                query = f"SELECT * FROM {cls.table_name}"
-                
-                if order_by:
-                    field_name = order_by.lstrip('-')
-                    valid_fields = cls._get_valid_fields()
-                    if field_name != 'id' and field_name not in valid_fields:
-                        raise ValueError(f"Invalid field name for ordering: {field_name}")
-                    
-                    direction = "DESC" if order_by.startswith('-') else "ASC"
-                    query += f" ORDER BY {field_name} {direction}"
-                
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                return cls.QuerySet(
-                    [cls(**dict(zip([c[0] for c in cursor.description], row))) for row in results],
-                    len(results),
-                    page=1,
-                    page_size=len(results)
-                )
-        finally:
-            conn.close()
+        qs = cls.QuerySet(cls)
+        if order_by:
+            field_name = order_by.lstrip('-')
+            valid_fields = cls._get_valid_fields()
+            if field_name != 'id' and field_name not in valid_fields:
+                raise ValueError(f"Invalid field name for ordering: {field_name}")
+            qs = qs.order_by(order_by)
+        return qs
 
     @classmethod
-    def filter(cls, **kwargs) -> 'QuerySet':
-        """Filter records with various operators"""
-        if not kwargs:
-            return cls.all()
+    def iterator(cls, chunk_size: int = 2000):
+        """Stream all records in chunks without loading them all into memory"""
+        return cls.all().iterator(chunk_size=chunk_size)
+
+    @classmethod
+    def _statement(cls, shape: tuple, build):
+        """SQL (or lookup plan) of a statement shape, built once per model and memoized"""
+        statements = cls._meta.statements
+        compiled = statements.get(shape)
+        if compiled is None:
+            compiled = build()
+            if len(statements) < _MAX_STATEMENTS:
+                statements[shape] = compiled
+        return compiled
+
+    @classmethod
+    def _compile_lookups(cls, keys: tuple) -> tuple:
+        """Compile filter lookups into (key, kind, SQL) steps"""
+        valid_fields = cls._get_valid_fields()
+        plan = []
+        for key in keys:
+            for suffix, template, kind in _LOOKUPS:
+                if key.endswith(suffix):
+                    column = key[:-len(suffix)]
+                    break
+            else:
+                column, template, kind = key, "{} = %s", 'value'
+            
+            if column != 'id' and column not in valid_fields:
+                raise ValueError(f"Invalid field name: {column}")
+            plan.append((key, kind, template.format(column)))
+        return tuple(plan)
+
+    @classmethod
+    def _build_conditions(cls, **kwargs):
+        """Translate filter lookups into SQL conditions and their values
+
+        Lookups are compiled once per shape (the sorted lookup names), so
+        repeated filters only bind their values.
+        """
+        keys = tuple(sorted(kwargs))
+        plan = cls._statement(('lookups',) + keys, lambda: cls._compile_lookups(keys))
         
         conditions = []
         values = []
-        valid_fields = cls._get_valid_fields()
-
-        for key, value in kwargs.items():
-            base_key = key
-            operator = "="
-            
-            if key.endswith("__gte"):
-                base_key = key[:-5]
-                operator = ">="
-            elif key.endswith("__lte"):
-                base_key = key[:-5]
-                operator = "<="
-            elif key.endswith("__gt"):
-                base_key = key[:-4]
-                operator = ">"
-            elif key.endswith("__lt"):
-                base_key = key[:-4]
-                operator = "<"
-            elif key.endswith("__ne"):
-                base_key = key[:-4]
-                operator = "!="
-            elif key.endswith("__icontains"):
-                base_key = key[:-11]
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                conditions.append(f"{base_key} ILIKE %s")
-                values.append(f"%{value}%")
-                continue
-            elif key.endswith("__contains"):
-                base_key = key[:-10]
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                conditions.append(f"{base_key} LIKE %s")
+        for key, kind, sql in plan:
+            value = kwargs[key]
+            if kind == 'value':
+                conditions.append(sql)
+                values.append(value)
+            elif kind == 'like':
+                conditions.append(sql)
                 values.append(f"%{value}%")
-                continue
-            elif key.endswith("__in"):
-                base_key = key[:-4]
+            else:
                 if not isinstance(value, (list, tuple)):
                     raise ValueError(f"Value for {key} must be a list or tuple")
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                placeholders = ", ".join(["%s" for _ in value])
-                conditions.append(f"{base_key} IN ({placeholders})")
+                conditions.append(f"{sql} ({', '.join(['%s'] * len(value))})")
                 values.extend(value)
-                continue
-            
-            if base_key != 'id' and base_key not in valid_fields:
-                raise ValueError(f"Invalid field name: {base_key}")
+        
+        return conditions, values
+
+    @classmethod
+    def filter(cls, **kwargs) -> 'QuerySet':
+        """Filter records with various operators (evaluated lazily)"""
+        if not kwargs:
+            return cls.all()
+        
+        return cls.QuerySet(cls).filter(**kwargs)
+
+    @classmethod
+    def _execute(cls, cursor, query: str, params) -> None:
+        """Run a statement, as a server-side prepared statement once it is frequent
+
+        Opt-in with ``db_config['prepare_threshold']`` (None by default, as
+        prepared statements do not work behind PgBouncer transaction pooling):
+        after that many runs of the same SQL on a connection the statement
+        is PREPAREd there, and later runs only send EXECUTE with the
+        parameters, skipping the server's parse and plan. Up to
+        ``db_config['prepared_max']`` (default 100) statements are prepared
+        per connection.
+        """
+        config = cls.Meta.db_config
+        threshold = config.get('prepare_threshold')
+        if threshold is None or not params:
+            cursor.execute(query, params)
+            return
+        
+        conn = cursor.connection
+        state = _prepared.get(conn)
+        if state is None:
+            with _prepared_lock:
+                state = _prepared.setdefault(conn, ({}, {}))
+        statements, uses = state
+        name = statements.get(query)
+        
+        if name is None:
+            runs = uses.get(query, 0) + 1
+            # New statements are only prepared outside transactions, which
+            # keeps a failing PREPARE from aborting one
+            if (runs < threshold or not conn.autocommit or not _can_prepare(query)
+                    or len(statements) >= config.get('prepared_max', 100)):
+                if len(uses) >= _MAX_STATEMENTS:
+                    uses.clear()
+                uses[query] = runs
+                cursor.execute(query, params)
+                return
             
-            conditions.append(f"{base_key} {operator} %s")
-            values.append(value)
+            name = f"abarorm_stmt_{next(_statement_ids)}"
+            parts = query.split('%s')
+            cursor.execute(f"PREPARE {name} AS " + parts[0] + "".join(
+                f"${number}{part}" for number, part in enumerate(parts[1:], 1)
+            ))
+            statements[query] = name
+            uses.pop(query, None)
+        
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+    @classmethod
+    def _fetch(cls, query: str, params, tables: tuple = (), single: bool = False,
+               check_scan: bool = True):
+        """Run a SELECT and return (description, rows), reading through Meta.cache when it is set
 
-        query = f"SELECT * FROM {cls.table_name} WHERE " + " AND ".join(conditions)
+        The description only holds the column names. Nothing is cached while
+        a transaction is open, since its rows may not be committed.
+        """
+        cache = cls._meta.cache
+        key = None
+        if cache is not None and cls._get_transaction() is None:
+            key = cache.key(tables or (cls.table_name,), query, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
         
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute(query, tuple(values))
-                results = cursor.fetchall()
-                
-                return cls.QuerySet(
-                    [cls(**dict(zip([c[0] for c in cursor.description], row))) for row in results],
-                    len(results),
-                    page=1,
-                    page_size=len(results)
-                )
-        finally:
-            conn.close()
+        with cls._connection() as conn, conn.cursor() as cursor:
+            if check_scan:
+                cls._warn_full_scan(cursor, query, params)
+            cls._execute(cursor, query, params)
+            if single:
+                row = cursor.fetchone()
+                rows = [row] if row is not None else []
+            else:
+                rows = cursor.fetchall()
+            result = (tuple((column[0],) for column in cursor.description), rows)
+        
+        if key is not None:
+            cache.set(key, result)
+        return result
+
+    @classmethod
+    def _invalidate_cache(cls, cascade: bool = False) -> None:
+        """Invalidate cached results that read this model's table after a write
+
+        Inside atomic() the table is invalidated again once the transaction
+        ends, as other threads may cache the old rows until the commit.
+        """
+        invalidate(cls.table_name, cascade)
+        state = cls._get_transaction()
+        if state is not None:
+            state[2].add((cls.table_name, cascade))
+
+    @classmethod
+    def _warn_full_scan(cls, cursor, query: str, params) -> None:
+        """Debug check: warn when a query plan has a Seq Scan on a table larger than the threshold
+
+        Enabled with ``db_config['warn_full_scans']``; the row threshold is
+        ``db_config['full_scan_threshold']`` (default 1000). Each query is
+        reported once, as a RuntimeWarning.
+        """
+        config = cls.Meta.db_config
+        if not config.get('warn_full_scans') or query in _scan_warnings:
+            return
+        threshold = config.get('full_scan_threshold', 1000)
+        
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        
+        nodes = [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', []))
+            if node.get('Node Type') != 'Seq Scan':
+                continue
+            table = node['Relation Name']
+            # reltuples is the planner's row estimate; -1 until the table is first analyzed
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", (table,))
+            rows = cursor.fetchone()[0]
+            if rows < 0:
+                rows = node.get('Plan Rows', 0)
+            if rows >= threshold:
+                if len(_scan_warnings) >= _MAX_STATEMENTS:
+                    _scan_warnings.clear()
+                _scan_warnings.add(query)
+                warnings.warn(f"sequential scan on '{table}' (~{int(rows)} rows): {query}", RuntimeWarning)
+                return
+
+    @classmethod
+    def _forget(cls, id: Optional[int] = None) -> None:
+        """Drop one row, or every row, of this model from the open session()"""
+        session = current_session()
+        if session is not None:
+            session.discard(cls, id)
+
+    @classmethod
+    def _get_query(cls, keys: tuple) -> str:
+        """SELECT statement of get() for the given filter fields"""
+        def build():
+            valid_fields = cls._get_valid_fields()
+            for key in keys:
+                if key != 'id' and key not in valid_fields:
+                    raise ValueError(f"Invalid field name: {key}")
+            return f"{cls._meta.select_sql} WHERE " + " AND ".join(f"{key} = %s" for key in keys)
+        
+        return cls._statement(('get',) + keys, build)
+
+    @classmethod
+    def _insert_query(cls, columns: tuple) -> str:
+        """INSERT statement of create() for the given columns"""
+        if columns == cls._meta.field_names:
+            return cls._meta.insert_sql
+        return cls._statement(('insert',) + columns, lambda: (
+            f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({', '.join('%s' for _ in columns)})"
+        ))
+
+    @classmethod
+    def _update_query(cls, columns: tuple) -> str:
+        """UPDATE statement of update() for the given columns"""
+        if columns == cls._meta.field_names:
+            return cls._meta.update_sql
+        return cls._statement(('update',) + columns, lambda: (
+            f"UPDATE {cls.table_name} SET {', '.join(f'{name} = %s' for name in columns)} WHERE id = %s"
+        ))
 
     @classmethod
     def get(cls, **kwargs) -> Optional['BaseModel']:
-        """Get single record"""
+        """Get single record
+
+        Inside session(), ``get(id=...)`` returns the instance already loaded
+        for that row without a query.
+        """
         if not kwargs:
             raise ValueError("At least one filter must be provided")
         
-        valid_fields = cls._get_valid_fields()
-        
-        for key in kwargs.keys():
-            if key != 'id' and key not in valid_fields:
-                raise ValueError(f"Invalid field name: {key}")
+        session = current_session()
+        if session is not None and kwargs.keys() == {'id'}:
+            instance = session.get(cls, kwargs['id'])
+            if instance is not None:
+                return instance
         
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                query = f"SELECT * FROM {cls.table_name} WHERE " + " AND ".join([f"{k} = %s" for k in kwargs.keys()])
-                cursor.execute(query, tuple(kwargs.values()))
-                result = cursor.fetchone()
-                
-                if result:
-                    return cls(**dict(zip([c[0] for c in cursor.description], result)))
-                return None
-        finally:
-            conn.close()
+        query = cls._get_query(tuple(kwargs))
+        description, rows = cls._fetch(query, tuple(kwargs.values()), single=True)
+        if rows:
+            instance = cls._row_loader(description)(rows[0])
+            return session.add(instance) if session is not None else instance
+        return None
 
     @classmethod
     def create(cls, **kwargs) -> int:
@@ -654,64 +2271,284 @@ class BaseModel(metaclass=ModelMeta):
         # Validate and convert all values
         validated_data = cls._validate_and_convert_values(**kwargs)
         
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                columns = list(validated_data.keys())
-                placeholders = ['%s' for _ in columns]
-                values = list(validated_data.values())
-                
-                query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)}) RETURNING id"
-                cursor.execute(query, tuple(values))
-                new_id = cursor.fetchone()[0]
-            
-            conn.commit()
-            return new_id
-        finally:
-            conn.close()
+        query = cls._insert_query(tuple(validated_data))
+        
+        with cls._connection() as conn, conn.cursor() as cursor:
+            cls._execute(cursor, query + " RETURNING id", tuple(validated_data.values()))
+            new_id = cursor.fetchone()[0]
+        
+        cls._invalidate_cache()
+        return new_id
     
     @classmethod
-    def bulk_create(cls, records: list) -> int:
-        """Bulk create records with validation"""
+    def bulk_create(cls, records: list, batch_size: Optional[int] = None,
+                    method: str = 'copy', returning: bool = False):
+        """Bulk create records with validation
+
+        Args:
+            records: List of dicts with field values
+            batch_size: Number of rows sent per COPY / INSERT statement (all rows by default)
+            method: 'copy' streams rows through COPY ... FROM STDIN,
+                'values' sends multi-row INSERT ... VALUES statements
+            returning: Return the new ids instead of the count
+                (uses INSERT ... VALUES ... RETURNING id, since COPY cannot return keys)
+
+        Returns:
+            Number of created records, or the list of new ids in input order
+        """
         if not records:
             raise ValueError("The records list is empty")
+        if method not in ('copy', 'values'):
+            raise ValueError("method must be 'copy' or 'values'")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
         
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                all_values = []
+        # Records may set different fields, so rows are grouped by their columns
+        groups = {}
+        for index, record in enumerate(records):
+            validated_data = cls._validate_and_convert_values(**record)
+            indexes, rows = groups.setdefault(tuple(validated_data), ([], []))
+            indexes.append(index)
+            rows.append(tuple(validated_data.values()))
+        
+        new_ids = [None] * len(records)
+        with cls._connection(transaction=True) as conn, conn.cursor() as cursor:
+            for columns, (indexes, rows) in groups.items():
+                column_sql = ', '.join(columns)
+                size = batch_size or len(rows)
                 
-                for record in records:
-                    validated_data = cls._validate_and_convert_values(**record)
-                    all_values.append(tuple(validated_data.values()))
+                if method == 'copy' and not returning:
+                    for start in range(0, len(rows), size):
+                        cursor.copy_expert(
+                            f"COPY {cls.table_name} ({column_sql}) FROM STDIN",
+                            _CopyReader(rows[start:start + size])
+                        )
+                    continue
                 
-                # Use columns from first validated record
-                first_validated = cls._validate_and_convert_values(**records[0])
-                columns = list(first_validated.keys())
-                placeholders = ", ".join(["%s" for _ in columns])
-                query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+                query = f"INSERT INTO {cls.table_name} ({column_sql}) VALUES %s"
+                if returning:
+                    query += " RETURNING id"
+                result = execute_values(cursor, query, rows, page_size=size, fetch=returning)
+                if returning:
+                    for index, (new_id,) in zip(indexes, result):
+                        new_ids[index] = new_id
+        
+        cls._invalidate_cache()
+        return new_ids if returning else len(records)
+
+    @classmethod
+    def _validate_update_fields(cls, instances: list, fields: list):
+        """Validate the given fields of every instance for bulk_update()"""
+        if not fields:
+            raise ValueError("At least one field to update must be provided")
+        if 'id' in fields:
+            raise ValueError("Cannot update 'id' field")
+        
+        valid_fields = cls._get_valid_fields()
+        for name in fields:
+            if name not in valid_fields:
+                raise ValueError(f"Invalid field name: {name}")
+        
+        validators = dict(cls._meta.validators)
+        rows = []
+        for instance in instances:
+            if getattr(instance, 'id', None) is None:
+                raise ValueError("bulk_update() requires instances with an id")
+            row = [instance.id]
+            for name in fields:
+                try:
+                    row.append(validators[name](getattr(instance, name, None)))
+                except ValueError as e:
+                    raise ValueError(f"Validation error for field '{name}': {e}")
+            rows.append(tuple(row))
+        return rows
+
+    @classmethod
+    def bulk_update(cls, instances: list, fields: list, batch_size: Optional[int] = None) -> int:
+        """Update the given fields of many instances with UPDATE ... FROM (VALUES ...)
+
+        Returns:
+            Number of updated rows
+        """
+        if not instances:
+            return 0
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        rows = cls._validate_update_fields(instances, fields)
+        
+        # Cast every value so the VALUES list gets the column types
+        template = "(" + ", ".join(
+            ["%s::INTEGER"] + [f"%s::{cls._get_column_type(cls._meta.fields[name])}" for name in fields]
+        ) + ")"
+        set_clause = ", ".join(f"{name} = v.{name}" for name in fields)
+        query = (
+            f"UPDATE {cls.table_name} AS t SET {set_clause} "
+            f"FROM (VALUES %s) AS v(id, {', '.join(fields)}) WHERE t.id = v.id"
+        )
+        
+        size = batch_size or len(rows)
+        updated_rows = 0
+        cls._forget()
+        with cls._connection(transaction=True) as conn, conn.cursor() as cursor:
+            for start in range(0, len(rows), size):
+                batch = rows[start:start + size]
+                execute_values(cursor, query, batch, template=template, page_size=len(batch))
+                updated_rows += cursor.rowcount
+        cls._invalidate_cache()
+        return updated_rows
+
+    @classmethod
+    def _default_update_fields(cls, columns, provided, conflict_fields) -> list:
+        """Fields an upsert overwrites by default: the given ones plus auto_now fields"""
+        return [
+            name for name in columns
+            if name not in conflict_fields
+            and (name in provided or getattr(cls._meta.fields.get(name), 'auto_now', False))
+        ]
+
+    @classmethod
+    def _build_conflict_clause(cls, columns, conflict_fields, update_fields) -> str:
+        """Build the ON CONFLICT ... DO UPDATE clause of an upsert"""
+        if not conflict_fields:
+            raise ValueError("At least one conflict field must be provided")
+        
+        valid_fields = cls._get_valid_fields()
+        for name in list(conflict_fields) + list(update_fields):
+            if name not in valid_fields:
+                raise ValueError(f"Invalid field name: {name}")
+            if name not in columns:
+                raise ValueError(f"No value given for field '{name}'")
+        
+        # Without fields to update, a no-op update still returns the existing id
+        update_fields = list(update_fields) or list(conflict_fields[:1])
+        set_clause = ", ".join(f"{name} = excluded.{name}" for name in update_fields)
+        return f"ON CONFLICT ({', '.join(conflict_fields)}) DO UPDATE SET {set_clause}"
+
+    @classmethod
+    def _group_upsert_records(cls, records: list, conflict_fields: list, update_fields: Optional[list]):
+        """Validate records, keep the last one per conflict key and group them by columns"""
+        validated_records = [cls._validate_and_convert_values(**record) for record in records]
+        latest = {}
+        for index, validated_data in enumerate(validated_records):
+            latest[tuple(validated_data.get(name) for name in conflict_fields)] = index
+        
+        groups = {}
+        duplicates = {}
+        for index, validated_data in enumerate(validated_records):
+            winner = latest[tuple(validated_data.get(name) for name in conflict_fields)]
+            if winner != index:
+                duplicates[index] = winner
+                continue
+            columns = tuple(sorted(validated_data))
+            fields = update_fields
+            if fields is None:
+                fields = cls._default_update_fields(columns, records[index], conflict_fields)
+            conflict_sql = cls._build_conflict_clause(columns, conflict_fields, fields)
+            indexes, rows = groups.setdefault((columns, conflict_sql), ([], []))
+            indexes.append(index)
+            rows.append(tuple(validated_data[column] for column in columns))
+        return groups, duplicates
+
+    @classmethod
+    def upsert(cls, conflict_fields: list, update_fields: Optional[list] = None, **values) -> int:
+        """Insert a record, or update it if it exists, with INSERT ... ON CONFLICT DO UPDATE
+
+        Args:
+            conflict_fields: Fields of the unique constraint that identifies the record
+            update_fields: Fields to overwrite when the record exists
+                (the given fields except the conflict fields by default)
+            **values: Field values
+
+        Returns:
+            id of the inserted or updated record
+        """
+        validated_data = cls._validate_and_convert_values(**values)
+        columns = list(validated_data)
+        if update_fields is None:
+            update_fields = cls._default_update_fields(columns, values, conflict_fields)
+        conflict_sql = cls._build_conflict_clause(columns, conflict_fields, update_fields)
+        
+        placeholders = ", ".join("%s" for _ in columns)
+        query = (
+            f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"{conflict_sql} RETURNING id"
+        )
+        cls._forget()
+        with cls._connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, list(validated_data.values()))
+            new_id = cursor.fetchone()[0]
+        
+        cls._invalidate_cache()
+        return new_id
+
+    @classmethod
+    def bulk_upsert(cls, records: list, conflict_fields: list, update_fields: Optional[list] = None,
+                    batch_size: Optional[int] = None, returning: bool = False):
+        """Insert or update many records with multi-row INSERT ... ON CONFLICT DO UPDATE
+
+        Records sharing a conflict key are collapsed, the last one wins
+        (PostgreSQL rejects a statement that updates the same row twice).
+
+        Args:
+            records: List of dicts with field values
+            conflict_fields: Fields of the unique constraint that identifies a record
+            update_fields: Fields to overwrite when a record exists
+                (the given fields except the conflict fields by default)
+            batch_size: Maximum number of rows per statement (all rows by default)
+            returning: Return the ids (in input order) instead of the count
+
+        Returns:
+            Number of inserted or updated rows, or the list of ids
+        """
+        if not records:
+            raise ValueError("The records list is empty")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        groups, duplicates = cls._group_upsert_records(records, conflict_fields, update_fields)
+        cls._forget()
+        new_ids = [None] * len(records)
+        written_rows = 0
+        
+        with cls._connection(transaction=True) as conn, conn.cursor() as cursor:
+            for (columns, conflict_sql), (indexes, rows) in groups.items():
+                query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES %s {conflict_sql}"
+                if returning:
+                    query += " RETURNING id"
                 
-                cursor.executemany(query, all_values)
-            
-            conn.commit()
-            return len(all_values)
-        finally:
-            conn.close()
+                size = batch_size or len(rows)
+                for start in range(0, len(rows), size):
+                    batch = rows[start:start + size]
+                    result = execute_values(cursor, query, batch, page_size=len(batch), fetch=returning)
+                    written_rows += cursor.rowcount
+                    if returning:
+                        for index, (new_id,) in zip(indexes[start:start + size], result):
+                            new_ids[index] = new_id
+        
+        cls._invalidate_cache()
+        if not returning:
+            return written_rows
+        for index, winner in duplicates.items():
+            new_ids[index] = new_ids[winner]
+        return new_ids
 
     def save(self):
         """Save instance (insert or update)"""
+        # Only model fields, not annotations or other loaded extras
+        data = {name: value for name, value in self.__dict__.items() if name in self._meta.fields}
         if hasattr(self, 'id') and self.id:
-            data = self.__dict__.copy()
-            data.pop('id', None)
             try:
                 self.__class__.update(self.id, **data)
             except ValueError as e:
                 raise ValueError(f"Cannot save: {e}")
         else:
-            data = self.__dict__.copy()
-            data.pop('id', None)
             new_id = self.__class__.create(**data)
             self.id = new_id
+        
+        session = current_session()
+        if session is not None:
+            session.replace(self)
 
     @classmethod
     def update(cls, id: int, **kwargs) -> bool:
@@ -723,58 +2560,607 @@ class BaseModel(metaclass=ModelMeta):
             raise ValueError("Cannot update 'id' field")
         
         # Validate fields
-        validated_data = cls._validate_and_convert_values(**kwargs)
+        validated_data = cls._validate_values(kwargs, update=True)
         
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                set_clause = ', '.join([f"{k} = %s" for k in validated_data.keys()])
-                values = list(validated_data.values())
-                
-                cursor.execute(
-                    f"UPDATE {cls.table_name} SET {set_clause} WHERE id = %s",
-                    (*values, id)
-                )
-                updated_rows = cursor.rowcount
-            
-            conn.commit()
-            
-            if updated_rows == 0:
-                raise ValueError(f"No record found with id={id}")
-            
-            return True
-        finally:
-            conn.close()
+        query = cls._update_query(tuple(validated_data))
+        
+        with cls._connection() as conn, conn.cursor() as cursor:
+            cls._execute(cursor, query, (*validated_data.values(), id))
+            updated_rows = cursor.rowcount
+
+        if updated_rows == 0:
+            raise ValueError(f"No record found with id={id}")
+        
+        cls._forget(id)
+        cls._invalidate_cache()
+        return True
         
     @classmethod
     def delete(cls, **filters) -> int:
-        """Delete records"""
+        """Delete records matching the filters (same lookups as filter())"""
         if not filters:
             raise ValueError("At least one filter must be specified")
         
-        valid_fields = cls._get_valid_fields()
-        
-        for key in filters.keys():
-            if key != 'id' and key not in valid_fields:
-                raise ValueError(f"Invalid field name: {key}")
-        
-        conn = cls.connect()
-        try:
-            with conn.cursor() as cursor:
-                where_clause = " AND ".join(f"{key} = %s" for key in filters.keys())
-                values = tuple(filters.values())
-                query = f"DELETE FROM {cls.table_name} WHERE {where_clause}"
-                
-                cursor.execute(query, values)
-                deleted_rows = cursor.rowcount
-            
-            conn.commit()
-            return deleted_rows
-        finally:
-            conn.close()
+        return cls.filter(**filters).delete()
 
 
 class PostgreSQLModel(BaseModel):
     """PostgreSQL model class"""
     class Meta:
         db_config = {}
+
+
+class AsyncPostgreSQLModel(PostgreSQLModel):
+    """PostgreSQL model with a native asyncio API on psycopg 3
+
+    The ``a*`` methods and ``async for`` run on an AsyncConnectionPool of
+    the database (same ``pool_*`` settings as the threaded pool), so they
+    never block the event loop or need a worker thread. Fields come from
+    abarorm.fields.psql as for PostgreSQLModel, whose synchronous API stays
+    available; tables are created with it when the class is defined.
+    Requires ``pip install abarorm[async]``.
+    """
+    class Meta:
+        db_config = {}
+
+    class QuerySet(PostgreSQLModel.QuerySet):
+        """QuerySet with awaitable evaluation and ``async for`` streaming"""
+
+        async def alist(self) -> list:
+            """Evaluate the QuerySet and cache the results on it"""
+            if self._result_cache is None:
+                query, params = self._compile_select()
+                description, rows = await self.model._afetch(query, params, self._cache_tables())
+                self._load_results(description, rows)
+                if self._prefetch and self._result_type is None:
+                    await self._aprefetch_related_objects(self._result_cache)
+            return self._result_cache
+        
+        def _load_results(self, description, rows):
+            """Cache the instances (or values) built from fetched rows"""
+            load = self._row_loader(description)
+            self._result_cache = [load(row) for row in rows]
+        
+        async def _aprefetch_related_objects(self, instances: list):
+            """Fetch the prefetch_related() objects of the given instances"""
+            ids = list(dict.fromkeys(obj.id for obj in instances))
+            if not ids:
+                return
+            for name in self._prefetch:
+                source_model, field_name = self.model._reverse_relations[name]
+                if not issubclass(source_model, AsyncPostgreSQLModel):
+                    raise ValueError(
+                        f"prefetch_related('{name}') in async code requires {source_model.__name__} "
+                        f"to be an AsyncPostgreSQLModel"
+                    )
+                groups = {id: [] for id in ids}
+                related = source_model.filter(**{f"{field_name}__in": ids}).order_by('id')
+                query, params = related._compile_select()
+                description, rows = await source_model._afetch(query, params, related._cache_tables())
+                load = related._row_loader(description)
+                for row in rows:
+                    obj = load(row)
+                    groups[obj.__dict__[field_name]].append(obj)
+                for obj in instances:
+                    _prefetch_cache.setdefault(obj, {})[name] = groups[obj.id]
+        
+        async def _afetch_value(self, query: str, params: list):
+            """Run a query and return the first column of its first row"""
+            async with self.model._aconnection() as conn:
+                cursor = await conn.execute(query, params, prepare=None if _can_prepare(query) else False)
+                row = await cursor.fetchone()
+            return row[0] if row else None
+        
+        async def acount(self) -> int:
+            """Count results with SELECT COUNT(*) unless they are already loaded"""
+            if self._result_cache is not None:
+                return len(self._result_cache)
+            return await self._afetch_value(*self._count_query())
+        
+        async def aexists(self) -> bool:
+            """Check if results exist with SELECT 1 ... LIMIT 1"""
+            if self._result_cache is not None:
+                return bool(self._result_cache)
+            if self._is_grouped():
+                return bool(await self[:1].alist())
+            
+            query, params = self._unsliced()._clone(_ordering=[], _limit=1, _offset=None)._compile_select('1')
+            return await self._afetch_value(query, params) is not None
+        
+        async def afirst(self):
+            """Get first result (ordered by id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[0] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = qs._ordering or ["id ASC"]
+            results = await qs._clone(_ordering=ordering, _limit=1, _offset=None).alist()
+            return results[0] if results else None
+        
+        async def alast(self):
+            """Get last result by reversing the ordering (id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[-1] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = [
+                f"{item[:-4]} DESC" if item.endswith(" ASC") else f"{item[:-5]} ASC"
+                for item in qs._ordering
+            ]
+            ordering.append("id DESC")
+            results = await qs._clone(_ordering=ordering, _limit=1, _offset=None).alist()
+            return results[0] if results else None
+        
+        async def _aexecute_write(self, query: str, params: list, cascade: bool = False) -> int:
+            """Run an UPDATE/DELETE restricted to this QuerySet and return the affected row count"""
+            query, params = self._compile_write(query, params)
+            async with self.model._aconnection() as conn:
+                cursor = await conn.execute(query, params)
+                rowcount = cursor.rowcount
+            self._after_write(cascade)
+            return rowcount
+        
+        async def aupdate(self, **kwargs) -> int:
+            """Update all matching records with a single UPDATE statement"""
+            return await self._aexecute_write(*self._compile_update(**kwargs))
+        
+        async def adelete(self) -> int:
+            """Delete all matching records with a single DELETE statement"""
+            rowcount = await self._aexecute_write(f"DELETE FROM {self.model.table_name}", [], cascade=True)
+            # ON DELETE CASCADE / SET NULL may have changed rows of other models
+            clear_session()
+            return rowcount
+        
+        def __aiter__(self):
+            return self.aiterator()
+        
+        async def aiterator(self, chunk_size: int = 2000):
+            """Stream instances through a server-side cursor without caching them
+
+            Rows are fetched ``chunk_size`` at a time. The pooled connection
+            stays checked out until the iteration ends or is closed.
+            """
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be >= 1")
+            if self._result_cache is not None:
+                for item in self._result_cache:
+                    yield item
+                return
+            
+            query, params = self._compile_select()
+            async with self.model._aconnection() as conn, AsyncExitStack() as stack:
+                # Named cursors only live inside a transaction. An open aatomic() block
+                # already is one; a savepoint per cursor would break when streams are
+                # interleaved and release their savepoints out of order.
+                if self.model._get_async_transaction() is None:
+                    await stack.enter_async_context(conn.transaction())
+                cursor = await stack.enter_async_context(conn.cursor(name=f"abarorm_cursor_{next(_cursor_ids)}"))
+                await cursor.execute(query, params)
+                load = None
+                while True:
+                    rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if load is None:
+                        load = self._row_loader(cursor.description)
+                    batch = [load(row) for row in rows]
+                    if self._prefetch and self._result_type is None:
+                        await self._aprefetch_related_objects(batch)
+                    for item in batch:
+                        yield item
+
+    @classmethod
+    async def _open_async_pool(cls) -> 'AsyncConnectionPool':
+        """Open an AsyncConnectionPool with the pool_* settings of db_config"""
+        db_config = cls.Meta.db_config
+        prepared_max = db_config.get('prepared_max', 100)
+        
+        async def configure(conn):
+            conn.prepared_max = prepared_max
+        
+        pool = AsyncConnectionPool(
+            kwargs={
+                'host': db_config['host'],
+                'user': db_config['user'],
+                'password': db_config['password'],
+                'dbname': db_config['database'],
+                'port': db_config['port'],
+                'autocommit': True,
+                # psycopg prepares a query itself once it ran this many times on a connection
+                'prepare_threshold': db_config.get('prepare_threshold'),
+            },
+            min_size=db_config.get('pool_min_size', 1),
+            max_size=db_config.get('pool_max_size', 10),
+            timeout=db_config.get('pool_timeout', 30.0),
+            max_idle=db_config.get('pool_idle_timeout', 300.0),
+            configure=configure,
+            open=False,
+        )
+        try:
+            await pool.open(wait=True, timeout=db_config.get('pool_timeout', 30.0))
+        except Exception as e:
+            await pool.close()
+            raise ConnectionError(f"Error connecting to PostgreSQL database: {e}")
+        return pool
+
+    @classmethod
+    async def _get_async_pool(cls) -> 'AsyncConnectionPool':
+        """Get the AsyncConnectionPool shared by all async models using the same database"""
+        if AsyncConnectionPool is None:
+            raise ImportError("AsyncPostgreSQLModel requires psycopg 3. Install it with: pip install abarorm[async]")
+        
+        key = cls._database_key()
+        loop = asyncio.get_running_loop()
+        entry = _async_pools.get(key)
+        if entry is None or entry[0] is not loop:
+            # Tasks asking at the same time await one opening instead of each opening a pool
+            entry = _async_pools[key] = (loop, loop.create_task(cls._open_async_pool()))
+        
+        opening = entry[1]
+        try:
+            return opening.result() if opening.done() else await asyncio.shield(opening)
+        except Exception:
+            if _async_pools.get(key) is entry:
+                del _async_pools[key]
+            raise
+
+    @classmethod
+    def _get_async_transaction(cls):
+        """Get the (connection, written tables) of the aatomic() block open in this task, if any"""
+        transactions = _async_transactions.get()
+        if not transactions:
+            return None
+        return transactions.get(cls._database_key())
+
+    @classmethod
+    @asynccontextmanager
+    async def _aconnection(cls):
+        """Borrow a pooled connection (autocommit), or use the one of the open aatomic() block"""
+        state = cls._get_async_transaction()
+        if state is not None:
+            yield state[0]
+            return
+        
+        pool = await cls._get_async_pool()
+        async with pool.connection() as conn:
+            yield conn
+
+    @classmethod
+    @asynccontextmanager
+    async def aatomic(cls):
+        """Run the block in a single transaction on one pooled connection
+
+        Every ``a*`` call made by this task inside the block, for any async
+        model using the same database, reuses the connection. Nested blocks
+        create savepoints. The transaction is committed when the outermost
+        block exits and rolled back if it raises.
+        """
+        state = cls._get_async_transaction()
+        if state is not None:
+            try:
+                async with state[0].transaction():
+                    yield state[0]
+            except BaseException:
+                clear_session()
+                raise
+            return
+        
+        pool = await cls._get_async_pool()
+        # Tables written in the block, as (table, cascade)
+        written = set()
+        try:
+            async with pool.connection() as conn:
+                transactions = _async_transactions.get() or {}
+                token = _async_transactions.set({**transactions, cls._database_key(): (conn, written)})
+                try:
+                    async with conn.transaction():
+                        yield conn
+                except BaseException:
+                    # Instances read or saved in the block may not match the rolled back rows
+                    clear_session()
+                    raise
+                finally:
+                    _async_transactions.reset(token)
+        finally:
+            # Results cached by other tasks before the commit may be stale
+            for table, cascade in written:
+                invalidate(table, cascade)
+
+    @classmethod
+    def _invalidate_cache(cls, cascade: bool = False) -> None:
+        """Invalidate cached results of this model's table, again when the open aatomic() ends"""
+        super()._invalidate_cache(cascade)
+        state = cls._get_async_transaction()
+        if state is not None:
+            state[1].add((cls.table_name, cascade))
+
+    @classmethod
+    async def _afetch(cls, query: str, params, tables: tuple = (), single: bool = False):
+        """Async _fetch(): (description, rows) of a SELECT, read through Meta.cache
+
+        Full scan warnings are only checked by the synchronous API.
+        """
+        cache = cls._meta.cache
+        key = None
+        if cache is not None and cls._get_async_transaction() is None:
+            key = cache.key(tables or (cls.table_name,), query, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        async with cls._aconnection() as conn:
+            cursor = await conn.execute(query, params, prepare=None if _can_prepare(query) else False)
+            if single:
+                row = await cursor.fetchone()
+                rows = [row] if row is not None else []
+            else:
+                rows = await cursor.fetchall()
+            result = (tuple((column.name,) for column in cursor.description), rows)
+        
+        if key is not None:
+            cache.set(key, result)
+        return result
+
+    @classmethod
+    async def agather(cls, *querysets) -> list:
+        """Evaluate several QuerySets in one round trip with pipeline mode
+
+        e.g. ``posts, tags = await Post.agather(Post.filter(...)[:20], Tag.all())``.
+        The QuerySets must belong to async models of this database; each
+        gets its results cached and they are returned in order. Meta.cache
+        is not consulted.
+        """
+        key = cls._database_key()
+        compiled = []
+        for qs in querysets:
+            if not isinstance(qs, AsyncPostgreSQLModel.QuerySet) or qs.model._database_key() != key:
+                raise ValueError("agather() expects QuerySets of AsyncPostgreSQLModel models using the same database")
+            compiled.append(qs._compile_select())
+        
+        async with cls._aconnection() as conn:
+            async with conn.pipeline():
+                cursors = [
+                    await conn.execute(query, params, prepare=None if _can_prepare(query) else False)
+                    for query, params in compiled
+                ]
+            for qs, cursor in zip(querysets, cursors):
+                description = tuple((column.name,) for column in cursor.description)
+                qs._load_results(description, await cursor.fetchall())
+        
+        for qs in querysets:
+            if qs._prefetch and qs._result_type is None:
+                await qs._aprefetch_related_objects(qs._result_cache)
+        return [qs._result_cache for qs in querysets]
+
+    @classmethod
+    async def aget(cls, **kwargs) -> Optional['AsyncPostgreSQLModel']:
+        """Get single record (from the open session() when it is loaded there)"""
+        if not kwargs:
+            raise ValueError("At least one filter must be provided")
+        
+        session = current_session()
+        if session is not None and kwargs.keys() == {'id'}:
+            instance = session.get(cls, kwargs['id'])
+            if instance is not None:
+                return instance
+        
+        query = cls._get_query(tuple(kwargs))
+        description, rows = await cls._afetch(query, tuple(kwargs.values()), single=True)
+        if rows:
+            instance = cls._row_loader(description)(rows[0])
+            return session.add(instance) if session is not None else instance
+        return None
+
+    @classmethod
+    async def afilter(cls, **kwargs) -> list:
+        """Filter and load the matching records; use filter() to build a QuerySet for ``async for``"""
+        return await cls.filter(**kwargs).alist()
+
+    @classmethod
+    async def aall(cls, order_by: Optional[str] = None) -> list:
+        """Load all records"""
+        return await cls.all(order_by=order_by).alist()
+
+    @classmethod
+    async def acreate(cls, **kwargs) -> int:
+        """Create new record with validation and return its id"""
+        validated_data = cls._validate_and_convert_values(**kwargs)
+        query = cls._insert_query(tuple(validated_data))
+        
+        async with cls._aconnection() as conn:
+            cursor = await conn.execute(query + " RETURNING id", tuple(validated_data.values()))
+            new_id = (await cursor.fetchone())[0]
+        
+        cls._invalidate_cache()
+        return new_id
+
+    @classmethod
+    async def abulk_create(cls, records: list, batch_size: Optional[int] = None,
+                           method: str = 'copy', returning: bool = False):
+        """Bulk create records in one transaction (same arguments as bulk_create())
+
+        'copy' streams rows through COPY ... FROM STDIN; 'values' and
+        ``returning=True`` send the INSERTs with executemany() in pipeline
+        mode, so a batch costs one round trip.
+        """
+        if not records:
+            raise ValueError("The records list is empty")
+        if method not in ('copy', 'values'):
+            raise ValueError("method must be 'copy' or 'values'")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        groups = {}
+        for index, record in enumerate(records):
+            validated_data = cls._validate_and_convert_values(**record)
+            indexes, rows = groups.setdefault(tuple(validated_data), ([], []))
+            indexes.append(index)
+            rows.append(tuple(validated_data.values()))
+        
+        new_ids = [None] * len(records)
+        async with cls.aatomic() as conn, conn.cursor() as cursor:
+            for columns, (indexes, rows) in groups.items():
+                size = batch_size or len(rows)
+                
+                if method == 'copy' and not returning:
+                    for start in range(0, len(rows), size):
+                        async with cursor.copy(f"COPY {cls.table_name} ({', '.join(columns)}) FROM STDIN") as copy:
+                            for row in rows[start:start + size]:
+                                await copy.write_row(row)
+                    continue
+                
+                query = cls._insert_query(columns)
+                if returning:
+                    query += " RETURNING id"
+                for start in range(0, len(rows), size):
+                    await cursor.executemany(query, rows[start:start + size], returning=returning)
+                    if returning:
+                        # One result set per inserted row
+                        for index in indexes[start:start + size]:
+                            new_ids[index] = (await cursor.fetchone())[0]
+                            cursor.nextset()
+        
+        cls._invalidate_cache()
+        return new_ids if returning else len(records)
+
+    @classmethod
+    async def _aexecute_values(cls, cursor, query: str, rows: list, template: str,
+                               batch_size: Optional[int] = None, fetch: bool = False):
+        """execute_values() for psycopg 3: fill the ``VALUES %s`` of the query with rows, in batches
+
+        Batches stay below PostgreSQL's limit of bind parameters per
+        statement. Returns the affected row count and the fetched rows.
+        """
+        size = min(batch_size or len(rows), max(1, _MAX_BIND_PARAMS // len(rows[0])))
+        rowcount = 0
+        result = []
+        for start in range(0, len(rows), size):
+            batch = rows[start:start + size]
+            values_sql = "VALUES " + ", ".join([template] * len(batch))
+            await cursor.execute(query.replace("VALUES %s", values_sql, 1), [value for row in batch for value in row])
+            rowcount += cursor.rowcount
+            if fetch:
+                result.extend(await cursor.fetchall())
+        return rowcount, result
+
+    @classmethod
+    async def abulk_update(cls, instances: list, fields: list, batch_size: Optional[int] = None) -> int:
+        """Update the given fields of many instances with UPDATE ... FROM (VALUES ...)"""
+        if not instances:
+            return 0
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        rows = cls._validate_update_fields(instances, fields)
+        template = "(" + ", ".join(
+            ["%s::INTEGER"] + [f"%s::{cls._get_column_type(cls._meta.fields[name])}" for name in fields]
+        ) + ")"
+        set_clause = ", ".join(f"{name} = v.{name}" for name in fields)
+        query = (
+            f"UPDATE {cls.table_name} AS t SET {set_clause} "
+            f"FROM (VALUES %s) AS v(id, {', '.join(fields)}) WHERE t.id = v.id"
+        )
+        
+        cls._forget()
+        async with cls.aatomic() as conn, conn.cursor() as cursor:
+            updated_rows, _ = await cls._aexecute_values(cursor, query, rows, template, batch_size)
+        cls._invalidate_cache()
+        return updated_rows
+
+    @classmethod
+    async def aupsert(cls, conflict_fields: list, update_fields: Optional[list] = None, **values) -> int:
+        """Insert a record, or update it if it exists, and return its id (see upsert())"""
+        validated_data = cls._validate_and_convert_values(**values)
+        columns = list(validated_data)
+        if update_fields is None:
+            update_fields = cls._default_update_fields(columns, values, conflict_fields)
+        conflict_sql = cls._build_conflict_clause(columns, conflict_fields, update_fields)
+        
+        query = (
+            f"INSERT INTO {cls.table_name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('%s' for _ in columns)}) {conflict_sql} RETURNING id"
+        )
+        cls._forget()
+        async with cls._aconnection() as conn:
+            cursor = await conn.execute(query, list(validated_data.values()))
+            new_id = (await cursor.fetchone())[0]
+        
+        cls._invalidate_cache()
+        return new_id
+
+    @classmethod
+    async def abulk_upsert(cls, records: list, conflict_fields: list, update_fields: Optional[list] = None,
+                           batch_size: Optional[int] = None, returning: bool = False):
+        """Insert or update many records with INSERT ... ON CONFLICT DO UPDATE (see bulk_upsert())"""
+        if not records:
+            raise ValueError("The records list is empty")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        groups, duplicates = cls._group_upsert_records(records, conflict_fields, update_fields)
+        cls._forget()
+        new_ids = [None] * len(records)
+        written_rows = 0
+        
+        async with cls.aatomic() as conn, conn.cursor() as cursor:
+            for (columns, conflict_sql), (indexes, rows) in groups.items():
+                query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES %s {conflict_sql}"
+                if returning:
+                    query += " RETURNING id"
+                template = "(" + ", ".join("%s" for _ in columns) + ")"
+                rowcount, result = await cls._aexecute_values(cursor, query, rows, template, batch_size, returning)
+                written_rows += rowcount
+                for index, (new_id,) in zip(indexes, result):
+                    new_ids[index] = new_id
+        
+        cls._invalidate_cache()
+        if not returning:
+            return written_rows
+        for index, winner in duplicates.items():
+            new_ids[index] = new_ids[winner]
+        return new_ids
+
+    @classmethod
+    async def aupdate(cls, id: int, **kwargs) -> bool:
+        """Update record with validation"""
+        if not kwargs:
+            raise ValueError("At least one field to update must be provided")
+        if 'id' in kwargs:
+            raise ValueError("Cannot update 'id' field")
+        
+        validated_data = cls._validate_values(kwargs, update=True)
+        query = cls._update_query(tuple(validated_data))
+        
+        async with cls._aconnection() as conn:
+            cursor = await conn.execute(query, (*validated_data.values(), id))
+            updated_rows = cursor.rowcount
+        
+        if updated_rows == 0:
+            raise ValueError(f"No record found with id={id}")
+        
+        cls._forget(id)
+        cls._invalidate_cache()
+        return True
+
+    @classmethod
+    async def adelete(cls, **filters) -> int:
+        """Delete records matching the filters (same lookups as filter())"""
+        if not filters:
+            raise ValueError("At least one filter must be specified")
+        return await cls.filter(**filters).adelete()
+
+    async def asave(self):
+        """Save instance (insert or update)"""
+        # Only model fields, not annotations or other loaded extras
+        data = {name: value for name, value in self.__dict__.items() if name in self._meta.fields}
+        if getattr(self, 'id', None):
+            try:
+                await self.__class__.aupdate(self.id, **data)
+            except ValueError as e:
+                raise ValueError(f"Cannot save: {e}")
+        else:
+            self.id = await self.__class__.acreate(**data)
+        
+        session = current_session()
+        if session is not None:
+            session.replace(self)
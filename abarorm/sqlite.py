@@ -1,25 +1,249 @@
 import sqlite3
 from typing import List, Optional, Dict, Type
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import itertools
+import threading
+import weakref
+import warnings
 import datetime
+import copy
+import json
+import base64
 from datetime import date
+from decimal import Decimal
+from types import MappingProxyType
 from .fields.sqlite import (
     Field, DateTimeField, DecimalField, TimeField, DateField, 
     CharField, ForeignKey, EmailField, URLField, BooleanField,
-    IntegerField, FloatField, TextField
+    IntegerField, FloatField, TextField, Index
 )
+from .aggregates import Aggregate, Count, LOOKUP_OPERATORS
+from .identity_map import current_session, clear_session
+from .cache import QueryCache, add_dependency, invalidate
+
+
+# Allowed values for the PRAGMA options accepted in Meta.db_config
+PRAGMA_CHOICES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA', '0', '1', '2', '3'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY', '0', '1', '2'},
+}
+PRAGMA_INTEGERS = ('cache_size', 'mmap_size', 'busy_timeout')
+
+# Long-lived connections, one per thread and database file
+_local = threading.local()
+
+
+def close_connections():
+    """Close the SQLite connections opened by the current thread"""
+    connections = getattr(_local, 'connections', None)
+    if not connections:
+        return
+    for conn in connections.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
+
+
+# Worker threads of AsyncSQLiteModel, one pool per database file
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(db_config: dict) -> ThreadPoolExecutor:
+    """Thread pool running the async calls of a database (db_config['async_workers'] threads)"""
+    db_name = db_config['db_name']
+    executor = _executors.get(db_name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(db_name)
+            if executor is None:
+                workers = db_config.get('async_workers', 4)
+                if workers < 1:
+                    raise ValueError("async_workers must be >= 1")
+                executor = _executors[db_name] = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='abarorm-sqlite'
+                )
+    return executor
+
+
+def close_executors(wait: bool = True):
+    """Shut down the worker threads of AsyncSQLiteModel, closing their connections"""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def _encode_cursor(field_name: str, descending: bool, value, last_id) -> str:
+    """Encode a keyset pagination position as an opaque token"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([field_name, descending, value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(token: str, field_name: str, descending: bool) -> dict:
+    """Decode a token created by _encode_cursor() for the given ordering"""
+    try:
+        cursor_field, cursor_descending, value, last_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if cursor_field != field_name or cursor_descending != descending:
+        raise ValueError("Pagination cursor does not match the requested ordering")
+    return {field_name: value, 'id': last_id}
+
+
+class ModelOptions:
+    """Immutable per-model metadata compiled once when the model class is created
+
+    Holds the model's fields in definition order together with their
+    validators, the auto_now date fields, the foreign keys and pre-rendered
+    SQL fragments, so the read and write paths never have to inspect the
+    class again.
+    """
+    
+    __slots__ = (
+        'table_name', 'fields', 'field_names', 'column_names', 'valid_fields',
+        'validators', 'converters', 'auto_now_fields', 'foreign_keys', 'indexes', 'cache',
+        'columns_sql', 'select_sql', 'insert_sql', 'update_sql', 'statements',
+    )
+    
+    def __init__(self, model):
+        fields = {
+            name: value for name, value in model.__dict__.items()
+            if isinstance(value, Field)
+        }
+        field_names = tuple(fields)
+        column_names = ('id',) + field_names
+        columns_sql = ', '.join(column_names)
+        placeholders = ', '.join('?' for _ in field_names)
+        
+        # Field level indexes (db_index, on by default for ForeignKeys) and Meta.indexes
+        indexes = {}
+        for name, field in fields.items():
+            if field.db_index and not field.unique:
+                index = Index([name])
+                indexes[index.get_name(model.table_name)] = index
+        meta_index_names = set()
+        for index in getattr(getattr(model, 'Meta', None), 'indexes', None) or []:
+            for name in index.field_names:
+                if name not in column_names:
+                    raise ValueError(f"Index on {model.__name__} refers to unknown field '{name}'")
+            index_name = index.get_name(model.table_name)
+            if index_name in meta_index_names:
+                raise ValueError(f"Duplicate index name '{index_name}' on {model.__name__}")
+            meta_index_names.add(index_name)
+            indexes[index_name] = index
+        assignments = ', '.join(f"{name} = ?" for name in field_names)
+        
+        # Meta.cache: a QueryCache, or True for one with the default settings
+        cache = getattr(getattr(model, 'Meta', None), 'cache', None)
+        if cache is True:
+            cache = QueryCache()
+        elif not cache:
+            cache = None
+        elif not isinstance(cache, QueryCache):
+            raise ValueError(f"Meta.cache of {model.__name__} must be a QueryCache or True")
+        
+        values = {
+            'table_name': model.table_name,
+            'fields': MappingProxyType(fields),
+            'field_names': field_names,
+            'column_names': column_names,
+            'valid_fields': frozenset(column_names),
+            'validators': tuple((name, field.validate) for name, field in fields.items()),
+            'converters': MappingProxyType({
+                name: field.to_python for name, field in fields.items()
+                if hasattr(field, 'to_python')
+            }),
+            # (name, True for DateField / False for DateTimeField, True when also stamped on UPDATE)
+            'auto_now_fields': tuple(
+                (name, isinstance(field, DateField), field.auto_now) for name, field in fields.items()
+                if isinstance(field, (DateField, DateTimeField))
+                and (field.auto_now or field.auto_now_add)
+            ),
+            'foreign_keys': MappingProxyType({
+                name: field for name, field in fields.items() if isinstance(field, ForeignKey)
+            }),
+            'indexes': tuple(indexes.values()),
+            'cache': cache,
+            'columns_sql': columns_sql,
+            'select_sql': f"SELECT {columns_sql} FROM {model.table_name}",
+            'insert_sql': f"INSERT INTO {model.table_name} ({', '.join(field_names)}) VALUES ({placeholders})",
+            'update_sql': f"UPDATE {model.table_name} SET {assignments} WHERE id = ?",
+            # SQL of other statement shapes, filled in as they are first used
+            'statements': {},
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Model metadata is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Model metadata is read-only")
+    
+    def __repr__(self):
+        return f"<ModelOptions table={self.table_name} fields={list(self.field_names)}>"
+
+
+class _Deferred:
+    """Placeholder shown by repr() for fields left out by only() / defer()"""
+
+    def __repr__(self):
+        return '<deferred>'
+
+
+_DEFERRED = _Deferred()
+
+# Related objects loaded by prefetch_related(), per instance and related_name
+_prefetch_cache = weakref.WeakKeyDictionary()
+
+# Queries already reported by the full-scan debug check
+_scan_warnings = set()
+
+# Filter lookups: (suffix, SQL template for the column, how the value is passed)
+_LOOKUPS = (
+    ('__gte', '{} >= ?', 'value'),
+    ('__lte', '{} <= ?', 'value'),
+    ('__gt', '{} > ?', 'value'),
+    ('__lt', '{} < ?', 'value'),
+    ('__ne', '{} != ?', 'value'),
+    ('__exact', '{} = ?', 'value'),
+    ('__icontains', 'LOWER({}) LIKE LOWER(?)', 'like'),
+    ('__contains', '{} LIKE ?', 'like'),
+    ('__in', '{} IN', 'in'),
+)
+
+# Upper bound of compiled statement shapes kept per model
+_MAX_STATEMENTS = 1024
 
 
 class RelatedManager:
     """Manager for handling related objects from ForeignKey"""
     
-    def __init__(self, model, field_name, instance_id):
+    def __init__(self, model, field_name, instance_id, prefetched: Optional[list] = None):
         self.model = model
         self.field_name = field_name
         self.instance_id = instance_id
+        self.prefetched = prefetched
 
     def all(self):
-        """Get all related objects"""
-        return self.model.filter(**{self.field_name: self.instance_id})
+        """Get all related objects (from the prefetch_related() cache when loaded)"""
+        qs = self.model.filter(**{self.field_name: self.instance_id})
+        if self.prefetched is not None:
+            qs._result_cache = list(self.prefetched)
+        return qs
 
     def filter(self, **kwargs):
         """Filter related objects"""
@@ -27,13 +251,15 @@ class RelatedManager:
 
     def first(self):
         """Get first related object"""
-        qs = self.all()
-        return qs.first() if qs.exists() else None
+        return self.all().first()
 
     def last(self):
         """Get last related object"""
-        qs = self.all()
-        return qs.last() if qs.exists() else None
+        return self.all().last()
+
+    def exists(self) -> bool:
+        """Check if related objects exist"""
+        return self.all().exists()
 
     def count(self):
         """Count related objects"""
@@ -70,26 +296,866 @@ class BaseModel:
                 continue
             
             if isinstance(field, ForeignKey) and field.related_name:
-                def create_related_manager(source_model, source_field):
+                def create_related_manager(source_model, source_field, related_name):
                     """Factory function to create related manager property"""
                     @property
                     def get_manager(self):
                         if not hasattr(self, 'id') or self.id is None:
                             raise ValueError(f"Cannot access related '{source_field}' before saving the object")
-                        return RelatedManager(source_model, source_field, self.id)
+                        prefetched = _prefetch_cache.get(self, {}).get(related_name)
+                        return RelatedManager(source_model, source_field, self.id, prefetched)
                     return get_manager
                 
                 # Set property on the related model
-                related_prop = create_related_manager(cls, attr_name)
+                related_prop = create_related_manager(cls, attr_name, field.related_name)
                 setattr(field.to, field.related_name, related_prop)
+                field.to._register_reverse_relation(field.related_name, cls, attr_name)
                 print(f"✓ Set related_name '{field.related_name}' on {field.to.__name__} for {cls.__name__}.{attr_name}")
         
+        cls._meta = ModelOptions(cls)
+        for field in cls._meta.foreign_keys.values():
+            add_dependency(field.to.table_name, cls.table_name)
+        
         # Auto-create table if db_config exists
         if hasattr(cls, 'Meta') and hasattr(cls.Meta, 'db_config') and cls.Meta.db_config:
             cls.create_table()
     
     class QuerySet:
-        """QuerySet for handling query results"""
+        """Lazy QuerySet that compiles chained calls into a single SQL query
+
+        Filters, ordering and slicing only build the query. It is executed the
+        first time the QuerySet is iterated, indexed or evaluated, and the
+        loaded instances are cached on the QuerySet.
+        """
+        
+        def __init__(self, model, page: int = 1, page_size: Optional[int] = None):
+            self.model = model
+            self.page = page
+            self.page_size = page_size
+            self._conditions = []
+            self._params = []
+            self._ordering = []
+            self._limit = None
+            self._offset = None
+            self._keyset = None
+            self._fields = None
+            self._result_type = None
+            self._related = ()
+            self._prefetch = ()
+            self._annotations = ()
+            self._having = []
+            self._having_params = []
+            self._result_cache = None
+        
+        def _clone(self, **changes) -> 'QuerySet':
+            """Copy the QuerySet without its result cache"""
+            clone = copy.copy(self)
+            clone._result_cache = None
+            for key, value in changes.items():
+                setattr(clone, key, value)
+            return clone
+        
+        def _is_sliced(self) -> bool:
+            return self._limit is not None or self._offset is not None
+        
+        def _unsliced(self) -> 'QuerySet':
+            """Wrap a sliced QuerySet so further filtering applies to the slice only"""
+            if not self._is_sliced():
+                return self
+            query, params = self._compile_select('id')
+            return self._clone(
+                _conditions=[f"id IN ({query})"],
+                _params=params,
+                _limit=None,
+                _offset=None,
+            )
+        
+        def _is_grouped(self) -> bool:
+            """values() / values_list() of an annotated QuerySet return one row per group"""
+            return bool(self._annotations) and self._result_type is not None
+        
+        def _output_names(self) -> list:
+            """Column names of value rows, annotations included"""
+            names = list(self._fields or self.model._meta.column_names)
+            return names + [name for name, _ in self._annotations if name not in names]
+        
+        def _resolve_aggregate(self, aggregate):
+            """Split the field of an aggregate into (related model, ForeignKey name, column)"""
+            name, _, rest = aggregate.field.partition('__')
+            reverse_relations = getattr(self.model, '_reverse_relations', {})
+            if name in reverse_relations:
+                related_model, field_name = reverse_relations[name]
+                if not rest and not isinstance(aggregate, Count):
+                    raise ValueError(f"{aggregate!r} needs a field of the related model, e.g. '{name}__<field>'")
+                column = rest or 'id'
+                if column not in related_model._get_valid_fields():
+                    raise ValueError(f"Field '{column}' does not exist on {related_model.__name__}")
+                return related_model, field_name, column
+            
+            if aggregate.field == '*' and isinstance(aggregate, Count):
+                return None, None, '*'
+            if aggregate.field not in self.model._get_valid_fields():
+                raise ValueError(f"Field '{aggregate.field}' does not exist")
+            return None, None, aggregate.field
+        
+        def _related_subquery(self, expression: str, related) -> str:
+            """Correlated subquery evaluating an expression over the related rows of a row"""
+            related_model, field_name, _ = related
+            return (
+                f"(SELECT {expression} FROM {related_model.table_name} AS related_rows "
+                f"WHERE related_rows.{field_name} = {self.model.table_name}.id)"
+            )
+        
+        def _annotation_sql(self, name: str, aggregate) -> str:
+            """SQL of an annotation computed per row (related_name aggregates only)"""
+            related = self._resolve_aggregate(aggregate)
+            if related[0] is None:
+                raise ValueError(
+                    f"Annotation '{name}' aggregates a field of {self.model.__name__} "
+                    f"and needs values() to define the groups"
+                )
+            return self._related_subquery(aggregate.as_sql(f"related_rows.{related[2]}"), related)
+        
+        def _annotation_columns(self) -> list:
+            """Per-row annotation columns of an instance query"""
+            return [f"{self._annotation_sql(name, aggregate)} AS {name}" for name, aggregate in self._annotations]
+        
+        def _compile_grouped(self, names: list, aggregates, group_fields: list, slice_groups: bool):
+            """SELECT computing aggregates per group of group_fields (a single group when empty)
+
+            Aggregates over related rows are first computed per row in a
+            derived table and then combined, so aggregating several
+            relations never multiplies their rows.
+            """
+            table = self.model.table_name
+            expressions = {}
+            partial_columns = []
+            for name, aggregate in aggregates:
+                related = self._resolve_aggregate(aggregate)
+                if related[0] is None:
+                    expressions[name] = aggregate.as_sql(related[2])
+                    continue
+                if aggregate.distinct:
+                    raise ValueError(f"{aggregate!r} over related rows cannot be combined across rows")
+                aliases = []
+                for number, partial in enumerate(aggregate.partials(f"related_rows.{related[2]}")):
+                    alias = f"{name}_partial{number}"
+                    partial_columns.append(f"{self._related_subquery(partial, related)} AS {alias}")
+                    aliases.append(alias)
+                expressions[name] = aggregate.combine(aliases)
+            
+            inner = self._clone(_annotations=(), _result_type=None, _fields=None, _related=(), _having=[], _having_params=[])
+            if slice_groups:
+                inner = inner._clone(_ordering=[], _limit=None, _offset=None)
+            if partial_columns or inner._is_sliced():
+                query, params = inner._compile_select(', '.join([f"{table}.*"] + partial_columns))
+                source = f"({query}) AS {table}"
+            else:
+                source = table
+                params = list(inner._params)
+                if inner._conditions:
+                    source += " WHERE " + " AND ".join(inner._conditions)
+            
+            columns = [f"{expressions[name]} AS {name}" if name in expressions else name for name in names]
+            query = f"SELECT {', '.join(columns)} FROM {source}"
+            if group_fields:
+                query += " GROUP BY " + ", ".join(group_fields)
+            if not slice_groups:
+                return query, params
+            
+            if self._having:
+                query += " HAVING " + " AND ".join(
+                    f"{expressions[name]} {operator} ?" for name, operator in self._having
+                )
+                params += self._having_params
+            return self._compile_tail(query, params)
+        
+        def _compile_select(self, columns: Optional[str] = None):
+            """Build the SELECT statement and its parameters"""
+            if columns is None and self._is_grouped():
+                names = self._output_names()
+                annotation_names = {name for name, _ in self._annotations}
+                group_fields = [name for name in names if name not in annotation_names]
+                return self._compile_grouped(names, self._annotations, group_fields, slice_groups=True)
+            
+            prefix = ''
+            if columns is None and self._related and self._result_type is None:
+                query, params = self._compile_join()
+                prefix = f"{self.model.table_name}."
+            else:
+                if columns is None:
+                    columns = ', '.join(list(self._fields or self.model._meta.column_names) + self._annotation_columns())
+                query = f"SELECT {columns} FROM {self.model.table_name}"
+                params = list(self._params)
+                if self._conditions:
+                    query += " WHERE " + " AND ".join(self._conditions)
+            
+            return self._compile_tail(query, params, prefix)
+        
+        def _compile_tail(self, query: str, params: list, prefix: str = ''):
+            """Append ORDER BY, LIMIT and OFFSET"""
+            annotation_names = {name for name, _ in self._annotations}
+            if self._ordering:
+                query += " ORDER BY " + ", ".join(
+                    entry if entry.split(' ')[0] in annotation_names else prefix + entry
+                    for entry in self._ordering
+                )
+            if self._is_sliced():
+                # SQLite requires a LIMIT before OFFSET, -1 means no limit
+                query += " LIMIT ?"
+                params.append(-1 if self._limit is None else self._limit)
+                if self._offset:
+                    query += " OFFSET ?"
+                    params.append(self._offset)
+            
+            return query, params
+        
+        def _compile_join(self):
+            """SELECT with one LEFT JOIN per select_related() path
+
+            The filtered table is wrapped in a derived table under its own
+            name, so the unqualified column names in the conditions stay
+            unambiguous. Related columns are aliased as ``path__column``.
+            """
+            table = self.model.table_name
+            columns = [f"{table}.{name}" for name in (self._fields or self.model._meta.column_names)]
+            columns += self._annotation_columns()
+            joins = []
+            aliases = {'': table}
+            for number, (path, related_model) in enumerate(self._related, 1):
+                parent_path, _, name = path.rpartition('__')
+                alias = f"rel{number}"
+                aliases[path] = alias
+                joins.append(
+                    f"LEFT JOIN {related_model.table_name} AS {alias} "
+                    f"ON {alias}.id = {aliases[parent_path]}.{name}"
+                )
+                columns.extend(
+                    f"{alias}.{column} AS {path}__{column}"
+                    for column in related_model._meta.column_names
+                )
+            
+            source = table
+            if self._conditions:
+                source = f"(SELECT * FROM {table} WHERE {' AND '.join(self._conditions)}) AS {table}"
+            query = f"SELECT {', '.join(columns)} FROM {source} {' '.join(joins)}"
+            return query, list(self._params)
+        
+        def _related_row_loader(self, description):
+            """Row loader that puts select_related() instances on their ForeignKey attributes"""
+            start = len(self._fields or self.model._meta.column_names) + len(self._annotations)
+            load_instance = self.model._row_loader(description[:start])
+            related = []
+            for path, related_model in self._related:
+                column_names = related_model._meta.column_names
+                end = start + len(column_names)
+                load_related = related_model._row_loader([(name,) for name in column_names])
+                related.append((path.split('__'), start, end, load_related))
+                start = end
+            session = current_session()
+            
+            def load(row):
+                instance = load_instance(row)
+                for parts, begin, end, load_related in related:
+                    # A NULL id means there is no related row
+                    if row[begin] is None:
+                        continue
+                    owner = instance
+                    for part in parts[:-1]:
+                        owner = owner.__dict__.get(part)
+                    if isinstance(owner, BaseModel):
+                        target = load_related(row[begin:end])
+                        owner.__dict__[parts[-1]] = session.add(target) if session is not None else target
+                return instance
+            
+            return load
+        
+        def _row_loader(self, description):
+            """Row loader for the result type: instances, dicts, tuples or single values"""
+            if self._result_type is None:
+                if self._related:
+                    return self._related_row_loader(description)
+                return self.model._row_loader(description)
+            
+            columns = tuple(column[0] for column in description)
+            converters = self.model._meta.converters
+            convert = tuple(converters.get(name) for name in columns)
+            if any(convert):
+                def to_tuple(row):
+                    return tuple(
+                        value if fn is None or value is None else fn(value)
+                        for fn, value in zip(convert, row)
+                    )
+            else:
+                to_tuple = tuple
+            
+            if self._result_type == 'dict':
+                return lambda row: dict(zip(columns, to_tuple(row)))
+            if self._result_type == 'flat':
+                return lambda row: to_tuple(row)[0]
+            return to_tuple
+        
+        def _cache_tables(self) -> tuple:
+            """Tables read by the query, whose writes invalidate its cached result"""
+            if self.model._meta.cache is None:
+                return ()
+            tables = [self.model.table_name]
+            tables.extend(model.table_name for _, model in self._related)
+            for _, aggregate in self._annotations:
+                related_model = self._resolve_aggregate(aggregate)[0]
+                if related_model is not None:
+                    tables.append(related_model.table_name)
+            return tuple(tables)
+        
+        def _fetch_all(self) -> list:
+            """Run the query once and cache the resulting instances"""
+            if self._result_cache is None:
+                query, params = self._compile_select()
+                description, rows = self.model._fetch(
+                    query, params, self._cache_tables(), check_scan=bool(self._conditions)
+                )
+                load = self._row_loader(description)
+                results = [load(row) for row in rows]
+                if self._prefetch and self._result_type is None:
+                    self._prefetch_related_objects(results)
+                self._result_cache = results
+            return self._result_cache
+        
+        def iterator(self, chunk_size: int = 2000):
+            """Stream instances with fetchmany() without caching them on the QuerySet"""
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be >= 1")
+            if self._result_cache is not None:
+                yield from self._result_cache
+                return
+            
+            query, params = self._compile_select()
+            with self.model._connection() as conn:
+                cursor = conn.execute(query, params)
+                try:
+                    load = self._row_loader(cursor.description)
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        batch = [load(row) for row in rows]
+                        if self._prefetch and self._result_type is None:
+                            self._prefetch_related_objects(batch)
+                        yield from batch
+                finally:
+                    cursor.close()
+        
+        def _fetch_value(self, query: str, params: list):
+            """Run a query and return the first column of its first row"""
+            with self.model._connection() as conn:
+                row = conn.execute(query, params).fetchone()
+            return row[0] if row else None
+        
+        @property
+        def results(self) -> list:
+            """Loaded model instances"""
+            return self._fetch_all()
+        
+        @property
+        def total_count(self) -> int:
+            """Number of matching records, ignoring pagination"""
+            if not self._is_sliced():
+                return self.count()
+            return self._clone(_limit=None, _offset=None).count()
+        
+        def __iter__(self):
+            return iter(self._fetch_all())
+        
+        def __len__(self):
+            return len(self._fetch_all())
+        
+        def __bool__(self):
+            return bool(self._fetch_all())
+        
+        def __getitem__(self, key):
+            """Index or slice the QuerySet; slices become LIMIT/OFFSET"""
+            if self._result_cache is not None:
+                return self._result_cache[key]
+            
+            if isinstance(key, slice):
+                if key.step is not None or (key.start or 0) < 0 or (key.stop is not None and key.stop < 0):
+                    return self._fetch_all()[key]
+                
+                qs = self._unsliced()
+                start = key.start or 0
+                limit = None if key.stop is None else max(key.stop - start, 0)
+                return qs._clone(_limit=limit, _offset=start or None)
+            
+            if not isinstance(key, int):
+                raise TypeError("QuerySet indices must be integers or slices")
+            if key < 0:
+                return self._fetch_all()[key]
+            
+            results = self[key:key + 1]._fetch_all()
+            if not results:
+                raise IndexError("QuerySet index out of range")
+            return results[0]
+        
+        def evaluate(self) -> 'ResultSet':
+            """Run the query and return an in-memory ResultSet of the instances"""
+            results = list(self._fetch_all())
+            total_count = self.total_count if self._is_sliced() else len(results)
+            return self.model.ResultSet(results, total_count, self.page, self.page_size)
+        
+        def filter(self, **kwargs) -> 'QuerySet':
+            """Add WHERE conditions using the same lookups as Model.filter()"""
+            if not kwargs:
+                raise ValueError("At least one filter must be provided")
+            
+            annotations = dict(self._annotations)
+            field_filters = {}
+            having, having_params = [], []
+            conditions, values = [], []
+            for key, value in kwargs.items():
+                name, _, lookup = key.partition('__')
+                if name not in annotations:
+                    field_filters[key] = value
+                    continue
+                operator = LOOKUP_OPERATORS.get(lookup or 'exact')
+                if operator is None:
+                    raise ValueError(f"Unsupported lookup '{lookup}' for annotation '{name}'")
+                if self._is_grouped():
+                    having.append((name, operator))
+                    having_params.append(value)
+                else:
+                    conditions.append(f"{self._annotation_sql(name, annotations[name])} {operator} ?")
+                    values.append(value)
+            
+            qs = self._unsliced()
+            if field_filters:
+                field_conditions, field_values = self.model._build_conditions(**field_filters)
+                conditions = field_conditions + conditions
+                values = field_values + values
+            return qs._clone(
+                _conditions=qs._conditions + conditions,
+                _params=qs._params + values,
+                _having=qs._having + having,
+                _having_params=qs._having_params + having_params,
+            )
+        
+        def _execute_write(self, query: str, params: list, cascade: bool = False) -> int:
+            """Run an UPDATE/DELETE restricted to this QuerySet and return the affected row count"""
+            qs = self._unsliced()
+            if qs._conditions:
+                query += " WHERE " + " AND ".join(qs._conditions)
+            params = list(params) + qs._params
+            
+            with self.model._connection() as conn:
+                if qs._conditions:
+                    self.model._warn_full_scan(conn, query, params)
+                rowcount = conn.execute(query, params).rowcount
+            self._result_cache = None
+            self.model._forget()
+            self.model._invalidate_cache(cascade)
+            return rowcount
+        
+        def update(self, **kwargs) -> int:
+            """Update all matching records with a single UPDATE statement
+
+            Returns:
+                Number of updated rows
+            """
+            if not kwargs:
+                raise ValueError("At least one field to update must be provided")
+            if 'id' in kwargs:
+                raise ValueError("Cannot update 'id' field")
+            
+            valid_fields = self.model._get_valid_fields()
+            for key in kwargs:
+                if key not in valid_fields:
+                    raise ValueError(f"Invalid field name: {key}")
+            
+            validated_data = self.model._validate_values(kwargs, update=True)
+            set_clause = ', '.join([f"{k} = ?" for k in validated_data.keys()])
+            return self._execute_write(
+                f"UPDATE {self.model.table_name} SET {set_clause}",
+                list(validated_data.values())
+            )
+        
+        def delete(self) -> int:
+            """Delete all matching records with a single DELETE statement
+
+            Returns:
+                Number of deleted rows
+            """
+            rowcount = self._execute_write(f"DELETE FROM {self.model.table_name}", [], cascade=True)
+            # ON DELETE CASCADE / SET NULL may have changed rows of other models
+            clear_session()
+            return rowcount
+        
+        def count(self) -> int:
+            """Count results with SELECT COUNT(*) unless they are already loaded"""
+            if self._result_cache is not None:
+                return len(self._result_cache)
+            
+            if self._is_grouped():
+                query, params = self._compile_select()
+                query = f"SELECT COUNT(*) FROM ({query}) AS grouped"
+            elif self._is_sliced():
+                query, params = self._compile_select('id')
+                query = f"SELECT COUNT(*) FROM ({query}) AS sliced"
+            else:
+                query, params = self._clone(_ordering=[])._compile_select('COUNT(*)')
+            return self._fetch_value(query, params)
+
+        def _as_dicts(self, rows) -> List[Dict]:
+            """Represent loaded rows of any result type as dictionaries"""
+            if self._result_type is None:
+                return [obj.__dict__ for obj in rows]
+            if self._result_type == 'dict':
+                return list(rows)
+            names = self._output_names()
+            if self._result_type == 'flat':
+                return [{names[0]: value} for value in rows]
+            return [dict(zip(names, row)) for row in rows]
+        
+        def to_dict(self) -> List[Dict]:
+            """Convert results to list of dictionaries"""
+            return self._as_dicts(self)
+        
+        def __repr__(self):
+            """String representation"""
+            sample = self._as_dicts(self[:3])
+            return f"<QuerySet(count={self.count()}, first_3_items={sample})>"
+        
+        def annotate(self, **annotations) -> 'QuerySet':
+            """Add aggregates computed in SQL, e.g. ``annotate(n=Count('comments'))``
+
+            On instances, aggregates over a related_name are added as
+            attributes of every row. Followed by values() / values_list(),
+            rows are grouped by the selected fields (GROUP BY) and filters
+            on annotations become HAVING conditions.
+            """
+            if not annotations:
+                raise ValueError("At least one annotation must be provided")
+            
+            valid_fields = self.model._get_valid_fields()
+            for name, aggregate in annotations.items():
+                if not isinstance(aggregate, Aggregate):
+                    raise ValueError(f"annotate() expects aggregates such as Count('field'), got {aggregate!r}")
+                if name in valid_fields:
+                    raise ValueError(f"Annotation '{name}' conflicts with a field of {self.model.__name__}")
+                self._resolve_aggregate(aggregate)
+            return self._clone(_annotations=self._annotations + tuple(annotations.items()))
+        
+        def aggregate(self, **aggregates) -> dict:
+            """Compute aggregates over the matching rows in one query
+
+            e.g. ``aggregate(total=Sum('amount'), n=Count('id'))`` returns
+            ``{'total': ..., 'n': ...}``.
+            """
+            if not aggregates:
+                raise ValueError("At least one aggregate must be provided")
+            for aggregate in aggregates.values():
+                if not isinstance(aggregate, Aggregate):
+                    raise ValueError(f"aggregate() expects aggregates such as Sum('field'), got {aggregate!r}")
+            
+            query, params = self._compile_grouped(list(aggregates), tuple(aggregates.items()), [], slice_groups=False)
+            with self.model._connection() as conn:
+                row = conn.execute(query, params).fetchone()
+            return dict(zip(aggregates, row))
+        
+        def select_related(self, *fields: str) -> 'QuerySet':
+            """Load ForeignKey targets in the same query with LEFT JOINs
+
+            Nested relations are written as ``'customer__country'``. The
+            related instance replaces the id on the ForeignKey attribute.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            
+            related = dict(self._related)
+            for path in fields:
+                model = self.model
+                parts = path.split('__')
+                for depth, name in enumerate(parts, 1):
+                    field = model._meta.foreign_keys.get(name)
+                    if field is None:
+                        raise ValueError(f"'{name}' is not a ForeignKey of {model.__name__}")
+                    model = field.to
+                    related.setdefault('__'.join(parts[:depth]), model)
+            return self._clone(_related=tuple(related.items()))
+        
+        def prefetch_related(self, *names: str) -> 'QuerySet':
+            """Load related_name relations of the results with one extra query each
+
+            The related objects are grouped per instance and cached, so
+            ``instance.<related_name>.all()`` needs no further queries.
+            """
+            if not names:
+                raise ValueError("At least one related_name must be provided")
+            
+            reverse_relations = getattr(self.model, '_reverse_relations', {})
+            for name in names:
+                if name not in reverse_relations:
+                    raise ValueError(f"'{name}' is not a related_name of {self.model.__name__}")
+            return self._clone(_prefetch=tuple(dict.fromkeys(self._prefetch + names)))
+        
+        def _prefetch_related_objects(self, instances: list):
+            """Fetch the prefetch_related() objects of the given instances"""
+            ids = list(dict.fromkeys(obj.id for obj in instances))
+            if not ids:
+                return
+            with self.model._connection() as conn:
+                chunk_size = self.model._max_variables(conn)
+            
+            for name in self._prefetch:
+                source_model, field_name = self.model._reverse_relations[name]
+                groups = {id: [] for id in ids}
+                # One IN (...) query per chunk to stay below SQLITE_MAX_VARIABLE_NUMBER
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    for obj in source_model.filter(**{f"{field_name}__in": chunk}).order_by('id'):
+                        groups[obj.__dict__[field_name]].append(obj)
+                for obj in instances:
+                    _prefetch_cache.setdefault(obj, {})[name] = groups[obj.id]
+        
+        def _check_fields(self, fields) -> tuple:
+            """Validate field names used in a projection"""
+            valid_fields = self.model._get_valid_fields() | {name for name, _ in self._annotations}
+            for name in fields:
+                if name not in valid_fields:
+                    raise ValueError(f"Field '{name}' does not exist")
+            return tuple(dict.fromkeys(fields))
+        
+        def values(self, *fields: str) -> 'QuerySet':
+            """Return rows as dicts of the given fields (all fields by default)
+
+            Only the requested columns are selected and no model instances
+            are created.
+            """
+            fields = self._check_fields(fields) or self.model._meta.column_names
+            return self._clone(_fields=fields, _result_type='dict')
+        
+        def values_list(self, *fields: str, flat: bool = False) -> 'QuerySet':
+            """Return rows as tuples of the given fields (all fields by default)
+
+            With ``flat=True`` and a single field, plain values are returned
+            instead of 1-tuples.
+            """
+            if flat and len(fields) != 1:
+                raise ValueError("values_list(flat=True) requires exactly one field")
+            fields = self._check_fields(fields) or self.model._meta.column_names
+            return self._clone(_fields=fields, _result_type='flat' if flat else 'tuple')
+        
+        def only(self, *fields: str) -> 'QuerySet':
+            """Load instances with only the given fields (and id)
+
+            Other fields are fetched with an extra query when first accessed.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            fields = self._check_fields(fields)
+            return self._clone(_fields=('id',) + tuple(name for name in fields if name != 'id'))
+        
+        def defer(self, *fields: str) -> 'QuerySet':
+            """Load instances without the given fields
+
+            Deferred fields are fetched with an extra query when first accessed.
+            """
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            if 'id' in fields:
+                raise ValueError("The 'id' field cannot be deferred")
+            deferred = set(self._check_fields(fields))
+            current = self._fields or self.model._meta.column_names
+            return self._clone(_fields=tuple(name for name in current if name not in deferred))
+        
+        def order_by(self, *fields: str) -> 'QuerySet':
+            """Order results by one or more fields, prefix with '-' for descending"""
+            if not fields:
+                raise ValueError("At least one field must be provided")
+            
+            valid_fields = self.model._get_valid_fields() | {name for name, _ in self._annotations}
+            ordering = []
+            for field in fields:
+                field_name = field.lstrip('-')
+                if field_name not in valid_fields:
+                    raise ValueError(f"Field '{field_name}' does not exist")
+                direction = "DESC" if field.startswith('-') else "ASC"
+                ordering.append(f"{field_name} {direction}")
+            
+            return self._unsliced()._clone(_ordering=ordering, _keyset=None)
+        
+        def first(self):
+            """Get first result (ordered by id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[0] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = qs._ordering or ["id ASC"]
+            results = qs._clone(_ordering=ordering, _limit=1, _offset=None)._fetch_all()
+            return results[0] if results else None
+
+        def last(self):
+            """Get last result by reversing the ordering (id unless the QuerySet is ordered)"""
+            if self._result_cache is not None:
+                return self._result_cache[-1] if self._result_cache else None
+            
+            qs = self._unsliced()
+            ordering = [
+                f"{item[:-4]} DESC" if item.endswith(" ASC") else f"{item[:-5]} ASC"
+                for item in qs._ordering
+            ]
+            ordering.append("id DESC")
+            results = qs._clone(_ordering=ordering, _limit=1, _offset=None)._fetch_all()
+            return results[0] if results else None
+        
+        def exists(self) -> bool:
+            """Check if results exist with SELECT 1 ... LIMIT 1"""
+            if self._result_cache is not None:
+                return bool(self._result_cache)
+            if self._is_grouped():
+                return bool(self[:1]._fetch_all())
+            
+            query, params = self._unsliced()._clone(_ordering=[], _limit=1, _offset=None)._compile_select('1')
+            return self._fetch_value(query, params) is not None
+
+        def explain(self, analyze: bool = False) -> str:
+            """Return the EXPLAIN QUERY PLAN output of this QuerySet as an indented tree
+
+            SQLite has no EXPLAIN ANALYZE, so ``analyze`` is accepted for
+            compatibility with the PostgreSQL model and ignored.
+            """
+            query, params = self._compile_select()
+            with self.model._connection() as conn:
+                rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            
+            # Rows are (id, parent, notused, detail); children follow their parent
+            depth = {0: -1}
+            lines = []
+            for node_id, parent, _, detail in rows:
+                depth[node_id] = depth.get(parent, -1) + 1
+                lines.append("  " * depth[node_id] + detail)
+            return "\n".join(lines)
+
+        def limit(self, count: int) -> 'QuerySet':
+            """Limit the number of results (LIMIT)"""
+            if count < 0:
+                raise ValueError("Limit must be >= 0")
+            qs = self._unsliced() if self._offset is not None else self
+            return qs._clone(_limit=count)
+        
+        def after(self, cursor: Optional[str] = None, order_by: str = 'id', **values) -> 'QuerySet':
+            """Keyset (seek) pagination, combine with limit()
+
+            Rows are ordered by ``order_by`` and then ``id``, and only rows after
+            the given position are returned. The position is either the token
+            returned by ``next_cursor()`` of the previous page or explicit
+            values, e.g. ``after(id=last_id, order_by='created_at')``. Without a
+            position the first page is returned.
+            """
+            field_name = order_by.lstrip('-')
+            if field_name not in self.model._get_valid_fields():
+                raise ValueError(f"Field '{field_name}' does not exist")
+            descending = order_by.startswith('-')
+            
+            if cursor is not None:
+                if values:
+                    raise ValueError("Pass either a cursor or explicit values, not both")
+                values = _decode_cursor(cursor, field_name, descending)
+            elif values and set(values) - {'id', field_name}:
+                raise ValueError(f"after() only accepts 'id' and '{field_name}' values")
+            
+            # Compare against the stored representation (e.g. ISO text for datetimes)
+            field = self.model._meta.fields.get(field_name)
+            if field is not None and values.get(field_name) is not None:
+                values = dict(values, **{field_name: field.validate(values[field_name])})
+            
+            direction = "DESC" if descending else "ASC"
+            ordering = [f"{field_name} {direction}"]
+            if field_name != 'id':
+                ordering.append(f"id {direction}")
+            
+            qs = self._unsliced()
+            conditions = list(qs._conditions)
+            params = list(qs._params)
+            if values:
+                if 'id' not in values:
+                    raise ValueError("after() requires the 'id' of the last seen row")
+                comparison = "<" if descending else ">"
+                table = self.model.table_name
+                if field_name == 'id':
+                    conditions.append(f"id {comparison} ?")
+                    params.append(values['id'])
+                elif field_name in values:
+                    conditions.append(f"({field_name}, id) {comparison} (?, ?)")
+                    params.extend([values[field_name], values['id']])
+                else:
+                    # Look up the sort value of the last seen row
+                    conditions.append(
+                        f"({field_name}, id) {comparison} "
+                        f"((SELECT {field_name} FROM {table} WHERE id = ?), ?)"
+                    )
+                    params.extend([values['id'], values['id']])
+            
+            return qs._clone(
+                _conditions=conditions,
+                _params=params,
+                _ordering=ordering,
+                _keyset=(field_name, descending),
+            )
+        
+        def next_cursor(self) -> Optional[str]:
+            """Opaque token for the page after this one, None on the last page
+
+            Only available on QuerySets built with after() and limit().
+            """
+            if self._keyset is None or self._limit is None:
+                raise ValueError("next_cursor() requires after() and limit()")
+            if self._result_type is not None:
+                raise ValueError("next_cursor() is not available with values() or values_list()")
+            
+            results = self._fetch_all()
+            if len(results) < self._limit or not results:
+                return None
+            
+            field_name, descending = self._keyset
+            last = results[-1]
+            return _encode_cursor(field_name, descending, getattr(last, field_name), last.id)
+        
+        def paginate(self, page: int, page_size: int) -> 'QuerySet':
+            """Paginate results using LIMIT/OFFSET"""
+            if page < 1:
+                raise ValueError("Page number must be >= 1")
+            if page_size < 1:
+                raise ValueError("Page size must be >= 1")
+            
+            offset = (page - 1) * page_size
+            return self._unsliced()._clone(
+                _limit=page_size,
+                _offset=offset or None,
+                page=page,
+                page_size=page_size,
+            )
+        
+        def contains(self, **kwargs) -> 'QuerySet':
+            """Case-insensitive contains search"""
+            if not kwargs:
+                raise ValueError("At least one field must be provided")
+            
+            valid_fields = self.model._get_valid_fields()
+            conditions = []
+            values = []
+            for field, value in kwargs.items():
+                if field not in valid_fields:
+                    raise ValueError(f"Invalid field name: {field}")
+                conditions.append(f"LOWER(CAST({field} AS TEXT)) LIKE ?")
+                values.append(f"%{str(value).lower()}%")
+            
+            qs = self._unsliced()
+            return qs._clone(
+                _conditions=qs._conditions + conditions,
+                _params=qs._params + values,
+            )
+
+    class ResultSet:
+        """In-memory results of an evaluated QuerySet"""
         
         def __init__(self, results, total_count, page, page_size):
             self.results = results
@@ -97,8 +1163,8 @@ class BaseModel:
             self.page = page
             self.page_size = page_size
         
-        def filter(self, **kwargs) -> 'QuerySet':
-            """Filter QuerySet results in-memory"""
+        def filter(self, **kwargs) -> 'ResultSet':
+            """Filter results in-memory"""
             if not kwargs:
                 raise ValueError("At least one filter must be provided")
 
@@ -149,7 +1215,7 @@ class BaseModel:
         def __repr__(self):
             """String representation"""
             sample = self.to_dict()[:3]
-            return f"<QuerySet(count={self.count()}, first_3_items={sample})>"
+            return f"<ResultSet(count={self.count()}, first_3_items={sample})>"
         
         def order_by(self, field: str):
             """Order results by field"""
@@ -190,7 +1256,7 @@ class BaseModel:
             paginated_results = self.results[offset:offset + page_size]
             return self.__class__(paginated_results, self.total_count, page, page_size)
         
-        def contains(self, **kwargs) -> 'QuerySet':
+        def contains(self, **kwargs) -> 'ResultSet':
             """Case-insensitive contains search"""
             if not kwargs:
                 raise ValueError("At least one field must be provided")
@@ -224,11 +1290,12 @@ class BaseModel:
             return self.__class__(filtered_results, len(filtered_results), self.page, self.page_size)
 
     def __repr__(self):
-        """String representation of model instance"""
+        """String representation of model instance, without loading deferred fields"""
+        values = self.__dict__
+        unsaved = values.get('id') is None
         field_values = {
-            attr: getattr(self, attr, None) 
-            for attr in self.__class__.__dict__ 
-            if isinstance(self.__class__.__dict__[attr], Field)
+            name: values[name] if name in values else (field.default if unsaved else _DEFERRED)
+            for name, field in self._meta.fields.items()
         }
         return f"<{self.__class__.__name__} {field_values}>"
     
@@ -239,83 +1306,193 @@ class BaseModel:
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    def _load_deferred_field(self, field):
+        """Fetch a field left out by only() / defer() the first time it is read"""
+        if getattr(self, 'id', None) is None:
+            return field.default
+        rows = self.__class__.filter(id=self.id).values_list(field.name, flat=True)[:1]._fetch_all()
+        if not rows:
+            # AttributeError keeps getattr(obj, name, default) and hasattr() working
+            raise AttributeError(
+                f"Cannot load deferred field '{field.name}': no {self.__class__.__name__} record with id={self.id}"
+            )
+        self.__dict__[field.name] = rows[0]
+        return rows[0]
+
     @classmethod
-    def connect(cls):
-        """Create database connection"""
+    def connect(cls, check_same_thread: bool = True):
+        """Open a new database connection configured from Meta.db_config
+
+        ``check_same_thread=False`` lets other threads use the connection,
+        one at a time.
+        """
         config = getattr(cls.Meta, 'db_config', None)
         if not config or 'db_name' not in config:
             raise ValueError("Database configuration 'db_name' is missing in Meta class")
         
-        conn = sqlite3.connect(config['db_name'])
+        pragmas = []
+        for name, choices in PRAGMA_CHOICES.items():
+            if config.get(name) is not None:
+                value = str(config[name]).upper()
+                if value not in choices:
+                    raise ValueError(f"Invalid value for '{name}': {config[name]}")
+                pragmas.append((name, value))
+        for name in PRAGMA_INTEGERS:
+            if config.get(name) is not None:
+                try:
+                    pragmas.append((name, int(config[name])))
+                except (ValueError, TypeError):
+                    raise ValueError(f"Value for '{name}' must be an integer")
+        
+        # isolation_level=None keeps the connection in autocommit mode,
+        # transactions are opened explicitly where they are needed
+        conn = sqlite3.connect(
+            config['db_name'],
+            timeout=config.get('timeout', 5.0),
+            cached_statements=config.get('cached_statements', 128),
+            isolation_level=None,
+            check_same_thread=check_same_thread,
+        )
         # Enable foreign key support in SQLite
         conn.execute("PRAGMA foreign_keys = ON")
+        for name, value in pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
         return conn
 
     @classmethod
-    def create_table(cls):
-        """Create database table with foreign key constraints"""
-        conn = cls.connect()
-        cursor = None
+    def _get_connection(cls):
+        """Get the long-lived connection of the current thread, opening it on first use"""
+        connections = getattr(_local, 'connections', None)
+        if connections is None:
+            connections = _local.connections = {}
         
-        try:
-            cursor = conn.cursor()
-            
-            # Step 1: Create table if not exists
-            try:
-                columns = cls._get_column_definitions()
-                foreign_keys = cls._get_foreign_key_constraints()
-                
-                # Build CREATE TABLE statement
-                table_parts = ["id INTEGER PRIMARY KEY AUTOINCREMENT"]
-                table_parts.extend(columns)
-                table_parts.extend(foreign_keys)
-                
-                create_sql = f"CREATE TABLE IF NOT EXISTS {cls.table_name} ({', '.join(table_parts)})"
-                cursor.execute(create_sql)
-                conn.commit()
-            except sqlite3.Error as e:
-                conn.rollback()
-                if "already exists" not in str(e):
-                    print(f"Warning during table creation: {e}")
-                cursor.close()
-                cursor = conn.cursor()
-            
-            # Step 2: Update table structure (add new columns)
-            try:
-                cls._update_table_structure(cursor)
-                conn.commit()
-            except sqlite3.Error as e:
-                conn.rollback()
-                print(f"Warning during table update: {e}")
-                
-        except Exception as e:
-            if conn:
-                try:
-                    conn.rollback()
-                except:
-                    pass
-            raise ConnectionError(f"Failed to create table {cls.table_name}: {e}")
+        config = getattr(cls.Meta, 'db_config', None)
+        if not config or 'db_name' not in config:
+            raise ValueError("Database configuration 'db_name' is missing in Meta class")
         
-        finally:
-            if cursor:
-                try:
-                    cursor.close()
-                except:
-                    pass
-            if conn:
-                try:
-                    conn.close()
-                except:
-                    pass
+        conn = connections.get(config['db_name'])
+        if conn is None:
+            conn = connections[config['db_name']] = cls.connect()
+        return conn
 
     @classmethod
-    def _get_column_definitions(cls):
-        """Generate column definitions for CREATE TABLE"""
-        columns = []
+    @contextmanager
+    def _connection(cls, transaction: bool = False):
+        """Use the thread's connection for the duration of a ``with`` block
+
+        Connections run in autocommit mode unless an atomic() block is open.
+        With ``transaction=True`` the block runs inside atomic().
+        """
+        if transaction:
+            with cls.atomic() as conn:
+                yield conn
+        else:
+            yield cls._get_connection()
+
+    @classmethod
+    @contextmanager
+    def atomic(cls):
+        """Run the block in a single transaction
+
+        Every ORM call made by this thread inside the block, for any model
+        using the same database file, runs in the same transaction. Nested
+        blocks create savepoints. The transaction is committed when the
+        outermost block exits and rolled back if it raises.
         
-        for attr, field in cls.__dict__.items():
-            if not isinstance(field, Field):
-                continue
+        The outermost block starts with BEGIN IMMEDIATE, taking the write lock
+        up front: a deferred transaction that reads first and then writes
+        fails with "database is locked" when another connection wrote in
+        between, without waiting for the busy timeout.
+        """
+        conn = cls._get_connection()
+        depths = getattr(_local, 'transaction_depths', None)
+        if depths is None:
+            depths = _local.transaction_depths = {}
+        
+        db_name = cls.Meta.db_config['db_name']
+        depth = depths.get(db_name, 0)
+        savepoint = f"abarorm_sp_{depth}"
+        
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        depths[db_name] = depth + 1
+        
+        try:
+            yield conn
+        except BaseException:
+            # Instances read or saved in the block may not match the rolled back rows
+            clear_session()
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+            raise
+        else:
+            if depth == 0:
+                try:
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+            else:
+                conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+        finally:
+            depths[db_name] = depth
+            if depth == 0:
+                # Results other threads cached before the commit may be stale
+                pending = getattr(_local, 'pending_invalidations', None)
+                for table, cascade in (pending.pop(db_name, ()) if pending else ()):
+                    invalidate(table, cascade)
+
+    @classmethod
+    def create_table(cls):
+        """Create database table with foreign key constraints"""
+        try:
+            # The connection runs in autocommit mode, so every step is
+            # applied on its own and a failing step does not undo the others
+            with cls._connection() as conn:
+                cursor = conn.cursor()
+                
+                # Step 1: Create table if not exists
+                try:
+                    columns = cls._get_column_definitions()
+                    foreign_keys = cls._get_foreign_key_constraints()
+                    
+                    # Build CREATE TABLE statement
+                    table_parts = ["id INTEGER PRIMARY KEY AUTOINCREMENT"]
+                    table_parts.extend(columns)
+                    table_parts.extend(foreign_keys)
+                    
+                    create_sql = f"CREATE TABLE IF NOT EXISTS {cls.table_name} ({', '.join(table_parts)})"
+                    cursor.execute(create_sql)
+                except sqlite3.Error as e:
+                    if "already exists" not in str(e):
+                        print(f"Warning during table creation: {e}")
+                
+                # Step 2: Update table structure (add new columns)
+                try:
+                    cls._update_table_structure(cursor)
+                except sqlite3.Error as e:
+                    print(f"Warning during table update: {e}")
+                
+                # Step 3: Create and drop indexes to match the model
+                try:
+                    cls._sync_indexes(cursor)
+                except sqlite3.Error as e:
+                    print(f"Warning during index update: {e}")
+                
+        except Exception as e:
+            raise ConnectionError(f"Failed to create table {cls.table_name}: {e}")
+
+    @classmethod
+    def _get_column_definitions(cls):
+        """Generate column definitions for CREATE TABLE"""
+        columns = []
+        
+        for attr, field in cls._meta.fields.items():
             
             if isinstance(field, ForeignKey):
                 col_type = field.field_type
@@ -366,9 +1543,8 @@ class BaseModel:
         """Generate FOREIGN KEY constraints for CREATE TABLE"""
         constraints = []
         
-        for attr, field in cls.__dict__.items():
-            if isinstance(field, ForeignKey):
-                constraints.append(field.get_constraint(attr, cls.table_name))
+        for attr, field in cls._meta.foreign_keys.items():
+            constraints.append(field.get_constraint(attr, cls.table_name))
         
         return constraints
 
@@ -377,12 +1553,11 @@ class BaseModel:
         """Add new columns to existing table"""
         existing_columns = cls._get_existing_columns(cursor)
         new_columns = [
-            attr for attr in cls.__dict__ 
-            if isinstance(cls.__dict__[attr], Field) and attr not in existing_columns
+            attr for attr in cls._meta.field_names if attr not in existing_columns
         ]
 
         for column in new_columns:
-            field = cls.__dict__[column]
+            field = cls._meta.fields[column]
             col_type = field.field_type
             
             if isinstance(field, DecimalField):
@@ -407,6 +1582,37 @@ class BaseModel:
                 else:
                     print(f"Warning: Could not add column {column}: {e}")
 
+    @classmethod
+    def _sync_indexes(cls, cursor):
+        """Create missing indexes and drop generated ones that are no longer declared
+
+        Only indexes named ix_<table>_... / ux_<table>_... are dropped, so
+        indexes created outside the model are left alone. An index whose
+        stored definition no longer matches the declared one (columns, sort
+        order, unique or where changed) is dropped and created again.
+        """
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (cls.table_name,))
+        existing = dict(cursor.fetchall())
+        declared = {index.get_name(cls.table_name): index for index in cls._meta.indexes}
+        
+        for name, index in declared.items():
+            create_sql = index.get_sql(cls.table_name)
+            if name in existing:
+                # sqlite_master keeps the statement as issued, minus IF NOT EXISTS
+                stored = existing[name]
+                if stored is None or stored.split() == create_sql.replace(' IF NOT EXISTS', '', 1).split():
+                    continue
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            try:
+                cursor.execute(create_sql)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not create index {name}: {e}")
+        
+        generated = (f"ix_{cls.table_name}_", f"ux_{cls.table_name}_")
+        for name in set(existing) - set(declared):
+            if name.startswith(generated):
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
     @classmethod
     def _get_existing_columns(cls, cursor):
         """Get existing columns from table"""
@@ -415,55 +1621,77 @@ class BaseModel:
     
     @classmethod
     def _get_valid_fields(cls):
-        """Cache valid field names for performance"""
-        if not hasattr(cls, '_valid_fields_cache'):
-            cls._valid_fields_cache = {
-                attr for attr, field in cls.__dict__.items() 
-                if isinstance(field, Field)
-            }
-            cls._valid_fields_cache.add('id')
-        return cls._valid_fields_cache
+        """Valid field names, including id"""
+        return cls._meta.valid_fields
+    
+    @classmethod
+    def _register_reverse_relation(cls, related_name: str, model, field_name: str):
+        """Record a ForeignKey pointing at this model under its related_name"""
+        if '_reverse_relations' not in cls.__dict__:
+            cls._reverse_relations = {}
+        cls._reverse_relations[related_name] = (model, field_name)
+    
+    @classmethod
+    def _row_loader(cls, description):
+        """Compile a function that turns rows of the given cursor description into instances
+
+        Column names and their to_python converters are resolved once per
+        query. Instances are built with __new__ and get their attribute dict
+        directly, skipping __init__ and the per-attribute setattr calls.
+        """
+        columns = tuple(column[0] for column in description)
+        converters = tuple(
+            (name, cls._meta.converters[name]) for name in columns
+            if name in cls._meta.converters
+        )
+        new = cls.__new__
+        
+        def load(row):
+            values = dict(zip(columns, row))
+            for name, convert in converters:
+                value = values[name]
+                if value is not None:
+                    values[name] = convert(value)
+            instance = new(cls)
+            instance.__dict__ = values
+            return instance
+        
+        return load
     
     @classmethod
     def _validate_and_convert_values(cls, **kwargs):
         """Validate and convert field values using field validators"""
+        return cls._validate_values(kwargs)
+
+    @classmethod
+    def _validate_values(cls, kwargs: dict, update: bool = False):
+        """Validate and convert field values and fill in the auto_now / auto_now_add dates
+
+        With ``update=True`` only auto_now dates are refreshed, so the
+        auto_now_add creation dates of existing rows are kept.
+        """
+        meta = cls._meta
         validated = {}
         
-        for key, value in kwargs.items():
-            field = getattr(cls, key, None)
-            
-            if field is None or not isinstance(field, Field):
-                validated[key] = value
-                continue
-            
-            # Validate using field's validate method
-            if hasattr(field, 'validate'):
+        for name, validate in meta.validators:
+            if name in kwargs:
                 try:
-                    validated[key] = field.validate(value)
+                    validated[name] = validate(kwargs[name])
                 except ValueError as e:
-                    raise ValueError(f"Validation error for field '{key}': {e}")
-            else:
-                validated[key] = value
+                    raise ValueError(f"Validation error for field '{name}': {e}")
         
-        for attr_name in dir(cls):
-            if attr_name.startswith('_'):
-                continue
-            
-            try:
-                field = getattr(cls, attr_name)
-            except AttributeError:
-                continue
-            
-            if not isinstance(field, Field):
-                continue
-            
-            if isinstance(field, (DateField, DateTimeField)):
-                if attr_name not in validated: 
-                    if field.auto_now or field.auto_now_add:
-                        if isinstance(field, DateField):
-                            validated[attr_name] = datetime.datetime.now().date().isoformat()
-                        else:
-                            validated[attr_name] = datetime.datetime.now().isoformat()
+        # Unknown keys are passed through unchanged
+        if len(validated) < len(kwargs):
+            for key, value in kwargs.items():
+                if key not in validated:
+                    validated[key] = value
+        
+        now = None
+        for name, date_only, on_update in meta.auto_now_fields:
+            if name not in validated and (on_update or not update):
+                if now is None:
+                    now = datetime.datetime.now()
+                validated[name] = now.date().isoformat() if date_only else now.isoformat()
         
         return validated
 
@@ -471,186 +1699,521 @@ class BaseModel:
     @classmethod
     def all(cls, order_by: Optional[str] = None) -> 'QuerySet':
         """Get all records"""
-        conn = cls.connect()
-        try:
-            cursor = conn.cursor()
-            query = f"SELECT * FROM {cls.table_name}"
-            
-            if order_by:
-                field_name = order_by.lstrip('-')
-                valid_fields = cls._get_valid_fields()
-                if field_name != 'id' and field_name not in valid_fields:
-                    raise ValueError(f"Invalid field name for ordering: {field_name}")
-                
-                direction = "DESC" if order_by.startswith('-') else "ASC"
-                query += f" ORDER BY {field_name} {direction}"
-            
-            cursor.execute(query)
-            results = cursor.fetchall()
+        qs = cls.QuerySet(cls)
+        if order_by:
+            field_name = order_by.lstrip('-')
+            valid_fields = cls._get_valid_fields()
+            if field_name != 'id' and field_name not in valid_fields:
+                raise ValueError(f"Invalid field name for ordering: {field_name}")
+            qs = qs.order_by(order_by)
+        return qs
+
+    @classmethod
+    def iterator(cls, chunk_size: int = 2000):
+        """Stream all records in chunks without loading them all into memory"""
+        return cls.all().iterator(chunk_size=chunk_size)
+
+    @classmethod
+    def _statement(cls, shape: tuple, build):
+        """SQL (or lookup plan) of a statement shape, built once per model and memoized"""
+        statements = cls._meta.statements
+        compiled = statements.get(shape)
+        if compiled is None:
+            compiled = build()
+            if len(statements) < _MAX_STATEMENTS:
+                statements[shape] = compiled
+        return compiled
+
+    @classmethod
+    def _compile_lookups(cls, keys: tuple) -> tuple:
+        """Compile filter lookups into (key, kind, SQL) steps"""
+        valid_fields = cls._get_valid_fields()
+        plan = []
+        for key in keys:
+            for suffix, template, kind in _LOOKUPS:
+                if key.endswith(suffix):
+                    column = key[:-len(suffix)]
+                    break
+            else:
+                column, template, kind = key, "{} = ?", 'value'
             
-            return cls.QuerySet(
-                [cls(**dict(zip([c[0] for c in cursor.description], row))) for row in results],
-                len(results),
-                page=1,
-                page_size=len(results)
-            )
-        finally:
-            conn.close()
+            if column != 'id' and column not in valid_fields:
+                raise ValueError(f"Invalid field name: {column}")
+            plan.append((key, kind, template.format(column)))
+        return tuple(plan)
 
     @classmethod
-    def filter(cls, **kwargs) -> 'QuerySet':
-        """Filter records with various operators"""
-        if not kwargs:
-            return cls.all()
+    def _build_conditions(cls, **kwargs):
+        """Translate filter lookups into SQL conditions and their values
+
+        Lookups are compiled once per shape (the sorted lookup names), so
+        repeated filters only bind their values.
+        """
+        keys = tuple(sorted(kwargs))
+        plan = cls._statement(('lookups',) + keys, lambda: cls._compile_lookups(keys))
         
         conditions = []
         values = []
-        valid_fields = cls._get_valid_fields()
-
-        for key, value in kwargs.items():
-            base_key = key
-            operator = "="
-            
-            if key.endswith("__gte"):
-                base_key = key[:-5]
-                operator = ">="
-            elif key.endswith("__lte"):
-                base_key = key[:-5]
-                operator = "<="
-            elif key.endswith("__gt"):
-                base_key = key[:-4]
-                operator = ">"
-            elif key.endswith("__lt"):
-                base_key = key[:-4]
-                operator = "<"
-            elif key.endswith("__ne"):
-                base_key = key[:-4]
-                operator = "!="
-            elif key.endswith("__contains"):
-                base_key = key[:-10]
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                conditions.append(f"{base_key} LIKE ?")
+        for key, kind, sql in plan:
+            value = kwargs[key]
+            if kind == 'value':
+                conditions.append(sql)
+                values.append(value)
+            elif kind == 'like':
+                conditions.append(sql)
                 values.append(f"%{value}%")
-                continue
-            elif key.endswith("__icontains"):
-                base_key = key[:-11]
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                conditions.append(f"LOWER({base_key}) LIKE LOWER(?)")
-                values.append(f"%{value}%")
-                continue
-            elif key.endswith("__in"):
-                base_key = key[:-4]
+            else:
                 if not isinstance(value, (list, tuple)):
                     raise ValueError(f"Value for {key} must be a list or tuple")
-                if base_key != 'id' and base_key not in valid_fields:
-                    raise ValueError(f"Invalid field name: {base_key}")
-                placeholders = ", ".join(["?" for _ in value])
-                conditions.append(f"{base_key} IN ({placeholders})")
+                conditions.append(f"{sql} ({', '.join(['?'] * len(value))})")
                 values.extend(value)
-                continue
-            
-            if base_key != 'id' and base_key not in valid_fields:
-                raise ValueError(f"Invalid field name: {base_key}")
-            
-            conditions.append(f"{base_key} {operator} ?")
-            values.append(value)
+        
+        return conditions, values
 
-        query = f"SELECT * FROM {cls.table_name} WHERE " + " AND ".join(conditions)
+    @classmethod
+    def filter(cls, **kwargs) -> 'QuerySet':
+        """Filter records with various operators (evaluated lazily)"""
+        if not kwargs:
+            return cls.all()
         
-        conn = cls.connect()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(query, tuple(values))
-            results = cursor.fetchall()
-            
-            return cls.QuerySet(
-                [cls(**dict(zip([c[0] for c in cursor.description], row))) for row in results],
-                len(results),
-                page=1,
-                page_size=len(results)
-            )
-        finally:
-            conn.close()
+        return cls.QuerySet(cls).filter(**kwargs)
+
+    @classmethod
+    def _fetch(cls, query: str, params, tables: tuple = (), single: bool = False,
+               check_scan: bool = True):
+        """Run a SELECT and return (description, rows), reading through Meta.cache when it is set
+
+        The description only holds the column names. Nothing is cached while
+        a transaction is open, since its rows may not be committed.
+        """
+        cache = cls._meta.cache
+        key = None
+        if cache is not None and not cls._get_connection().in_transaction:
+            key = cache.key(tables or (cls.table_name,), query, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        with cls._connection() as conn:
+            if check_scan:
+                cls._warn_full_scan(conn, query, params)
+            cursor = conn.execute(query, params)
+            if single:
+                row = cursor.fetchone()
+                rows = [row] if row is not None else []
+            else:
+                rows = cursor.fetchall()
+            result = (tuple((column[0],) for column in cursor.description), rows)
+        
+        if key is not None:
+            cache.set(key, result)
+        return result
+
+    @classmethod
+    def _invalidate_cache(cls, cascade: bool = False) -> None:
+        """Invalidate cached results that read this model's table after a write
+
+        Inside atomic() the table is invalidated again once the transaction
+        ends, as other threads may cache the old rows until the commit.
+        """
+        invalidate(cls.table_name, cascade)
+        db_name = cls.Meta.db_config['db_name']
+        depths = getattr(_local, 'transaction_depths', None)
+        if depths and depths.get(db_name):
+            pending = getattr(_local, 'pending_invalidations', None)
+            if pending is None:
+                pending = _local.pending_invalidations = {}
+            pending.setdefault(db_name, set()).add((cls.table_name, cascade))
+
+    @classmethod
+    def _warn_full_scan(cls, conn, query: str, params) -> None:
+        """Debug check: warn when a query scans a whole table larger than the threshold
+
+        Enabled with ``db_config['warn_full_scans']``; the row threshold is
+        ``db_config['full_scan_threshold']`` (default 1000). Each query is
+        reported once, as a RuntimeWarning.
+        """
+        config = cls.Meta.db_config
+        if not config.get('warn_full_scans') or query in _scan_warnings:
+            return
+        threshold = config.get('full_scan_threshold', 1000)
+        
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall():
+            # "SCAN book" (or "SCAN TABLE book" before 3.36); "SCAN ... USING INDEX" is an index walk
+            words = row[3].split()
+            if words[0] != 'SCAN' or 'USING' in words or len(words) < 2:
+                continue
+            table = words[2] if words[1] == 'TABLE' and len(words) > 2 else words[1]
+            try:
+                # The largest rowid is a cheap estimate of the table size
+                rows = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+            except sqlite3.Error:
+                continue
+            if rows >= threshold:
+                if len(_scan_warnings) >= _MAX_STATEMENTS:
+                    _scan_warnings.clear()
+                _scan_warnings.add(query)
+                warnings.warn(f"full table scan on '{table}' (~{rows} rows): {query}", RuntimeWarning)
+                return
+
+    @classmethod
+    def _forget(cls, id: Optional[int] = None) -> None:
+        """Drop one row, or every row, of this model from the open session()"""
+        session = current_session()
+        if session is not None:
+            session.discard(cls, id)
 
     @classmethod
     def get(cls, **kwargs) -> Optional['BaseModel']:
-        """Get single record"""
+        """Get single record
+
+        Inside session(), ``get(id=...)`` returns the instance already loaded
+        for that row without a query.
+        """
         if not kwargs:
             raise ValueError("At least one filter must be provided")
         
-        valid_fields = cls._get_valid_fields()
+        session = current_session()
+        if session is not None and kwargs.keys() == {'id'}:
+            instance = session.get(cls, kwargs['id'])
+            if instance is not None:
+                return instance
         
-        for key in kwargs.keys():
-            if key != 'id' and key not in valid_fields:
-                raise ValueError(f"Invalid field name: {key}")
+        keys = tuple(kwargs)
         
-        conn = cls.connect()
-        try:
-            cursor = conn.cursor()
-            query = f"SELECT * FROM {cls.table_name} WHERE " + " AND ".join([f"{k} = ?" for k in kwargs.keys()])
-            cursor.execute(query, tuple(kwargs.values()))
-            result = cursor.fetchone()
-            
-            if result:
-                return cls(**dict(zip([c[0] for c in cursor.description], result)))
-            return None
-        finally:
-            conn.close()
+        def build():
+            valid_fields = cls._get_valid_fields()
+            for key in keys:
+                if key != 'id' and key not in valid_fields:
+                    raise ValueError(f"Invalid field name: {key}")
+            return f"{cls._meta.select_sql} WHERE " + " AND ".join(f"{key} = ?" for key in keys)
+        
+        query = cls._statement(('get',) + keys, build)
+        description, rows = cls._fetch(query, tuple(kwargs.values()), single=True)
+        if rows:
+            instance = cls._row_loader(description)(rows[0])
+            return session.add(instance) if session is not None else instance
+        return None
 
     @classmethod
     def create(cls, **kwargs) -> int:
         """Create new record with validation"""
         validated_data = cls._validate_and_convert_values(**kwargs)
         
-        conn = cls.connect()
-        try:
+        columns = tuple(validated_data)
+        if columns == cls._meta.field_names:
+            query = cls._meta.insert_sql
+        else:
+            query = cls._statement(('insert',) + columns, lambda: (
+                f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            ))
+        
+        with cls._connection() as conn:
             cursor = conn.cursor()
-            columns = list(validated_data.keys())
-            placeholders = ['?' for _ in columns]
-            values = list(validated_data.values())
-            
-            query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-            cursor.execute(query, tuple(values))
-            
+            cursor.execute(query, tuple(validated_data.values()))
             new_id = cursor.lastrowid
-            conn.commit()
-            return new_id
-        finally:
-            conn.close()
+        
+        cls._invalidate_cache()
+        return new_id
     
     @classmethod
-    def bulk_create(cls, records: list) -> int:
-        """Bulk create records with validation"""
+    def _max_variables(cls, conn) -> int:
+        """Maximum number of ? parameters allowed in one statement"""
+        if hasattr(conn, 'getlimit'):
+            return conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        # SQLITE_MAX_VARIABLE_NUMBER defaults to 999 before SQLite 3.32.0
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+    @classmethod
+    def bulk_create(cls, records: list, batch_size: Optional[int] = None, returning: bool = False):
+        """Bulk create records with validation
+
+        Args:
+            records: List of dicts with field values
+            batch_size: Maximum number of rows per INSERT statement
+                (further limited by SQLITE_MAX_VARIABLE_NUMBER)
+            returning: Return the new ids instead of the count
+
+        Returns:
+            Number of created records, or the list of new ids in input order
+        """
         if not records:
             raise ValueError("The records list is empty")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
         
-        conn = cls.connect()
-        try:
+        # Records may set different fields, so rows are grouped by their columns
+        groups = {}
+        for index, record in enumerate(records):
+            validated_data = cls._validate_and_convert_values(**record)
+            indexes, rows = groups.setdefault(tuple(validated_data), ([], []))
+            indexes.append(index)
+            rows.append(tuple(validated_data.values()))
+        
+        # RETURNING is available from SQLite 3.35.0
+        use_returning = returning and sqlite3.sqlite_version_info >= (3, 35, 0)
+        new_ids = [None] * len(records)
+        
+        with cls._connection(transaction=True) as conn:
             cursor = conn.cursor()
-            all_values = []
+            max_variables = cls._max_variables(conn)
             
-            for record in records:
-                validated_data = cls._validate_and_convert_values(**record)
-                all_values.append(tuple(validated_data.values()))
-            
-            first_validated = cls._validate_and_convert_values(**records[0])
-            columns = list(first_validated.keys())
-            placeholders = ", ".join(["?" for _ in columns])
-            query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            for columns, (indexes, rows) in groups.items():
+                column_sql = ', '.join(columns)
+                row_sql = f"({', '.join('?' for _ in columns)})"
+                
+                if returning and not use_returning:
+                    query = f"INSERT INTO {cls.table_name} ({column_sql}) VALUES {row_sql}"
+                    for index, row in zip(indexes, rows):
+                        cursor.execute(query, row)
+                        new_ids[index] = cursor.lastrowid
+                    continue
+                
+                size = max(max_variables // max(len(columns), 1), 1)
+                if batch_size:
+                    size = min(size, batch_size)
+                
+                for start in range(0, len(rows), size):
+                    batch = rows[start:start + size]
+                    query = f"INSERT INTO {cls.table_name} ({column_sql}) VALUES {', '.join([row_sql] * len(batch))}"
+                    if use_returning:
+                        query += " RETURNING id"
+                    cursor.execute(query, [value for row in batch for value in row])
+                    if use_returning:
+                        for index, (new_id,) in zip(indexes[start:start + size], cursor.fetchall()):
+                            new_ids[index] = new_id
+        
+        cls._invalidate_cache()
+        return new_ids if returning else len(records)
+
+    @classmethod
+    def _validate_update_fields(cls, instances: list, fields: list):
+        """Validate the given fields of every instance for bulk_update()"""
+        if not fields:
+            raise ValueError("At least one field to update must be provided")
+        if 'id' in fields:
+            raise ValueError("Cannot update 'id' field")
+        
+        valid_fields = cls._get_valid_fields()
+        for name in fields:
+            if name not in valid_fields:
+                raise ValueError(f"Invalid field name: {name}")
+        
+        validators = dict(cls._meta.validators)
+        rows = []
+        for instance in instances:
+            if getattr(instance, 'id', None) is None:
+                raise ValueError("bulk_update() requires instances with an id")
+            row = [instance.id]
+            for name in fields:
+                try:
+                    row.append(validators[name](getattr(instance, name, None)))
+                except ValueError as e:
+                    raise ValueError(f"Validation error for field '{name}': {e}")
+            rows.append(tuple(row))
+        return rows
+
+    @classmethod
+    def bulk_update(cls, instances: list, fields: list, batch_size: Optional[int] = None) -> int:
+        """Update the given fields of many instances in one transaction
+
+        A single prepared UPDATE is run with executemany(). In SQLite this
+        is faster than CASE expressions, whose cost grows with the batch size.
+
+        Returns:
+            Number of updated rows
+        """
+        if not instances:
+            return 0
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        rows = cls._validate_update_fields(instances, fields)
+        set_clause = ", ".join(f"{name} = ?" for name in fields)
+        query = f"UPDATE {cls.table_name} SET {set_clause} WHERE id = ?"
+        
+        size = batch_size or len(rows)
+        updated_rows = 0
+        cls._forget()
+        with cls._connection(transaction=True) as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(rows), size):
+                cursor.executemany(query, [row[1:] + row[:1] for row in rows[start:start + size]])
+                updated_rows += cursor.rowcount
+        cls._invalidate_cache()
+        return updated_rows
+
+    @classmethod
+    def _default_update_fields(cls, columns, provided, conflict_fields) -> list:
+        """Fields an upsert overwrites by default: the given ones plus auto_now fields"""
+        return [
+            name for name in columns
+            if name not in conflict_fields
+            and (name in provided or getattr(cls._meta.fields.get(name), 'auto_now', False))
+        ]
+
+    @classmethod
+    def _build_conflict_clause(cls, columns, conflict_fields, update_fields) -> str:
+        """Build the ON CONFLICT ... DO UPDATE clause of an upsert"""
+        if not conflict_fields:
+            raise ValueError("At least one conflict field must be provided")
+        
+        valid_fields = cls._get_valid_fields()
+        for name in list(conflict_fields) + list(update_fields):
+            if name not in valid_fields:
+                raise ValueError(f"Invalid field name: {name}")
+            if name not in columns:
+                raise ValueError(f"No value given for field '{name}'")
+        
+        # Without fields to update, a no-op update still returns the existing id
+        update_fields = list(update_fields) or list(conflict_fields[:1])
+        set_clause = ", ".join(f"{name} = excluded.{name}" for name in update_fields)
+        return f"ON CONFLICT ({', '.join(conflict_fields)}) DO UPDATE SET {set_clause}"
+
+    @classmethod
+    def _group_upsert_records(cls, records: list, conflict_fields: list, update_fields: Optional[list]):
+        """Validate records, keep the last one per conflict key and group them by columns"""
+        validated_records = [cls._validate_and_convert_values(**record) for record in records]
+        latest = {}
+        for index, validated_data in enumerate(validated_records):
+            latest[tuple(validated_data.get(name) for name in conflict_fields)] = index
+        
+        groups = {}
+        duplicates = {}
+        for index, validated_data in enumerate(validated_records):
+            winner = latest[tuple(validated_data.get(name) for name in conflict_fields)]
+            if winner != index:
+                duplicates[index] = winner
+                continue
+            columns = tuple(sorted(validated_data))
+            fields = update_fields
+            if fields is None:
+                fields = cls._default_update_fields(columns, records[index], conflict_fields)
+            conflict_sql = cls._build_conflict_clause(columns, conflict_fields, fields)
+            indexes, rows = groups.setdefault((columns, conflict_sql), ([], []))
+            indexes.append(index)
+            rows.append(tuple(validated_data[column] for column in columns))
+        return groups, duplicates
+
+    @classmethod
+    def upsert(cls, conflict_fields: list, update_fields: Optional[list] = None, **values) -> int:
+        """Insert a record, or update it if it exists, with INSERT ... ON CONFLICT DO UPDATE
+
+        Args:
+            conflict_fields: Fields of the unique constraint that identifies the record
+            update_fields: Fields to overwrite when the record exists
+                (the given fields except the conflict fields by default)
+            **values: Field values
+
+        Returns:
+            id of the inserted or updated record
+        """
+        validated_data = cls._validate_and_convert_values(**values)
+        columns = list(validated_data)
+        if update_fields is None:
+            update_fields = cls._default_update_fields(columns, values, conflict_fields)
+        conflict_sql = cls._build_conflict_clause(columns, conflict_fields, update_fields)
+        
+        placeholders = ", ".join("?" for _ in columns)
+        query = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({placeholders}) {conflict_sql}"
+        params = list(validated_data.values())
+        
+        cls._forget()
+        # RETURNING is available from SQLite 3.35.0
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            with cls._connection() as conn:
+                new_id = conn.execute(query + " RETURNING id", params).fetchone()[0]
+        else:
+            with cls._connection(transaction=True) as conn:
+                conn.execute(query, params)
+                where_clause = " AND ".join(f"{name} = ?" for name in conflict_fields)
+                new_id = conn.execute(
+                    f"SELECT id FROM {cls.table_name} WHERE {where_clause}",
+                    [validated_data[name] for name in conflict_fields]
+                ).fetchone()[0]
+        
+        cls._invalidate_cache()
+        return new_id
+
+    @classmethod
+    def bulk_upsert(cls, records: list, conflict_fields: list, update_fields: Optional[list] = None,
+                    batch_size: Optional[int] = None, returning: bool = False):
+        """Insert or update many records with multi-row INSERT ... ON CONFLICT DO UPDATE
+
+        Records sharing a conflict key are collapsed, the last one wins.
+
+        Args:
+            records: List of dicts with field values
+            conflict_fields: Fields of the unique constraint that identifies a record
+            update_fields: Fields to overwrite when a record exists
+                (the given fields except the conflict fields by default)
+            batch_size: Maximum number of rows per statement
+            returning: Return the ids (in input order) instead of the count
+
+        Returns:
+            Number of inserted or updated rows, or the list of ids
+        """
+        if not records:
+            raise ValueError("The records list is empty")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        
+        groups, duplicates = cls._group_upsert_records(records, conflict_fields, update_fields)
+        cls._forget()
+        use_returning = returning and sqlite3.sqlite_version_info >= (3, 35, 0)
+        new_ids = [None] * len(records)
+        written_rows = 0
+        
+        with cls._connection(transaction=True) as conn:
+            cursor = conn.cursor()
+            max_variables = cls._max_variables(conn)
             
-            cursor.executemany(query, all_values)
-            conn.commit()
-            return len(all_values)
-        finally:
-            conn.close()
+            for (columns, conflict_sql), (indexes, rows) in groups.items():
+                row_sql = f"({', '.join('?' for _ in columns)})"
+                insert_sql = f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES"
+                
+                if returning and not use_returning:
+                    where_clause = " AND ".join(f"{name} = ?" for name in conflict_fields)
+                    positions = [columns.index(name) for name in conflict_fields]
+                    for index, row in zip(indexes, rows):
+                        cursor.execute(f"{insert_sql} {row_sql} {conflict_sql}", row)
+                        written_rows += cursor.rowcount
+                        new_ids[index] = cursor.execute(
+                            f"SELECT id FROM {cls.table_name} WHERE {where_clause}",
+                            [row[position] for position in positions]
+                        ).fetchone()[0]
+                    continue
+                
+                size = max(max_variables // max(len(columns), 1), 1)
+                if batch_size:
+                    size = min(size, batch_size)
+                
+                for start in range(0, len(rows), size):
+                    batch = rows[start:start + size]
+                    query = f"{insert_sql} {', '.join([row_sql] * len(batch))} {conflict_sql}"
+                    if use_returning:
+                        query += " RETURNING id"
+                    cursor.execute(query, [value for row in batch for value in row])
+                    if use_returning:
+                        returned = cursor.fetchall()
+                        written_rows += len(returned)
+                        for index, (new_id,) in zip(indexes[start:start + size], returned):
+                            new_ids[index] = new_id
+                    else:
+                        written_rows += cursor.rowcount
+        
+        cls._invalidate_cache()
+        if not returning:
+            return written_rows
+        for index, winner in duplicates.items():
+            new_ids[index] = new_ids[winner]
+        return new_ids
 
     def save(self):
         """Save instance (insert or update)"""
         if hasattr(self, 'id') and self.id:
-            data = self.__dict__.copy()
-            data.pop('id', None)
+            # Only model fields, not annotations or other loaded extras
+            data = {name: value for name, value in self.__dict__.items() if name in self._meta.fields}
             try:
                 self.__class__.update(self.id, **data)
             except ValueError as e:
@@ -660,6 +2223,10 @@ class BaseModel:
             data.pop('id', None)
             new_id = self.__class__.create(**data)
             self.id = new_id
+        
+        session = current_session()
+        if session is not None:
+            session.replace(self)
 
     @classmethod
     def update(cls, id: int, **kwargs) -> bool:
@@ -670,56 +2237,208 @@ class BaseModel:
         if 'id' in kwargs:
             raise ValueError("Cannot update 'id' field")
         
-        validated_data = cls._validate_and_convert_values(**kwargs)
+        validated_data = cls._validate_values(kwargs, update=True)
         
-        conn = cls.connect()
-        try:
+        columns = tuple(validated_data)
+        if columns == cls._meta.field_names:
+            query = cls._meta.update_sql
+        else:
+            query = cls._statement(('update',) + columns, lambda: (
+                f"UPDATE {cls.table_name} SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?"
+            ))
+        
+        with cls._connection() as conn:
             cursor = conn.cursor()
-            set_clause = ', '.join([f"{k} = ?" for k in validated_data.keys()])
-            values = list(validated_data.values())
-            
-            cursor.execute(
-                f"UPDATE {cls.table_name} SET {set_clause} WHERE id = ?",
-                (*values, id)
-            )
+            cursor.execute(query, (*validated_data.values(), id))
             updated_rows = cursor.rowcount
-            conn.commit()
             
             if updated_rows == 0:
                 raise ValueError(f"No record found with id={id}")
             
+            cls._forget(id)
+            cls._invalidate_cache()
             return True
-        finally:
-            conn.close()
         
     @classmethod
     def delete(cls, **filters) -> int:
-        """Delete records"""
+        """Delete records matching the filters (same lookups as filter())"""
         if not filters:
             raise ValueError("At least one filter must be specified")
         
-        valid_fields = cls._get_valid_fields()
-        
-        for key in filters.keys():
-            if key != 'id' and key not in valid_fields:
-                raise ValueError(f"Invalid field name: {key}")
-        
-        conn = cls.connect()
-        try:
-            cursor = conn.cursor()
-            where_clause = " AND ".join(f"{key} = ?" for key in filters.keys())
-            values = tuple(filters.values())
-            query = f"DELETE FROM {cls.table_name} WHERE {where_clause}"
-            
-            cursor.execute(query, values)
-            deleted_count = cursor.rowcount
-            conn.commit()
-            return deleted_count
-        finally:
-            conn.close()
+        return cls.filter(**filters).delete()
 
 
 class SQLiteModel(BaseModel):
     """SQLite model class"""
     class Meta:
         db_config = {}
+
+
+class AsyncSQLiteModel(SQLiteModel):
+    """SQLite model with an asyncio API
+
+    The ``a*`` methods run the matching synchronous call on a bounded thread
+    pool of the database (``db_config['async_workers']`` threads, 4 by
+    default). Each worker keeps its own connection, so opening connections,
+    executing and fetching never block the event loop. The synchronous API
+    stays available.
+    """
+    class Meta:
+        db_config = {}
+
+    class QuerySet(SQLiteModel.QuerySet):
+        """QuerySet with awaitable evaluation and ``async for`` streaming"""
+
+        async def alist(self) -> list:
+            """Evaluate the QuerySet on a worker thread"""
+            return await self.model.arun(self._fetch_all)
+
+        async def acount(self) -> int:
+            """Count results with SELECT COUNT(*) unless they are already loaded"""
+            return await self.model.arun(self.count)
+
+        async def aexists(self) -> bool:
+            """Check if results exist with SELECT 1 ... LIMIT 1"""
+            return await self.model.arun(self.exists)
+
+        async def afirst(self):
+            """Get first result (ordered by id unless the QuerySet is ordered)"""
+            return await self.model.arun(self.first)
+
+        async def alast(self):
+            """Get last result by reversing the ordering (id unless the QuerySet is ordered)"""
+            return await self.model.arun(self.last)
+
+        async def aupdate(self, **kwargs) -> int:
+            """Update all matching records with a single UPDATE statement"""
+            return await self.model.arun(self.update, **kwargs)
+
+        async def adelete(self) -> int:
+            """Delete all matching records with a single DELETE statement"""
+            return await self.model.arun(self.delete)
+
+        def __aiter__(self):
+            return self.aiterator()
+
+        async def aiterator(self, chunk_size: int = 2000):
+            """Stream instances in chunks fetched by short tasks on the worker threads
+
+            The stream reads through a connection of its own, so no worker is
+            held between chunks and the loop body can await other a* calls.
+            The next ``chunk_size`` rows are read while the caller handles
+            the current ones.
+            """
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be >= 1")
+            if self._result_cache is not None:
+                for item in self._result_cache:
+                    yield item
+                return
+            
+            executor = _get_executor(self.model.Meta.db_config)
+            query, params = self._compile_select()
+            
+            def submit(func, *args):
+                return executor.submit(contextvars.copy_context().run, func, *args)
+            
+            def open_cursor():
+                conn = self.model.connect(check_same_thread=False)
+                try:
+                    cursor = conn.execute(query, params)
+                except BaseException:
+                    conn.close()
+                    raise
+                return conn, cursor, self._row_loader(cursor.description)
+            
+            def fetch(cursor, load):
+                batch = [load(row) for row in cursor.fetchmany(chunk_size)]
+                if batch and self._prefetch and self._result_type is None:
+                    self._prefetch_related_objects(batch)
+                return batch
+            
+            conn = pending = None
+            try:
+                conn, cursor, load = await asyncio.wrap_future(submit(open_cursor))
+                pending = submit(fetch, cursor, load)
+                while True:
+                    batch = await asyncio.wrap_future(pending)
+                    if not batch:
+                        break
+                    pending = submit(fetch, cursor, load)
+                    for item in batch:
+                        yield item
+            finally:
+                # A chunk still being read, even by a cancelled await, must finish before the connection is closed
+                if pending is not None and not pending.done():
+                    await asyncio.wait([asyncio.wrap_future(pending)])
+                if conn is not None:
+                    await asyncio.wrap_future(submit(conn.close))
+
+    @classmethod
+    async def arun(cls, func, *args, **kwargs):
+        """Run a function on a worker thread of the database and await its result
+
+        Use it for blocks that must stay on one connection, like atomic():
+        ``await Post.arun(transfer, from_id, to_id)``. The caller's context
+        (e.g. an open session()) is visible to the function.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(_get_executor(cls.Meta.db_config), call)
+
+    @classmethod
+    async def aget(cls, **kwargs) -> Optional['AsyncSQLiteModel']:
+        """Get single record (from the open session() when it is loaded there)"""
+        return await cls.arun(cls.get, **kwargs)
+
+    @classmethod
+    async def afilter(cls, **kwargs) -> list:
+        """Filter and load the matching records; use filter() to build a QuerySet for ``async for``"""
+        return await cls.filter(**kwargs).alist()
+
+    @classmethod
+    async def aall(cls, order_by: Optional[str] = None) -> list:
+        """Load all records"""
+        return await cls.all(order_by=order_by).alist()
+
+    @classmethod
+    async def acreate(cls, **kwargs) -> int:
+        """Create new record with validation and return its id"""
+        return await cls.arun(cls.create, **kwargs)
+
+    @classmethod
+    async def abulk_create(cls, records: list, batch_size: Optional[int] = None, returning: bool = False):
+        """Bulk create records with validation (see bulk_create())"""
+        return await cls.arun(cls.bulk_create, records, batch_size=batch_size, returning=returning)
+
+    @classmethod
+    async def abulk_update(cls, instances: list, fields: list, batch_size: Optional[int] = None) -> int:
+        """Update the given fields of many instances in one transaction (see bulk_update())"""
+        return await cls.arun(cls.bulk_update, instances, fields, batch_size=batch_size)
+
+    @classmethod
+    async def aupsert(cls, conflict_fields: list, update_fields: Optional[list] = None, **values) -> int:
+        """Insert a record, or update it if it exists, and return its id (see upsert())"""
+        return await cls.arun(cls.upsert, conflict_fields, update_fields, **values)
+
+    @classmethod
+    async def abulk_upsert(cls, records: list, conflict_fields: list, update_fields: Optional[list] = None,
+                           batch_size: Optional[int] = None, returning: bool = False):
+        """Insert or update many records with INSERT ... ON CONFLICT DO UPDATE (see bulk_upsert())"""
+        return await cls.arun(
+            cls.bulk_upsert, records, conflict_fields, update_fields, batch_size=batch_size, returning=returning
+        )
+
+    @classmethod
+    async def aupdate(cls, id: int, **kwargs) -> bool:
+        """Update record with validation"""
+        return await cls.arun(cls.update, id, **kwargs)
+
+    @classmethod
+    async def adelete(cls, **filters) -> int:
+        """Delete records matching the filters (same lookups as filter())"""
+        return await cls.arun(cls.delete, **filters)
+
+    async def asave(self):
+        """Save instance (insert or update)"""
+        await self.arun(self.save)
@@ -24,7 +24,8 @@ setup(
         'psycopg2-binary>=2.9.0',
     ],
     extras_require={
-        'postgresql': ['psycopg2-binary>=2.9.0']
+        'postgresql': ['psycopg2-binary>=2.9.0'],
+        'async': ['psycopg[binary]>=3.1', 'psycopg-pool>=3.1'],
     },
     classifiers=[
     'Development Status :: 5 - Production/Stable',
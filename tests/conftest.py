@@ -0,0 +1,51 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from abarorm import AsyncSQLiteModel
+from abarorm.fields import sqlite as fields
+from abarorm.sqlite import close_connections, close_executors
+
+
+@pytest.fixture
+def sqlite_config(tmp_path):
+    """db_config for a fresh SQLite file; closes the connections and async workers afterwards"""
+    yield {'db_name': str(tmp_path / 'test.db'), 'journal_mode': 'wal', 'async_workers': 2}
+    close_executors()
+    close_connections()
+
+
+@pytest.fixture
+def models(sqlite_config):
+    """Author and Book models on the test database (AsyncSQLiteModel, so both APIs are available)"""
+    class Author(AsyncSQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        name = fields.CharField(max_length=50)
+        active = fields.BooleanField(default=True)
+
+    class Book(AsyncSQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        title = fields.CharField(max_length=50)
+        author = fields.ForeignKey(to=Author, related_name='books')
+        pages = fields.IntegerField(default=0)
+        created = fields.DateTimeField(auto_now_add=True)
+        updated = fields.DateTimeField(auto_now=True)
+
+    return SimpleNamespace(Author=Author, Book=Book)
+
+
+@pytest.fixture
+def pg_config():
+    """PostgreSQL settings from the ABARORM_PG_* environment variables; skips the test when unset"""
+    if not os.environ.get('ABARORM_PG_HOST'):
+        pytest.skip("set ABARORM_PG_HOST (and ABARORM_PG_USER, ABARORM_PG_PASSWORD, ...) to run PostgreSQL tests")
+    return {
+        'host': os.environ['ABARORM_PG_HOST'],
+        'user': os.environ.get('ABARORM_PG_USER', 'postgres'),
+        'password': os.environ.get('ABARORM_PG_PASSWORD', ''),
+        'database': os.environ.get('ABARORM_PG_DATABASE', 'abarorm_test'),
+        'port': int(os.environ.get('ABARORM_PG_PORT', 5432)),
+    }
@@ -0,0 +1,50 @@
+import pytest
+
+from abarorm import Avg, Count, Max, Min, Sum
+
+
+@pytest.fixture
+def library(models):
+    Author, Book = models.Author, models.Book
+    pages = {'a': [10, 20, 30], 'b': [5], 'c': []}
+    for name, counts in pages.items():
+        author = Author.create(name=name)
+        for n in counts:
+            Book.create(title=f'{name}{n}', author=author, pages=n)
+    return models
+
+
+def test_aggregate(library):
+    Book = library.Book
+    assert Book.all().aggregate(total=Sum('pages'), n=Count('id'), low=Min('pages'), high=Max('pages')) == {
+        'total': 65, 'n': 4, 'low': 5, 'high': 30,
+    }
+    assert Book.filter(pages__gt=5).aggregate(avg=Avg('pages')) == {'avg': 20}
+    # Empty input: COUNT is 0, the others are NULL
+    assert Book.filter(pages__gt=100).aggregate(n=Count('id'), total=Sum('pages')) == {'n': 0, 'total': None}
+
+
+def test_annotate_over_related_name(library):
+    authors = library.Author.all().annotate(n=Count('books'), total=Sum('books__pages')).order_by('-n', 'id')
+    assert [(a.name, a.n, a.total) for a in authors] == [('a', 3, 60), ('b', 1, 5), ('c', 0, None)]
+
+
+def test_grouped_values_with_having(library):
+    rows = (library.Book.all()
+            .annotate(total=Sum('pages'), n=Count('id'))
+            .values('author')
+            .filter(total__gt=10)
+            .order_by('author'))
+    assert [(row['total'], row['n']) for row in rows] == [(60, 3)]
+    counts = library.Book.all().annotate(n=Count('id')).values_list('author', 'n').filter(n__gte=1).order_by('-n')
+    a, b = library.Author.get(name='a'), library.Author.get(name='b')
+    assert list(counts) == [(a.id, 3), (b.id, 1)]
+
+
+def test_aggregate_errors(library):
+    with pytest.raises(ValueError):
+        library.Book.all().aggregate()
+    with pytest.raises(ValueError):
+        library.Book.all().aggregate(n='pages')
+    with pytest.raises(ValueError):
+        library.Book.all().annotate(pages=Count('id'))
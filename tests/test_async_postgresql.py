@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('psycopg_pool')
+
+from abarorm import AsyncPostgreSQLModel
+from abarorm.fields import psql as fields
+from abarorm.psql import close_async_pools, close_all_pools
+
+
+def test_interleaved_streams_inside_aatomic(pg_config):
+    class StreamItem(AsyncPostgreSQLModel):
+        class Meta:
+            db_config = pg_config
+        n = fields.IntegerField(default=0)
+
+    async def main():
+        await StreamItem.filter(n__gte=0).adelete()
+        await StreamItem.abulk_create([{'n': n} for n in range(20)])
+        async with StreamItem.aatomic():
+            low = StreamItem.filter(n__lt=10).order_by('n').aiterator(chunk_size=3)
+            high = StreamItem.filter(n__gte=10).order_by('n').aiterator(chunk_size=4)
+            pairs = []
+            async for item in low:
+                pairs.append((item.n, (await high.__anext__()).n))
+            await low.aclose()
+            await high.aclose()
+            # The transaction is still usable after both streams closed
+            await StreamItem.acreate(n=100)
+        total = await StreamItem.all().acount()
+        await StreamItem.filter(n__gte=0).adelete()
+        await close_async_pools()
+        return pairs, total
+
+    try:
+        pairs, total = asyncio.run(asyncio.wait_for(main(), timeout=30))
+    finally:
+        close_all_pools()
+    assert pairs == [(n, n + 10) for n in range(10)]
+    assert total == 21
@@ -0,0 +1,44 @@
+import asyncio
+
+
+def test_concurrent_streams_exceeding_workers(models):
+    Author, Book = models.Author, models.Book
+
+    async def stream(author_id):
+        titles = []
+        async for book in Book.filter(author=author_id).order_by('id').aiterator(chunk_size=3):
+            # Every loop body needs a worker while the other streams are open
+            author = await Author.aget(id=book.author)
+            titles.append((author.name, book.title))
+        return titles
+
+    async def main():
+        author_ids = [await Author.acreate(name=f'author {n}') for n in range(5)]
+        for author_id in author_ids:
+            await Book.abulk_create([{'title': f'book {n}', 'author': author_id} for n in range(10)])
+        return await asyncio.wait_for(asyncio.gather(*[stream(a) for a in author_ids]), timeout=30)
+
+    results = asyncio.run(main())
+    assert [len(titles) for titles in results] == [10] * 5
+    assert results[2][0] == ('author 2', 'book 0')
+
+
+def test_stream_early_break_and_errors(models):
+    Author, Book = models.Author, models.Book
+
+    async def main():
+        author_id = await Author.acreate(name='a')
+        await Book.abulk_create([{'title': f'b{n}', 'author': author_id} for n in range(20)])
+        async for book in Book.all().aiterator(chunk_size=2):
+            break
+        try:
+            async for book in Book.all().order_by('nope'):
+                pass
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("invalid ordering was not reported")
+        return [book.title async for book in Book.all().order_by('id')]
+
+    titles = asyncio.run(main())
+    assert titles == [f'b{n}' for n in range(20)]
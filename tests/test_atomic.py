@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+
+def titles(Book):
+    return sorted(book.title for book in Book.all())
+
+
+def test_nested_block_rolls_back_to_its_savepoint(models):
+    Author, Book = models.Author, models.Book
+    with Book.atomic():
+        author = Author.create(name='a')
+        Book.create(title='kept', author=author)
+        with pytest.raises(RuntimeError):
+            with Book.atomic():
+                Book.create(title='undone', author=author)
+                raise RuntimeError("undo the inner block")
+        with Book.atomic():
+            Book.create(title='inner', author=author)
+    assert titles(Book) == ['inner', 'kept']
+    assert len(Author.all()) == 1
+
+
+def test_outer_rollback_discards_released_savepoints(models):
+    Author, Book = models.Author, models.Book
+    with pytest.raises(RuntimeError):
+        with Book.atomic():
+            author = Author.create(name='a')
+            with Book.atomic():
+                Book.create(title='inner', author=author)
+            raise RuntimeError("undo everything")
+    assert titles(Book) == [] and len(Author.all()) == 0
+
+    # The connection is usable again after the rollback
+    with Book.atomic():
+        Book.create(title='after', author=Author.create(name='b'))
+    assert titles(Book) == ['after']
+
+
+def test_concurrent_read_then_write_blocks_wait(models):
+    Author = models.Author
+    Author.create(name='seed')
+    errors = []
+
+    def worker(n):
+        try:
+            with Author.atomic():
+                count = len(Author.all())
+                time.sleep(0.02)
+                Author.create(name=f'{n}-{count}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    # Each block saw the rows committed before it took the write lock
+    assert sorted(int(author.name.split('-')[1]) for author in Author.all() if '-' in author.name) == [1, 2, 3, 4, 5]
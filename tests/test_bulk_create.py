@@ -0,0 +1,39 @@
+import pytest
+
+
+def test_returning_ids_follow_input_order_across_groups(models):
+    Author, Book = models.Author, models.Book
+    author = Author.create(name='a')
+    # Alternating records with and without pages form two column groups
+    records = [
+        {'title': f'b{n}', 'author': author, 'pages': n} if n % 2 else {'title': f'b{n}', 'author': author}
+        for n in range(11)
+    ]
+    ids = Book.bulk_create(records, batch_size=3, returning=True)
+
+    assert len(ids) == len(set(ids)) == 11
+    for n, book_id in enumerate(ids):
+        book = Book.get(id=book_id)
+        assert book.title == f'b{n}'
+        assert book.pages == (n if n % 2 else 0)
+
+
+def test_count_and_batches_over_the_variable_limit(models):
+    Author, Book = models.Author, models.Book
+    author = Author.create(name='a')
+    # More bound parameters than a single SQLite statement accepts
+    count = Book.bulk_create([{'title': f'b{n}', 'author': author, 'pages': n} for n in range(12000)])
+    assert count == 12000
+    assert len(Book.all()) == 12000
+
+
+def test_invalid_record_inserts_nothing(models):
+    Author, Book = models.Author, models.Book
+    author = Author.create(name='a')
+    with pytest.raises(ValueError):
+        Book.bulk_create([{'title': 'ok', 'author': author}, {'title': 'x' * 100, 'author': author}])
+    with pytest.raises(ValueError):
+        Book.bulk_create([])
+    with pytest.raises(ValueError):
+        Book.bulk_create([{'title': 'ok', 'author': author}], batch_size=0)
+    assert len(Book.all()) == 0
@@ -0,0 +1,91 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from abarorm import SQLiteModel
+from abarorm.cache import CacheBackend, LocalCache, QueryCache
+from abarorm.fields import sqlite as fields
+
+
+@pytest.fixture
+def cached(sqlite_config):
+    class Region(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+            cache = True
+        name = fields.CharField(max_length=50)
+
+    class Shop(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+            cache = QueryCache(ttl=0.2, maxsize=16)
+        name = fields.CharField(max_length=50)
+        region = fields.ForeignKey(to=Region, related_name='shops')
+
+    return SimpleNamespace(Region=Region, Shop=Shop)
+
+
+def selects(model):
+    queries = []
+    model._get_connection().set_trace_callback(queries.append)
+    return lambda: len([q for q in queries if q.startswith('SELECT')])
+
+
+def test_reads_are_served_from_the_cache_until_a_write(cached):
+    Region = cached.Region
+    region_id = Region.create(name='north')
+    count = selects(Region)
+
+    assert [r.name for r in Region.all()] == ['north']
+    assert Region.get(id=region_id).name == 'north'
+    assert [r.name for r in Region.all()] == ['north']
+    Region.get(id=region_id)
+    assert count() == 2
+
+    Region.update(region_id, name='south')
+    assert Region.get(id=region_id).name == 'south'
+    Region.create(name='east')
+    assert len(Region.all()) == 2
+    assert count() == 4
+
+
+def test_cascading_delete_invalidates_the_related_table(cached):
+    region_id = cached.Region.create(name='north')
+    cached.Shop.create(name='s', region=region_id)
+    assert len(cached.Shop.all()) == 1
+
+    cached.Region.delete(id=region_id)
+    assert len(cached.Shop.all()) == 0
+
+
+def test_entries_expire_and_atomic_reads_skip_the_cache(cached):
+    Region, Shop = cached.Region, cached.Shop
+    region_id = Region.create(name='north')
+    Shop.create(name='s', region=region_id)
+    assert len(Shop.all()) == 1
+
+    # A change made outside the ORM is seen once the entry expires
+    with Shop._connection() as conn:
+        conn.execute("INSERT INTO shop (name, region) VALUES ('t', ?)", (region_id,))
+    assert len(Shop.all()) == 1
+    with Shop.atomic():
+        assert len(Shop.all()) == 2
+    time.sleep(0.25)
+    assert len(Shop.all()) == 2
+
+
+def test_local_cache_is_an_lru():
+    cache = LocalCache(maxsize=2)
+    cache.set('a', 1, None)
+    cache.set('b', 2, None)
+    cache.get('a')
+    cache.set('c', 3, None)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from abarorm.psql import ConnectionPool
+
+
+class PoolConnection(sqlite3.Connection):
+    """sqlite3 connection with the parts of the psycopg2 connection API the pool uses"""
+    closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+    def get_transaction_status(self):
+        return TRANSACTION_STATUS_INTRANS if self.in_transaction else TRANSACTION_STATUS_IDLE
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def make_pool(**kwargs):
+        pool = ConnectionPool(
+            connect=lambda: sqlite3.connect(str(tmp_path / 'pool.db'), factory=PoolConnection,
+                                            check_same_thread=False),
+            **kwargs
+        )
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+    for pool in pools:
+        pool.close()
+
+
+def test_connections_are_reused(make_pool):
+    pool = make_pool(min_size=1, max_size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    second = pool.acquire()
+    assert second is not first and pool._size == 2
+
+
+def test_acquire_times_out_at_max_size(make_pool):
+    pool = make_pool(min_size=0, max_size=1, timeout=0.1)
+    pool.acquire()
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+
+
+def test_release_wakes_a_waiting_thread(make_pool):
+    pool = make_pool(min_size=0, max_size=1, timeout=5)
+    conn = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    pool.release(conn)
+    waiter.join(5)
+    assert acquired == [conn]
+
+
+def test_idle_connections_above_min_size_expire(make_pool):
+    pool = make_pool(min_size=1, max_size=3, idle_timeout=0)
+    conns = [pool.acquire() for _ in range(3)]
+    for conn in conns:
+        pool.release(conn)
+    pool.release(pool.acquire())
+    assert pool._size == 1
+    assert sum(conn.closed for conn in conns) == 2
+
+
+def test_broken_connections_are_replaced(make_pool):
+    pool = make_pool(min_size=1, max_size=1)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    replacement = pool.acquire()
+    assert replacement is not conn and not replacement.closed
+    assert pool._size == 1
+
+
+def test_release_rolls_back_open_transactions(make_pool):
+    pool = make_pool(min_size=1, max_size=1)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE IF NOT EXISTS t (n INTEGER)")
+    conn.execute("BEGIN")
+    conn.execute("INSERT INTO t VALUES (1)")
+    pool.release(conn)
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_closed_pool_refuses_connections(make_pool):
+    pool = make_pool(min_size=2, max_size=2)
+    pool.close()
+    assert pool._size == 0
+    with pytest.raises(ConnectionError):
+        pool.acquire()
@@ -0,0 +1,64 @@
+import pytest
+
+from abarorm import SQLiteModel
+from abarorm.fields import sqlite as fields
+from abarorm.fields.sqlite import Index
+
+
+@pytest.fixture
+def make_model(sqlite_config):
+    def make_model(indexes):
+        attrs = {
+            'title': fields.CharField(max_length=50),
+            'pages': fields.IntegerField(default=0),
+            'active': fields.BooleanField(default=True),
+            'Meta': type('Meta', (), {'db_config': sqlite_config, 'table_name': 'shelf', 'indexes': indexes}),
+        }
+        return type('Shelf', (SQLiteModel,), attrs)
+
+    return make_model
+
+
+def stored_indexes(model):
+    with model._connection() as conn:
+        rows = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (model.table_name,)
+        ).fetchall()
+    return dict(rows)
+
+
+def test_generated_names_keep_the_sort_direction(make_model):
+    model = make_model([Index(['title', 'pages']), Index(['title', '-pages']), Index(['pages'], unique=True)])
+    assert set(stored_indexes(model)) == {'ix_shelf_title_pages', 'ix_shelf_title_pages_desc', 'ux_shelf_pages'}
+
+
+def test_duplicate_index_names_are_rejected(make_model):
+    with pytest.raises(ValueError):
+        make_model([Index(['title']), Index(['pages'], name='ix_shelf_title')])
+
+
+def test_unchanged_indexes_are_kept(make_model):
+    model = make_model([Index(['pages'], name='by_pages', where='active = 1'), Index(['title', '-pages'])])
+    statements = []
+    model._get_connection().set_trace_callback(statements.append)
+    make_model([Index(['pages'], name='by_pages', where='active = 1'), Index(['title', '-pages'])])
+    assert not [sql for sql in statements if 'INDEX' in sql]
+
+
+def test_changed_definitions_are_rebuilt(make_model):
+    before = stored_indexes(make_model([Index(['pages'], name='by_pages', where='active = 1'), Index(['title'])]))
+
+    for index in (Index(['pages'], name='by_pages', where='pages > 0'),
+                  Index(['pages'], name='by_pages', unique=True, where='pages > 0'),
+                  Index(['-pages'], name='by_pages', unique=True, where='pages > 0')):
+        after = stored_indexes(make_model([index, Index(['title'])]))
+        assert after['by_pages'] == index.get_sql('shelf').replace(' IF NOT EXISTS', '')
+        assert after['ix_shelf_title'] == before['ix_shelf_title']
+
+
+def test_undeclared_generated_indexes_are_dropped(make_model):
+    model = make_model([Index(['title']), Index(['pages'], name='kept')])
+    with model._connection() as conn:
+        conn.execute("CREATE INDEX manual_title ON shelf (title)")
+    assert set(stored_indexes(make_model([]))) == {'kept', 'manual_title'}
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def books(models):
+    author = models.Author.create(name='a')
+    # Repeated page counts, so ties are broken by id
+    models.Book.bulk_create([{'title': f'b{n}', 'author': author, 'pages': n % 5} for n in range(23)])
+    return models.Book
+
+
+def walk(Book, order_by, size):
+    ids = []
+    qs = Book.all().after(order_by=order_by).limit(size)
+    while True:
+        page = list(qs)
+        assert len(page) <= size
+        ids.extend(book.id for book in page)
+        token = qs.next_cursor()
+        if token is None:
+            return ids
+        qs = Book.all().after(token, order_by=order_by).limit(size)
+
+
+@pytest.mark.parametrize('order_by', ['pages', '-pages', 'id', '-id'])
+def test_pages_cover_every_row_once_in_order(books, order_by):
+    rows = [(book.pages, book.id) for book in books.all()]
+    key = (lambda row: row[1]) if order_by.lstrip('-') == 'id' else (lambda row: row)
+    expected = [row_id for _, row_id in sorted(rows, key=key, reverse=order_by.startswith('-'))]
+    assert walk(books, order_by, 4) == expected
+
+
+def test_after_explicit_position(books):
+    ordered = [book.id for book in books.all().order_by('pages', 'id')]
+    last = books.get(id=ordered[9])
+    by_id = books.all().after(id=last.id, order_by='pages').limit(5)
+    by_values = books.all().after(id=last.id, pages=last.pages, order_by='pages').limit(5)
+    assert [book.id for book in by_id] == [book.id for book in by_values] == ordered[10:15]
+
+
+def test_keyset_filters_and_errors(books):
+    page = books.filter(pages=2).after(order_by='-id').limit(10)
+    ids = [book.id for book in page]
+    assert ids == sorted((book.id for book in books.filter(pages=2)), reverse=True) and len(ids) == 5
+    assert page.next_cursor() is None
+
+    with pytest.raises(ValueError):
+        books.all().after(order_by='pages').next_cursor()
+    with pytest.raises(ValueError):
+        books.all().after('token', id=1)
+    with pytest.raises(ValueError):
+        books.all().after(pages=1, order_by='pages')
+    with pytest.raises(ValueError):
+        books.all().after(order_by='nope')
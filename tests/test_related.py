@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+
+from abarorm import SQLiteModel
+from abarorm.fields import sqlite as fields
+
+
+@pytest.fixture
+def shop(sqlite_config):
+    class Country(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        name = fields.CharField(max_length=50)
+
+    class Customer(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        name = fields.CharField(max_length=50)
+        country = fields.ForeignKey(to=Country, related_name='customers', null=True)
+
+    class Purchase(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        total = fields.IntegerField(default=0)
+        customer = fields.ForeignKey(to=Customer, related_name='purchases')
+
+    return SimpleNamespace(Country=Country, Customer=Customer, Purchase=Purchase)
+
+
+def count_queries(model):
+    """Record the statements run on the current thread's connection"""
+    queries = []
+    model._get_connection().set_trace_callback(queries.append)
+    return queries
+
+
+def test_select_related_loads_nested_targets_in_one_query(shop):
+    country = shop.Country.create(name='Iran')
+    alice = shop.Customer.create(name='alice', country=country)
+    bob = shop.Customer.create(name='bob')
+    for n in range(3):
+        shop.Purchase.create(total=n, customer=alice if n % 2 else bob)
+
+    queries = count_queries(shop.Purchase)
+    purchases = list(shop.Purchase.all().select_related('customer__country').order_by('id'))
+    names = [(p.customer.name, p.customer.country and p.customer.country.name) for p in purchases]
+
+    assert names == [('bob', None), ('alice', 'Iran'), ('bob', None)]
+    assert len([q for q in queries if q.startswith('SELECT')]) == 1
+    # Without select_related the attribute stays the related id
+    assert shop.Purchase.get(id=purchases[1].id).customer == alice
+
+
+def test_select_related_rejects_non_foreign_keys(shop):
+    with pytest.raises(ValueError):
+        shop.Purchase.all().select_related('total')
+    with pytest.raises(ValueError):
+        shop.Purchase.all().select_related('customer__name')
+
+
+def test_prefetch_related_groups_related_rows(shop):
+    customers = [shop.Customer.create(name=f'c{n}') for n in range(3)]
+    for n in range(7):
+        shop.Purchase.create(total=n, customer=customers[n % 2])
+
+    queries = count_queries(shop.Customer)
+    loaded = list(shop.Customer.all().prefetch_related('purchases').order_by('id'))
+    totals = [sorted(p.total for p in customer.purchases.all()) for customer in loaded]
+
+    assert totals == [[0, 2, 4, 6], [1, 3, 5], []]
+    assert len([q for q in queries if q.startswith('SELECT')]) == 2
+
+
+def test_prefetch_related_rejects_unknown_names(shop):
+    with pytest.raises(ValueError):
+        shop.Customer.all().prefetch_related('nope')
@@ -0,0 +1,61 @@
+import pytest
+
+from abarorm import session
+
+
+def selects(model):
+    queries = []
+    model._get_connection().set_trace_callback(queries.append)
+    return lambda: len([q for q in queries if q.startswith('SELECT')])
+
+
+def test_repeated_get_returns_the_same_instance(models):
+    author_id = models.Author.create(name='a')
+    with session() as current:
+        count = selects(models.Author)
+        author = models.Author.get(id=author_id)
+        assert models.Author.get(id=author_id) is author
+        assert count() == 1 and len(current) == 1
+    # Outside the block every get() loads a new instance
+    assert models.Author.get(id=author_id) is not models.Author.get(id=author_id)
+
+
+def test_select_related_targets_come_from_the_session(models):
+    author_id = models.Author.create(name='a')
+    models.Book.bulk_create([{'title': f'b{n}', 'author': author_id} for n in range(3)])
+    with session():
+        author = models.Author.get(id=author_id)
+        books = list(models.Book.all().select_related('author'))
+        assert all(book.author is author for book in books)
+
+
+def test_writes_evict_the_rows_they_change(models):
+    Author = models.Author
+    author_id = Author.create(name='a')
+    with session():
+        author = Author.get(id=author_id)
+        Author.update(author_id, name='renamed')
+        assert Author.get(id=author_id).name == 'renamed'
+
+        author = Author.get(id=author_id)
+        author.name = 'saved'
+        author.save()
+        assert Author.get(id=author_id) is author
+
+        Author.filter(id=author_id).update(active=False)
+        assert Author.get(id=author_id).active is False
+
+        Author.delete(id=author_id)
+        assert Author.get(id=author_id) is None
+
+
+def test_rollback_empties_the_session(models):
+    Author = models.Author
+    author_id = Author.create(name='a')
+    with session() as current:
+        with pytest.raises(RuntimeError):
+            with Author.atomic():
+                Author.get(id=author_id).name = 'changed in memory'
+                raise RuntimeError("roll back")
+        assert len(current) == 0
+        assert Author.get(id=author_id).name == 'a'
@@ -0,0 +1,23 @@
+CREATED = '2020-01-01T12:00:00'
+UPDATED = '2020-01-02T12:00:00'
+
+
+def test_update_keeps_auto_now_add(models):
+    Author, Book = models.Author, models.Book
+    author = Author.create(name='a')
+    ids = [
+        Book.create(title=f'b{n}', author=author, pages=n, created=CREATED, updated=UPDATED)
+        for n in range(10)
+    ]
+
+    assert Book.filter(pages__lt=5).update(title='short') == 5
+    Book.update(ids[7], title='renamed')
+    book = Book.get(id=ids[8])
+    book.pages = 80
+    book.save()
+
+    for book in Book.all():
+        assert str(book.created).replace(' ', 'T').startswith(CREATED)
+    # auto_now is still refreshed by update()
+    changed = {book.id for book in Book.all() if not str(book.updated).replace(' ', 'T').startswith(UPDATED)}
+    assert changed - {ids[8]} == set(ids[:5]) | {ids[7]}
@@ -0,0 +1,60 @@
+import pytest
+
+from abarorm import SQLiteModel
+from abarorm.fields import sqlite as fields
+
+
+@pytest.fixture
+def Stock(sqlite_config):
+    class Stock(SQLiteModel):
+        class Meta:
+            db_config = sqlite_config
+        sku = fields.CharField(max_length=20, unique=True)
+        name = fields.CharField(max_length=50)
+        quantity = fields.IntegerField(default=0)
+
+    return Stock
+
+
+def test_upsert_inserts_then_updates_the_same_row(Stock):
+    first = Stock.upsert(['sku'], sku='a', name='apple', quantity=1)
+    second = Stock.upsert(['sku'], sku='a', name='apple', quantity=5)
+    assert first == second
+    assert [(s.sku, s.quantity) for s in Stock.all()] == [('a', 5)]
+
+
+def test_upsert_update_fields(Stock):
+    Stock.create(sku='a', name='apple', quantity=1)
+    Stock.upsert(['sku'], update_fields=['quantity'], sku='a', name='renamed', quantity=7)
+    stock = Stock.get(sku='a')
+    assert (stock.name, stock.quantity) == ('apple', 7)
+    # Nothing to update still returns the existing id
+    assert Stock.upsert(['sku'], update_fields=[], sku='a', name='x') == stock.id
+
+
+def test_bulk_upsert_returning_ids_and_duplicates(Stock):
+    existing = Stock.create(sku='b', name='banana', quantity=1)
+    records = [
+        {'sku': 'a', 'name': 'apple', 'quantity': 1},
+        {'sku': 'b', 'name': 'banana', 'quantity': 2},
+        {'sku': 'a', 'name': 'apple', 'quantity': 3},   # Same key, the last record wins
+        {'sku': 'c', 'name': 'cherry'},                 # Different columns form another group
+    ]
+    ids = Stock.bulk_upsert(records, ['sku'], batch_size=1, returning=True)
+
+    assert ids[1] == existing and ids[0] == ids[2]
+    assert len(set(ids)) == 3
+    assert {s.sku: s.quantity for s in Stock.all()} == {'a': 3, 'b': 2, 'c': 0}
+    assert Stock.bulk_upsert([{'sku': 'c', 'name': 'cherry', 'quantity': 9}], ['sku']) == 1
+    assert Stock.get(sku='c').quantity == 9
+
+
+def test_upsert_errors(Stock):
+    with pytest.raises(ValueError):
+        Stock.upsert([], sku='a', name='apple')
+    with pytest.raises(ValueError):
+        Stock.upsert(['nope'], sku='a', name='apple')
+    with pytest.raises(ValueError):
+        Stock.upsert(['sku'], update_fields=['quantity'], sku='a', name='apple')
+    with pytest.raises(ValueError):
+        Stock.bulk_upsert([], ['sku'])